@@ -1,5 +1,12 @@
-from izpitni_roki.osnovno import Koledar, IzpitniRok, naredi_zapisnikarja, preveri_ics_datoteke
-from izpitni_roki.nalozi_ics import nalozi_ics
+from izpitni_roki.osnovno import (
+    Koledar,
+    IzpitniRok,
+    Register,
+    PRIVZETI_REGISTER,
+    naredi_zapisnikarja,
+    preveri_ics_datoteke,
+)
+from izpitni_roki.nalozi_ics import nalozi_koledarje
 from typing import List, Callable
 
 
@@ -37,7 +44,7 @@ def ustrezni_izpitni_roki(
         for izpitni_rok in koledar.izpitni_roki:
             if pogoj(izpitni_rok):
                 ustrezni_roki.append(izpitni_rok)
-    ustrezni_roki.sort()
+    ustrezni_roki.sort(key=IzpitniRok.kljuc_urejanja)
     return ustrezni_roki
 
 
@@ -48,18 +55,38 @@ def _filter_za_isrm(rok: IzpitniRok):
     return False
 
 
-def prikazi_isrm_roke(poti_do_ics: str | list[str]):
+def prikazi_isrm_roke(
+    poti_do_ics: str | list[str] | list[Koledar], register: Register = PRIVZETI_REGISTER
+):
     """
     Prikaže roke za predmete, ki jih ponujamo IŠRM. Izda opozorilo, če za kakšnega od predmetov
     ni bil najden noben rok.
 
     :param poti_do_ics: poti do ics datotek kot a) niz, ki predstavlja ime mape, npr. ``letosnji_data``
                         (najdemo vse ics datoteke v dani mapi), ali b) seznam ics datotek, npr.
-                        ``["letosnji_data/test1.ics", "letosnji_data/test2.ics"]``
+                        ``["letosnji_data/test1.ics", "letosnji_data/test2.ics"]``, ali c) seznam
+                        že naloženih koledarjev (datotek tedaj ne beremo ponovno). V primerih a)
+                        in b) izpitna obdobja določimo iz datumov v datotekah, v primeru c) pa
+                        imajo roki obdobja, s katerimi so bili koledarji naloženi (npr. v
+                        :func:`pozeni.glavna` uradna obdobja).
+    :param register: register, v katerem naložimo koledarje
+                     (glej :class:`izpitni_roki.osnovno.Register`)
     :return: ne vrne ničesar, samo izpiše ustrezne vrstice
+
+    :raises: ValueError, če seznam vsebuje tako poti kot koledarje.
     """
-    poti_do_ics = preveri_ics_datoteke(poti_do_ics)
-    koledarji = [nalozi_ics(pot) for pot in poti_do_ics]
+    if isinstance(poti_do_ics, str):
+        poti_do_ics = preveri_ics_datoteke(poti_do_ics)
+    else:
+        n_koledarjev = sum(isinstance(koledar, Koledar) for koledar in poti_do_ics)
+        if 0 < n_koledarjev < len(poti_do_ics):
+            raise ValueError(
+                "Seznam poti_do_ics mora vsebovati bodisi le poti do ics datotek "
+                "bodisi le naložene koledarje, ne pa oboje."
+            )
+        if not n_koledarjev:
+            poti_do_ics = preveri_ics_datoteke(poti_do_ics)
+    koledarji = nalozi_koledarje(poti_do_ics, register=register)
     ustrezni_roki = ustrezni_izpitni_roki(koledarji, _filter_za_isrm)
     print("Roki za predmete, ki jih ponudimo IŠRM:")
     for rok in ustrezni_roki:
@@ -1,8 +1,16 @@
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple, Union, Generator, Callable
 from datetime import datetime
 from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import repeat
 import re
 import os
+import copy
+import sys
+import mmap
 from izpitni_roki.osnovno import (
     naredi_zapisnikarja,
     IzpitniRok,
@@ -12,9 +20,14 @@ from izpitni_roki.osnovno import (
     Letnik,
     Rok,
     Obdobje,
+    IndeksObdobij,
     Izvajalec,
     IDTerIme,
+    IcsIzsek,
+    Register,
+    PRIVZETI_REGISTER,
 )
+from izpitni_roki.predpomnilnik import Predpomnilnik
 
 OBLIKA_SUMMARY = (
     r"^(?P<predmet>[^(]+)\((?P<smeri>[^)]+)\)\\, ?"
@@ -23,18 +36,8 @@ OBLIKA_SUMMARY = (
     r"(?P<rok>\d+\.) rok ?$"
 )
 OBLIKA_DATUM = "%Y%m%d"
-
-
-def doloci_leto(pot: str, oblika_datuma: Optional[str] = None) -> int:
-    oblika_datuma = OBLIKA_DATUM if oblika_datuma is None else oblika_datuma
-    leta = []
-    kljuc = "DTSTART;VALUE=DATE:"
-    with open(pot, encoding="utf-8") as f:
-        for vrsta in f:
-            if vrsta.startswith(kljuc):
-                datum = datetime.strptime(vrsta[len(kljuc) : -1], oblika_datuma)
-                leta.append(datum.year)
-    return Counter(leta).most_common(1)[0][0]
+# največje število različnih povzetkov (polj SUMMARY), katerih razčlenitev si zapomnimo
+VELIKOST_SPOMINA_POVZETKOV = 4096
 
 
 def naredi_izpitna_obdobja(leto: int) -> Dict[str, Tuple[datetime, datetime]]:
@@ -63,29 +66,46 @@ def naredi_izpitna_obdobja(leto: int) -> Dict[str, Tuple[datetime, datetime]]:
     }
 
 
-ZAPISNIKAR = naredi_zapisnikarja(__file__)
+def naredi_seznam_obdobij(
+    obdobja: Dict[str, Tuple[datetime, datetime]], register: Register = PRIVZETI_REGISTER
+) -> List[Obdobje]:
+    """
+    Iz slovarja izpitnih obdobij naredi seznam objektov Obdobje.
 
+    :param obdobja: slovar ``{ime: (zacetek, konec), ...}``,
+        npr. :func:`izpitni_roki.nalozi_ics.naredi_izpitna_obdobja`
+    :param register: register, v katerem ustvarimo obdobja
 
-def preberi_vrednosti(
-    vrstice: List[str], nujni_kljuci: List[str]
-) -> Tuple[Dict[str, str], str]:
+    :return: seznam obdobij (v vrstnem redu slovarja)
     """
-    Vrstice, ki opisujejo dogodek (izpitni rok) ali pa koledar, predela tako, da odstrani
-        morebitne prelome vrstic in jih združi v slovar {kljuc: vrednost, ...}, kjer so ključi
-        ključne besede iz .ics formata, npr. ``DTSTART;VALUE=DATE`` ali ``X-WR-TIMEZONE``.
+    return [
+        register.naredi_objekt(Obdobje, ime_obdobja, zacetek, konec)
+        for ime_obdobja, (zacetek, konec) in obdobja.items()
+    ]
 
-    :param vrstice: zaporedne vrstice iz ics datoteke, ki opisujejo dogodek ali koledar.
-        Seznam ne vsebuje ne začetne vrstice (BEGIN:VCALENDAR ali BEGIN:VEVENT) ne končne
-        vrstice (END:VCALENDAR ali END:VEVENT).
-    :param nujni_kljuci: ključi, ki jih nujno potrebujemo, da bi lahko kasneje ustvarili
-        IzpitniRok ali Koledar
 
-    :return: par (slovar, združene vrstice), kjer slovar podaja pare
-        ključna beseda iz ics: pripadajoča vrednost (v pripadajoči vrednosti so
-        bili odstranjeni prelomi vrstic), združene vrstice pa so dobljene
-        kot ``"\\n".join(vrstice)``.
+def naredi_indeks_obdobij(
+    obdobja: Dict[str, Tuple[datetime, datetime]], register: Register = PRIVZETI_REGISTER
+) -> IndeksObdobij:
     """
-    kljucne_besede = [
+    Iz slovarja izpitnih obdobij naredi indeks, s katerim jih hitro določamo rokom.
+
+    :param obdobja: glej :func:`izpitni_roki.nalozi_ics.naredi_seznam_obdobij`
+    :param register: register, v katerem ustvarimo obdobja
+
+    :return: indeks obdobij (z obdobjem ``register.obdobje_izven`` za roke izven njih)
+    """
+    return IndeksObdobij(naredi_seznam_obdobij(obdobja, register), register.obdobje_izven)
+
+
+ZAPISNIKAR = naredi_zapisnikarja(__file__)
+
+
+# Ključne besede iz .ics formata, ki jih poznamo. Ključ slovarja je ime lastnosti (do prvega
+# znaka ``:`` ali ``;``), vrednost pa celotna ključna beseda (skupaj z morebitnimi parametri).
+KLJUCNE_BESEDE = {
+    kljucna.split(";")[0]: kljucna
+    for kljucna in [
         # dogodek
         "DTSTART;VALUE=DATE",
         "DTEND;VALUE=DATE",
@@ -107,30 +127,72 @@ def preberi_vrednosti(
         "X-WR-CALNAME",
         "X-WR-TIMEZONE",
     ]
+}
+# Ključi, s katerimi prepoznamo dogodek in njegovo različico (glej posodobi_ics).
+KLJUCI_RAZLICICE = ["UID", "SEQUENCE", "LAST-MODIFIED"]
+
+
+def preberi_vrednosti(
+    vrstice: List[str],
+    nujni_kljuci: List[str],
+    neobvezni_kljuci: Optional[List[str]] = None,
+) -> Tuple[Dict[str, str], str]:
+    """
+    Vrstice, ki opisujejo dogodek (izpitni rok) ali pa koledar, predela tako, da odstrani
+        morebitne prelome vrstic in jih združi v slovar {kljuc: vrednost, ...}, kjer so ključi
+        ključne besede iz .ics formata, npr. ``DTSTART;VALUE=DATE`` ali ``X-WR-TIMEZONE``.
+
+        Vsako vrstico razbijemo le enkrat (pri prvem znaku ``:`` oz. ``;``) in ime lastnosti
+        poiščemo v slovarju :data:`KLJUCNE_BESEDE`. Vrstice z neznanimi ključnimi besedami
+        ignoriramo (in o tem izdamo opozorilo).
+
+    :param vrstice: zaporedne vrstice iz ics datoteke, ki opisujejo dogodek ali koledar.
+        Seznam ne vsebuje ne začetne vrstice (BEGIN:VCALENDAR ali BEGIN:VEVENT) ne končne
+        vrstice (END:VCALENDAR ali END:VEVENT).
+    :param nujni_kljuci: ključi, ki jih nujno potrebujemo, da bi lahko kasneje ustvarili
+        IzpitniRok ali Koledar
+    :param neobvezni_kljuci: ključi, ki jih vrnemo, če so prisotni
+
+    :return: par (slovar, združene vrstice), kjer slovar podaja pare
+        ključna beseda iz ics: pripadajoča vrednost (v pripadajoči vrednosti so
+        bili odstranjeni prelomi vrstic), združene vrstice pa so dobljene
+        kot ``"\\n".join(vrstice)``.
+    """
     pari = {}
     zadnja = ""
     for vrsta in vrstice:
-        if any(vrsta.startswith((zacetek := kljucna)) for kljucna in kljucne_besede):
-            zadnja = zacetek
-            pari[zadnja] = vrsta[len(zacetek) + 1 :]
-        elif re.match("^[A-Z]+:.+$", vrsta) is not None:
+        if not vrsta:
+            continue
+        if vrsta[0] == " " or vrsta[0] == "\t":
+            # prelom originalne vrste: se začne s presledkom (ali tabulatorjem)
+            if zadnja:
+                pari[zadnja] += vrsta[1:]
+            continue
+        ime = vrsta.partition(":")[0].partition(";")[0]
+        kljucna = KLJUCNE_BESEDE.get(ime)
+        if kljucna is not None and vrsta.startswith(kljucna):
+            zadnja = kljucna
+            pari[zadnja] = vrsta[len(kljucna) + 1 :]
+        else:
             ZAPISNIKAR.warning(f"Neznana ključna beseda v vrstici {vrsta}, ignoriram")
             zadnja = ""
-        elif zadnja:
-            # prelom originalne vrste: se začne s presledkom
-            assert vrsta[0] == " ", vrsta
-            pari[zadnja] += vrsta[1:]
     for nujen in nujni_kljuci:
         if nujen not in pari:
             raise ValueError(f"Ključ {nujen} manjka v {vrstice}")
-    return {n: pari[n] for n in nujni_kljuci}, "\n".join(vrstice)
+    vrednosti = {n: pari[n] for n in nujni_kljuci}
+    for neobvezen in neobvezni_kljuci or []:
+        if neobvezen in pari:
+            vrednosti[neobvezen] = pari[neobvezen]
+    return vrednosti, "\n".join(vrstice)
 
 
 def sprocesiraj_dogodek(
     vrstice: List[str],
-    obdobja: List[Obdobje],
+    obdobja: Optional[Union[List[Obdobje], IndeksObdobij]],
     oblika_summary: Optional[str],
     oblika_datum: Optional[str],
+    izsek: Optional[IcsIzsek] = None,
+    register: Register = PRIVZETI_REGISTER,
 ) -> IzpitniRok:
     """
     Iz vrstic dogodka ustvari izpitni rok.
@@ -152,7 +214,10 @@ def sprocesiraj_dogodek(
         koledar ali dogodek, v njih nista prisotna začena in končna vrstica
         (``[BEGIN oz. END]:VEVENT``). Nujno morata biti v njih prisotna ključa
         ``SUMARY`` in ``DTSTART;VALUE=DATE``.
-    :param obdobja: seznam izpitnih obdobij
+    :param obdobja: seznam (ali indeks, glej :class:`izpitni_roki.osnovno.IndeksObdobij`)
+        izpitnih obdobij. Če je ``None``, obdobja roku (še) ne določimo,
+        zato ga tudi ne preverimo (glej :meth:`izpitni_roki.osnovno.IzpitniRok.preveri`):
+        za oboje mora poskrbeti klicatelj, ko obdobja pozna.
     :param oblika_summary: regularni izraz, ki mu zadošča vrednost polja ``SUMMARY``.
         Vsebovati mora iste poimenovane skupine, kot jih (prednastavljeni)
 
@@ -164,6 +229,10 @@ def sprocesiraj_dogodek(
             r"(?P<rok>\d+\.) rok ?$"
 
     :param oblika_datum: pythonov format za datum, npr. ``%Y%m%d``
+    :param izsek: surov opis dogodka kot odsek vsebine datoteke. Če ni podan, ga sestavimo
+        iz vrstic.
+    :param register: register, v katerem ustvarimo (oz. poiščemo) predmet, izvajalce ...
+        (glej :class:`izpitni_roki.osnovno.Register`). Obdobja morajo biti iz istega registra.
 
     :return: IzpitniRok, ki ga opisujejo vrstice
 
@@ -171,16 +240,109 @@ def sprocesiraj_dogodek(
 
     """
 
-    def razbij_na_dele(niz: str, prepovedano=None):
-        if prepovedano is None:
-            prepovedano = []
-        return list(
-            filter(
-                lambda delcek: delcek not in prepovedano and delcek,
-                map(lambda kos: kos.strip(), niz.split("\\,")),
-            )
+    zacetek = "DTSTART;VALUE=DATE"
+    povzetek = "SUMMARY"
+    vrednosti, ics_raw = preberi_vrednosti(vrstice, [zacetek, povzetek], KLJUCI_RAZLICICE)
+    return naredi_izpitni_rok(
+        vrednosti[zacetek],
+        vrednosti[povzetek],
+        "BEGIN:VEVENT\n" + ics_raw + "\nEND:VEVENT" if izsek is None else izsek,
+        obdobja,
+        oblika_summary,
+        oblika_datum,
+        uid=vrednosti.get("UID"),
+        razlicica=(vrednosti.get("SEQUENCE"), vrednosti.get("LAST-MODIFIED")),
+        register=register,
+    )
+
+
+@lru_cache(maxsize=VELIKOST_SPOMINA_POVZETKOV)
+def razcleni_povzetek(
+    povzetek: str, oblika_summary: str
+) -> Tuple[str, Tuple[str, ...], str, Tuple[str, ...], str]:
+    """
+    Razčleni vrednost polja ``SUMMARY`` na predmet, smeri, letnik, izvajalce in rok.
+
+    Isti povzetki se pogosto ponovijo (npr. skupni predmeti v koledarjih več smeri), zato
+    si zadnjih :data:`VELIKOST_SPOMINA_POVZETKOV` razčlenitev zapomnimo. Dobljena imena
+    internaliziramo (``sys.intern``), da si ponovitve delijo isti niz.
+
+    :param povzetek: vrednost polja ``SUMMARY`` (brez prelomov vrstic)
+    :param oblika_summary: regularni izraz, ki mu zadošča povzetek,
+        glej :func:`izpitni_roki.nalozi_ics.sprocesiraj_dogodek`
+
+    :return: peterica (predmet, smeri, letnik, izvajalci, rok)
+
+    :raises: ValueError če povzetek ni predpisane oblike.
+    """
+    izpit = re.match(oblika_summary, povzetek)
+    if izpit is None:
+        raise ValueError(f"'{povzetek}' ni izraz oblike {oblika_summary}")
+    return (
+        sys.intern(izpit.group("predmet").strip()),
+        _razbij_na_dele(izpit.group("smeri"), prepovedano=("ni smeri",)),
+        sys.intern(izpit.group("letnik")),
+        _razbij_na_dele(izpit.group("izvajalci")),
+        sys.intern(izpit.group("rok")),
+    )
+
+
+def _zabelezi_zadetke(pot: str, pred: tuple):
+    """
+    V dnevnik zapiše, kolikšen delež povzetkov iz datoteke ``pot`` smo že poznali.
+
+    :param pot: pot do prebrane datoteke
+    :param pred: stanje ``razcleni_povzetek.cache_info()`` pred branjem datoteke
+    """
+    po = razcleni_povzetek.cache_info()
+    zadetki = po.hits - pred.hits
+    vseh = zadetki + po.misses - pred.misses
+    if vseh:
+        ZAPISNIKAR.info(
+            f"{pot}: {zadetki} od {vseh} povzetkov ({zadetki / vseh:.0%}) "
+            f"je bilo že razčlenjenih"
         )
 
+
+@lru_cache(maxsize=VELIKOST_SPOMINA_POVZETKOV)
+def _razbij_na_dele(niz: str, prepovedano: Tuple[str, ...] = ()) -> Tuple[str, ...]:
+    # seznami izvajalcev in smeri se ponavljajo tudi med različnimi roki istega predmeta
+    return tuple(
+        sys.intern(delcek)
+        for delcek in map(lambda kos: kos.strip(), niz.split("\\,"))
+        if delcek not in prepovedano and delcek
+    )
+
+
+def naredi_izpitni_rok(
+    niz_datum: str,
+    povzetek: str,
+    ics_vrstice: Union[str, IcsIzsek],
+    obdobja: Optional[Union[List[Obdobje], IndeksObdobij]],
+    oblika_summary: Optional[str],
+    oblika_datum: Optional[str],
+    uid: Optional[str] = None,
+    razlicica: Optional[Tuple[Optional[str], Optional[str]]] = None,
+    register: Register = PRIVZETI_REGISTER,
+) -> IzpitniRok:
+    """
+    Ustvari izpitni rok iz že prebranih (in združenih) vrednosti polj ``DTSTART;VALUE=DATE``
+    in ``SUMMARY``.
+
+    :param niz_datum: vrednost polja ``DTSTART;VALUE=DATE``, npr. ``20220629``
+    :param povzetek: vrednost polja ``SUMMARY`` (brez prelomov vrstic)
+    :param ics_vrstice: surov opis dogodka (od ``BEGIN:VEVENT`` do ``END:VEVENT``)
+    :param obdobja: glej :func:`izpitni_roki.nalozi_ics.sprocesiraj_dogodek`
+    :param oblika_summary: glej :func:`izpitni_roki.nalozi_ics.sprocesiraj_dogodek`
+    :param oblika_datum: glej :func:`izpitni_roki.nalozi_ics.sprocesiraj_dogodek`
+    :param uid: vrednost polja ``UID``
+    :param razlicica: vrednosti polj ``SEQUENCE`` in ``LAST-MODIFIED``
+    :param register: glej :func:`izpitni_roki.nalozi_ics.sprocesiraj_dogodek`
+
+    :return: IzpitniRok
+
+    :raises: ValueError če ``SUMMARY`` dogodka ni predpisane oblike.
+    """
     if oblika_summary is None:
         pricakovana_oblika = OBLIKA_SUMMARY
     else:
@@ -188,33 +350,28 @@ def sprocesiraj_dogodek(
     if oblika_datum is None:
         oblika_datum = OBLIKA_DATUM
 
-    zacetek = "DTSTART;VALUE=DATE"
-    povzetek = "SUMMARY"
-    vrednosti, ics_raw = preberi_vrednosti(vrstice, [zacetek, povzetek])
-    datum = datetime.strptime(vrednosti[zacetek], oblika_datum)
+    datum = datetime.strptime(niz_datum, oblika_datum)
 
-    izpit = re.match(pricakovana_oblika, vrednosti[povzetek])
-    if izpit is None:
-        raise ValueError(
-            f"'{vrednosti[povzetek]}' ni izraz oblike {pricakovana_oblika}"
-        )
-    predmet = izpit.group("predmet").strip()
-    smeri = razbij_na_dele(izpit.group("smeri"), prepovedano=["ni smeri"])
-    letnik = izpit.group("letnik")
-    izvajalci = razbij_na_dele(izpit.group("izvajalci"))
-    rok = izpit.group("rok")
+    predmet, smeri, letnik, izvajalci, rok = razcleni_povzetek(povzetek, pricakovana_oblika)
 
     izpitni_rok = IzpitniRok(
         datum,
-        IDTerIme.naredi_objekt(Predmet, predmet),
-        [IDTerIme.naredi_objekt(Program, smer) for smer in smeri],
-        IDTerIme.naredi_objekt(Letnik, letnik),
-        IDTerIme.naredi_objekt(Rok, rok),
-        [IDTerIme.naredi_objekt(Izvajalec, izvajalec) for izvajalec in izvajalci],
-        Obdobje.doloci_obdobje(datum, obdobja),
-        "BEGIN:VEVENT\n" + ics_raw + "\nEND:VEVENT",
+        register.naredi_objekt(Predmet, predmet),
+        [register.naredi_objekt(Program, smer) for smer in smeri],
+        register.naredi_objekt(Letnik, letnik),
+        register.naredi_objekt(Rok, rok),
+        [register.naredi_objekt(Izvajalec, izvajalec) for izvajalec in izvajalci],
+        (
+            Obdobje.doloci_obdobje(datum, obdobja, register.obdobje_izven)
+            if obdobja is not None
+            else None
+        ),
+        ics_vrstice,
+        uid=uid,
+        razlicica=razlicica,
     )
-    izpitni_rok.preveri()
+    if obdobja is not None:
+        izpitni_rok.preveri()
     return izpitni_rok
 
 
@@ -240,6 +397,7 @@ def nalozi_ics(
     obdobja: Optional[Dict[str, Tuple[datetime, datetime]]] = None,
     oblika_summary: Optional[str] = None,
     oblika_datum: Optional[str] = None,
+    register: Register = PRIVZETI_REGISTER,
 ) -> Koledar:
     """
     Naloži ics datoteko v Koledar. Pričakovana oblika vsebine datoteke je
@@ -283,57 +441,670 @@ def nalozi_ics(
         Izpitni roki, ki so izven vseh, bodo v posebni kategoriji.
     :param oblika_summary: regularni izraz, ki naj mu zadošča polje ``SUMMARY`` v datoteki
     :param oblika_datum: pythonov format za datum (npr. ``%Y%m%D``).
+    :param register: register, v katerem ustvarimo predmete, izvajalce ...
+        (glej :class:`izpitni_roki.osnovno.Register`)
+
+    Če obdobja niso podana, leta štejemo kar med branjem, obdobja pa rokom določimo na koncu
+    (glej :func:`izpitni_roki.nalozi_ics._doloci_obdobja_naknadno`), zato datoteko preberemo
+    le enkrat.
 
     :return: Koledar, ki vsebuje vse dogodke v ics datoteki.
     """
+    indeks_obdobij = None if obdobja is None else naredi_indeks_obdobij(obdobja, register)
+    zadetki_pred = razcleni_povzetek.cache_info()
+    leta = Counter()
+    izpiti: List[IzpitniRok] = []
+    dogodki = _dogodki_ics(pot)
+    while True:
+        try:
+            vrstice_dogodka, izsek = next(dogodki)
+        except StopIteration as konec:
+            vrstice_koledarja: List[str] = konec.value
+            break
+        izpit = sprocesiraj_dogodek(
+            vrstice_dogodka, indeks_obdobij, oblika_summary, oblika_datum, izsek, register
+        )
+        if indeks_obdobij is None:
+            leta[izpit.datum.year] += 1
+        if not izpit.ignoriraj():
+            izpiti.append(izpit)
+    if leta:
+        _doloci_obdobja_naknadno(izpiti, leta, register)
+    _zabelezi_zadetke(pot, zadetki_pred)
+    return naredi_koledar(vrstice_koledarja, izpiti)
+
+
+def nalozi_ics_iter(
+    pot: str,
+    obdobja: Optional[Dict[str, Tuple[datetime, datetime]]] = None,
+    oblika_summary: Optional[str] = None,
+    oblika_datum: Optional[str] = None,
+    register: Register = PRIVZETI_REGISTER,
+) -> Generator[IzpitniRok, None, Koledar]:
+    """
+    Pretočna različica funkcije :func:`izpitni_roki.nalozi_ics.nalozi_ics`: izpitni roki
+    so vrnjeni sproti, takoj ko preberemo konec dogodka (``END:VEVENT``), zato jih lahko
+    filtriramo ali povzemamo, ne da bi jih hranili v pomnilniku vse hkrati. Ignorirani roki
+    (glej :meth:`izpitni_roki.osnovno.IzpitniRok.ignoriraj`) niso vrnjeni.
+
+    Če obdobja niso podana, leto (in s tem osnovna izpitna obdobja) določimo iz datumov
+    vseh rokov v prvem, hitrem prehodu skozi datoteko, v katerem beremo le vrstice
+    ``DTSTART;VALUE=DATE`` (glej :func:`izpitni_roki.nalozi_ics._prestej_leta`). Datoteko
+    tako preberemo dvakrat, a le tako lahko roke vračamo sproti, ne da bi jih do konca
+    hranili v pomnilniku. Kdor potrebuje vse roke hkrati, naj raje uporabi
+    :func:`izpitni_roki.nalozi_ics.nalozi_ics`, ki datoteko prebere le enkrat.
+
+    Ko preberemo celo datoteko, generator vrne (``return``) koledar z meta podatki,
+    katerega seznam izpitnih rokov je prazen. Dobimo ga kot vrednost izraza ``yield from``
+    oz. kot ``StopIteration.value``.
+
+    :param pot: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param obdobja: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param oblika_summary: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param oblika_datum: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param register: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+
+    :return: generator izpitnih rokov, ki na koncu vrne koledar (brez izpitnih rokov)
+
+    :raises: ValueError, če koledar ni bil ustvarjen ali če se število prebranih rokov
+        ne ujema s številom dogodkov v datoteki.
+    """
 
-    if obdobja is None:
-        leto = doloci_leto(pot, oblika_datum)
-        ZAPISNIKAR.info(f"Iz datumov sklepam, da gre za leto {leto}.")
-        obdobja = naredi_izpitna_obdobja(leto)
-    seznam_obdobij = []
-    for ime_obdobja, (zacetek, konec) in obdobja.items():
-        seznam_obdobij.append(
-            IDTerIme.naredi_objekt(Obdobje, ime_obdobja, zacetek, konec)
+    if obdobja is not None:
+        indeks_obdobij = naredi_indeks_obdobij(obdobja, register)
+    else:
+        leta = _prestej_leta(pot, oblika_datum)
+        indeks_obdobij = _indeks_iz_let(leta, register) if leta else None
+    zadetki_pred = razcleni_povzetek.cache_info()
+    dogodki = _dogodki_ics(pot)
+    while True:
+        try:
+            vrstice_dogodka, izsek = next(dogodki)
+        except StopIteration as konec:
+            vrstice_koledarja: List[str] = konec.value
+            break
+        izpit = sprocesiraj_dogodek(
+            vrstice_dogodka, indeks_obdobij, oblika_summary, oblika_datum, izsek, register
         )
+        if not izpit.ignoriraj():
+            yield izpit
+    _zabelezi_zadetke(pot, zadetki_pred)
+    return naredi_koledar(vrstice_koledarja, [])
+
+
+def _prestej_leta(pot: str, oblika_datum: Optional[str]) -> Counter:
+    """
+    Prešteje leta datumov vseh dogodkov v datoteki. Beremo le vrstice, ki se začnejo z
+    ``DTSTART;VALUE=DATE:``, zato je prehod hiter in ne porablja pomnilnika.
+
+    :param pot: pot do ics datoteke
+    :param oblika_datum: glej :func:`izpitni_roki.nalozi_ics.sprocesiraj_dogodek`
+
+    :return: števec let (tudi rokov, ki jih kasneje ignoriramo)
+    """
+    oblika_datum = OBLIKA_DATUM if oblika_datum is None else oblika_datum
+    kljuc = b"DTSTART;VALUE=DATE:"
+    leta = Counter()
+    with open(pot, "rb") as f:
+        for vrsta in f:
+            if vrsta.startswith(kljuc):
+                niz_datum = vrsta[len(kljuc) :].decode("utf-8").strip()
+                leta[datetime.strptime(niz_datum, oblika_datum).year] += 1
+    return leta
+
+
+def _dogodki_ics(pot: str) -> Generator[Tuple[List[str], IcsIzsek], None, List[str]]:
+    """
+    Sproti vrača vrstice posameznih dogodkov v ics datoteki (brez začetne in končne vrstice
+    dogodka), na koncu pa vrne (``return``) še vrstice koledarja, ki niso del nobenega dogodka.
+
+    Datoteko beremo po vrsticah, zato v pomnilniku hranimo le trenutni dogodek. Surov opis
+    dogodka je (nedekodiran) kos bajtov le tega dogodka (:class:`izpitni_roki.osnovno.IcsIzsek`),
+    zato izpitni roki ne ohranjajo vsebine celotne datoteke.
+
+    :param pot: pot do ics datoteke
+
+    :return: generator parov (vrstice dogodka, surov opis dogodka), ki na koncu vrne
+        vrstice koledarja
+
+    :raises: ValueError, če koledar ni bil ustvarjen ali če se število prebranih dogodkov
+        ne ujema s številom dogodkov v datoteki.
+    """
+    konec_dogodka = b"END:VEVENT"
     v_koledarju = False
     v_dogodku = False
     vrstice_koledarja = []
     vrstice_dogodka = []
-    izpiti: List[IzpitniRok] = []
-    koledar: Optional[Koledar] = None
-    n_rokov = 0
-    n_ignoriranih = 0
-    with open(pot, encoding="utf-8") as f:
-        for vrsta in f:
-            if vrsta.startswith("BEGIN:VEVENT"):
+    surove_vrstice = []  # vrstice trenutnega dogodka, kot so v datoteki
+    koledar_koncan = False
+    n_dogodkov = 0
+    n_prebranih = 0
+    with open(pot, "rb") as f:
+        for vrstica in f:
+            vrsta = vrstica[:-1] if vrstica.endswith(b"\n") else vrstica
+            if vrsta.startswith(b"BEGIN:VEVENT"):
                 v_dogodku = True
-                n_rokov += 1
-            elif vrsta.startswith("END:VEVENT"):
-                izpit = sprocesiraj_dogodek(
-                    vrstice_dogodka, seznam_obdobij, oblika_summary, oblika_datum
-                )
-                if not izpit.ignoriraj():
-                    izpiti.append(izpit)
-                else:
-                    n_ignoriranih += 1
+                surove_vrstice = [vrstica]
+                n_dogodkov += 1
+            elif vrsta.startswith(konec_dogodka):
+                n_prebranih += 1
+                surove_vrstice.append(konec_dogodka)
+                dogodek = b"".join(surove_vrstice)
+                yield vrstice_dogodka, IcsIzsek(dogodek, 0, len(dogodek))
                 vrstice_dogodka = []
+                surove_vrstice = []
                 v_dogodku = False
-            elif vrsta.startswith("BEGIN:VCALENDAR"):
+            elif vrsta.startswith(b"BEGIN:VCALENDAR"):
                 v_koledarju = True
-            elif vrsta.startswith("END:VCALENDAR"):
-                koledar = naredi_koledar(vrstice_koledarja, izpiti)
+            elif vrsta.startswith(b"END:VCALENDAR"):
+                koledar_koncan = True
                 v_koledarju = False
             elif v_dogodku:
-                vrstice_dogodka.append(vrsta.replace("\n", ""))
+                surove_vrstice.append(vrstica)
+                vrstice_dogodka.append(vrsta.rstrip(b"\r").decode("utf-8"))
             elif v_koledarju:  # mora biti za dogodkom
-                vrstice_koledarja.append(vrsta.replace("\n", ""))
-    if koledar is None:
+                vrstice_koledarja.append(vrsta.rstrip(b"\r").decode("utf-8"))
+    if not koledar_koncan:
         raise ValueError(f"Koledar ni bil ustvarjen pri branu iz {pot}")
-    elif len(koledar.izpitni_roki) + n_ignoriranih != n_rokov:
+    elif n_prebranih != n_dogodkov:
         raise ValueError(
-            f"Število prebranih rokov ({len(koledar.izpitni_roki)}) se "
-            f"ne ujema s številom rokov v datoteki ({n_rokov})."
+            f"Število prebranih rokov ({n_prebranih}) se "
+            f"ne ujema s številom rokov v datoteki ({n_dogodkov})."
+        )
+    return vrstice_koledarja
+
+
+@dataclass
+class Spremembe:
+    """Spremembe koledarja glede na njegovo prejšnjo različico (glej posodobi_ics)"""
+
+    dodani: List[IzpitniRok]
+    spremenjeni: List[Tuple[IzpitniRok, IzpitniRok]]  # pari (star, nov)
+    odstranjeni: List[IzpitniRok]
+
+    def __bool__(self):
+        return bool(self.dodani or self.spremenjeni or self.odstranjeni)
+
+
+def posodobi_ics(
+    pot: str,
+    prejsnji: Koledar,
+    obdobja: Optional[Dict[str, Tuple[datetime, datetime]]] = None,
+    oblika_summary: Optional[str] = None,
+    oblika_datum: Optional[str] = None,
+    register: Register = PRIVZETI_REGISTER,
+) -> Tuple[Koledar, Spremembe]:
+    """
+    Ponovno naloži ics datoteko, ki smo jo že naložili v koledar ``prejsnji``. Dogodke
+    primerjamo s prejšnjimi po polju ``UID``: če se ujemata tudi ``SEQUENCE`` in
+    ``LAST-MODIFIED``, prejšnji izpitni rok kar ponovno uporabimo (v koledar damo njegovo
+    kopijo, ki ji surove ics vrstice zamenjamo z novimi), sicer dogodek ponovno
+    obdelamo s :func:`izpitni_roki.nalozi_ics.sprocesiraj_dogodek`. Dogodki brez ``UID``
+    (ali brez obeh polj z različico) so vedno obdelani na novo, zato so vedno med
+    odstranjenimi in dodanimi.
+
+    :param pot: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param prejsnji: koledar, ki smo ga naložili iz prejšnje različice datoteke
+        (z enakimi obdobji in oblikami polj)
+    :param obdobja: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param oblika_summary: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param oblika_datum: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param register: register, v katerem smo naložili koledar ``prejsnji``
+
+    :return: par (nov koledar, spremembe glede na prejšnjega). Izpitni roki v novem koledarju
+        so v enakem vrstnem redu kot v datoteki.
+    """
+    indeks_obdobij = None if obdobja is None else naredi_indeks_obdobij(obdobja, register)
+    zadetki_pred = razcleni_povzetek.cache_info()
+    prejsnji_roki = {}
+    spremembe = Spremembe([], [], [])
+    for izpit in prejsnji.izpitni_roki:
+        if izpit.uid is None:
+            spremembe.odstranjeni.append(izpit)
+        else:
+            prejsnji_roki[izpit.uid] = izpit
+    izpiti: List[IzpitniRok] = []
+    novi: List[IzpitniRok] = []
+    leta = Counter()
+    dogodki = _dogodki_ics(pot)
+    while True:
+        try:
+            vrstice_dogodka, izsek = next(dogodki)
+        except StopIteration as konec:
+            vrstice_koledarja: List[str] = konec.value
+            break
+        vrednosti, _ = preberi_vrednosti(vrstice_dogodka, [], KLJUCI_RAZLICICE)
+        razlicica = (vrednosti.get("SEQUENCE"), vrednosti.get("LAST-MODIFIED"))
+        star = prejsnji_roki.pop(vrednosti.get("UID"), None)
+        if star is not None and star.razlicica == razlicica and None not in razlicica:
+            leta[star.datum.year] += 1
+            # surove vrstice vzamemo iz nove datoteke, da rok ne kaže na vsebino stare;
+            # rok prej skopiramo, da koledar ``prejsnji`` ostane nespremenjen
+            nov = copy.copy(star)
+            nov._ics_vrstice = izsek
+            izpiti.append(nov)
+            continue
+        izpit = sprocesiraj_dogodek(
+            vrstice_dogodka, indeks_obdobij, oblika_summary, oblika_datum, izsek, register
         )
+        leta[izpit.datum.year] += 1
+        if izpit.ignoriraj():
+            if star is not None:
+                spremembe.odstranjeni.append(star)
+            continue
+        izpiti.append(izpit)
+        novi.append(izpit)
+        if star is None:
+            spremembe.dodani.append(izpit)
+        else:
+            spremembe.spremenjeni.append((star, izpit))
+    spremembe.odstranjeni.extend(prejsnji_roki.values())
+    if indeks_obdobij is None and novi:
+        _doloci_obdobja_naknadno(novi, leta, register)
+    _zabelezi_zadetke(pot, zadetki_pred)
+    ZAPISNIKAR.info(
+        f"{pot}: ponovno obdelanih {len(novi)} od {len(izpiti)} rokov "
+        f"(dodanih {len(spremembe.dodani)}, spremenjenih {len(spremembe.spremenjeni)}, "
+        f"odstranjenih {len(spremembe.odstranjeni)})"
+    )
+    return naredi_koledar(vrstice_koledarja, izpiti), spremembe
+
+
+def _indeks_iz_let(leta: Counter, register: Register) -> IndeksObdobij:
+    """
+    Iz najpogostejšega leta naredi indeks osnovnih izpitnih obdobij
+    (glej :func:`izpitni_roki.nalozi_ics.naredi_izpitna_obdobja`).
+
+    :param leta: (neprazen) števec let vseh prebranih rokov (tudi ignoriranih)
+    :param register: register, v katerem ustvarimo obdobja
+
+    :return: indeks obdobij
+    """
+    leto = leta.most_common(1)[0][0]
+    ZAPISNIKAR.info(f"Iz datumov sklepam, da gre za leto {leto}.")
+    return naredi_indeks_obdobij(naredi_izpitna_obdobja(leto), register)
+
+
+def _doloci_obdobja_naknadno(izpiti: List[IzpitniRok], leta: Counter, register: Register):
+    """
+    Iz najpogostejšega leta naredi osnovna izpitna obdobja, nato pa izpitnim rokom
+    določi obdobja in jih preveri.
+
+    :param izpiti: izpitni roki, ki jim obdobja še niso bila določena
+    :param leta: števec let vseh prebranih rokov (tudi ignoriranih)
+    :param register: register, iz katerega so izpitni roki
+    """
+    obdobja = _indeks_iz_let(leta, register).doloci_vse(izpit.datum for izpit in izpiti)
+    for izpit, obdobje in zip(izpiti, obdobja):
+        izpit.obdobje = obdobje
+        izpit.preveri()
+
+
+def _vrednost_polja(vsebina, kljuc: bytes, zacetek: int, konec: int) -> Optional[str]:
+    """
+    V odseku ``vsebina[zacetek:konec]`` poišče vrstico, ki se začne s ``kljuc``,
+    in vrne njeno vrednost (skupaj z morebitnimi nadaljevanji v naslednjih vrsticah).
+
+    :return: dekodirana vrednost ali ``None``, če polja ni
+    """
+    i = vsebina.find(b"\n" + kljuc, zacetek, konec)
+    if i == -1:
+        return None
+    i += len(kljuc) + 1
+    kosi = []
+    while True:
+        j = vsebina.find(b"\n", i, konec)
+        if j == -1:
+            j = konec
+        kosi.append(vsebina[i:j].rstrip(b"\r"))
+        if j >= konec or vsebina[j + 1 : j + 2] not in (b" ", b"\t"):
+            break
+        i = j + 2
+    return b"".join(kosi).decode("utf-8")
+
+
+def nalozi_ics_mmap(
+    pot: str,
+    obdobja: Optional[Dict[str, Tuple[datetime, datetime]]] = None,
+    oblika_summary: Optional[str] = None,
+    oblika_datum: Optional[str] = None,
+    register: Register = PRIVZETI_REGISTER,
+) -> Koledar:
+    """
+    Različica funkcije :func:`izpitni_roki.nalozi_ics.nalozi_ics` za zelo velike datoteke.
+    Datoteko preslikamo v pomnilnik (``mmap``), meje dogodkov poiščemo kar v bajtih, dekodiramo
+    pa le polji ``DTSTART;VALUE=DATE`` in ``SUMMARY``. Surov opis dogodka skopiramo v
+    nedekodiran odsek (:class:`izpitni_roki.osnovno.IcsIzsek`), ki ga dekodiramo šele, ko ga
+    potrebujemo. Preslikavo pred vrnitvijo zapremo, zato koledar datoteke ne drži odprte.
+
+    Za razliko od :func:`izpitni_roki.nalozi_ics.nalozi_ics` ostalih polj dogodka ne
+    preverjamo (in zato tudi ne opozorimo na neznane ključne besede).
+
+    :param pot: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param obdobja: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param oblika_summary: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param oblika_datum: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param register: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+
+    :return: Koledar, ki vsebuje vse dogodke v ics datoteki.
+    """
+    zacetek_dogodka = b"BEGIN:VEVENT"
+    konec_dogodka = b"END:VEVENT"
+    with open(pot, "rb") as f:
+        try:
+            vsebina = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"Koledar ni bil ustvarjen pri branu iz {pot}")
+    # preslikavo zapremo takoj po branju, sicer bi (npr. na Windows) datoteka ostala zaklenjena
+    with vsebina:
+        zacetek_koledarja = vsebina.find(b"BEGIN:VCALENDAR")
+        konec_koledarja = vsebina.find(b"\nEND:VCALENDAR", zacetek_koledarja)
+        if zacetek_koledarja == -1 or konec_koledarja == -1:
+            raise ValueError(f"Koledar ni bil ustvarjen pri branu iz {pot}")
+
+        indeks_obdobij = None if obdobja is None else naredi_indeks_obdobij(obdobja, register)
+        zadetki_pred = razcleni_povzetek.cache_info()
+        leta = Counter()
+        izpiti: List[IzpitniRok] = []
+        meta = []  # odseki koledarja, ki niso del dogodkov
+        i = vsebina.find(b"\n", zacetek_koledarja) + 1
+        while True:
+            zacetek = vsebina.find(b"\n" + zacetek_dogodka, i - 1, konec_koledarja)
+            if zacetek == -1:
+                meta.append(vsebina[i:konec_koledarja])
+                break
+            zacetek += 1
+            meta.append(vsebina[i:zacetek])
+            konec = vsebina.find(b"\n" + konec_dogodka, zacetek, konec_koledarja)
+            # brez tega bi dogodek brez konca tiho združili z naslednjim
+            if konec == -1 or vsebina.find(b"\n" + zacetek_dogodka, zacetek, konec) != -1:
+                raise ValueError(f"Dogodek na mestu {zacetek} v {pot} nima konca.")
+            konec += 1 + len(konec_dogodka)
+            niz_datum = _vrednost_polja(vsebina, b"DTSTART;VALUE=DATE:", zacetek, konec)
+            povzetek = _vrednost_polja(vsebina, b"SUMMARY:", zacetek, konec)
+            if niz_datum is None or povzetek is None:
+                raise ValueError(
+                    "Ključ DTSTART;VALUE=DATE ali SUMMARY manjka v dogodku "
+                    f"na mestu {zacetek} v {pot}"
+                )
+            izpit = naredi_izpitni_rok(
+                niz_datum,
+                povzetek,
+                IcsIzsek(vsebina[zacetek:konec], 0, konec - zacetek),
+                indeks_obdobij,
+                oblika_summary,
+                oblika_datum,
+                uid=_vrednost_polja(vsebina, b"UID:", zacetek, konec),
+                razlicica=(
+                    _vrednost_polja(vsebina, b"SEQUENCE:", zacetek, konec),
+                    _vrednost_polja(vsebina, b"LAST-MODIFIED:", zacetek, konec),
+                ),
+                register=register,
+            )
+            if indeks_obdobij is None:
+                leta[izpit.datum.year] += 1
+            if not izpit.ignoriraj():
+                izpiti.append(izpit)
+            i = vsebina.find(b"\n", konec) + 1 or konec_koledarja
+        if leta:
+            _doloci_obdobja_naknadno(izpiti, leta, register)
+        _zabelezi_zadetke(pot, zadetki_pred)
+        meta_vrstice = [
+            vrsta
+            for vrsta in b"".join(meta).decode("utf-8").replace("\r\n", "\n").split("\n")
+            if vrsta
+        ]
+        return naredi_koledar(meta_vrstice, izpiti)
+
+
+def _nalozi_z_belezko(
+    nalagalnik: Callable[..., Koledar],
+    pot: str,
+    obdobja: Optional[Dict[str, Tuple[datetime, datetime]]],
+    oblika_summary: Optional[str],
+    oblika_datum: Optional[str],
+    register: Register,
+) -> Tuple[Koledar, List[IDTerIme]]:
+    """
+    Naloži ics datoteko in si pri tem zabeleži vse objekte razreda IDTerIme, ki jih potrebujemo.
+
+    :return: par (koledar, objekti), kjer so objekti urejeni po vrstnem redu prve uporabe
+    """
+    register.belezka = {}
+    try:
+        koledar = nalagalnik(pot, obdobja, oblika_summary, oblika_datum, register)
+        return koledar, list(register.belezka.values())
+    finally:
+        register.belezka = None
+
+
+def _nalozi_ics_v_procesu(
+    nalagalnik: Callable[..., Koledar],
+    pot: str,
+    obdobja: Optional[Dict[str, Tuple[datetime, datetime]]],
+    oblika_summary: Optional[str],
+    oblika_datum: Optional[str],
+) -> Tuple[Koledar, List[IDTerIme]]:
+    """
+    Naloži ics datoteko v ločenem procesu (v novem registru).
+
+    :return: par (koledar, objekti), kjer so objekti vsi objekti razreda IDTerIme,
+        ki smo jih potrebovali pri branju, v vrstnem redu prve uporabe.
+    """
+    return _nalozi_z_belezko(
+        nalagalnik, pot, obdobja, oblika_summary, oblika_datum, Register()
+    )
+
+
+def _uskladi_koledar(
+    koledar: Koledar, novi_objekti: List[IDTerIme], register: Register
+) -> Koledar:
+    """
+    Objekte, ki so nastali v drugem procesu, ponovno ustvari v danem registru, in sicer v
+    istem vrstnem redu kot pri zaporednem branju, zato dobijo (tudi ob morebitnih trkih)
+    enake id-je. Nato polja izpitnih rokov v koledarju nadomesti z ustvarjenimi objekti,
+    obdobja pa jim določi ponovno (tako kot pri zaporednem branju velja, da obdobje z danim
+    imenom obstaja le enkrat).
+
+    :param koledar: koledar, naložen v drugem procesu
+    :param novi_objekti: glej :func:`izpitni_roki.nalozi_ics._nalozi_ics_v_procesu`
+    :param register: register, v katerem ustvarimo objekte
+
+    :return: isti koledar s popravljenimi polji izpitnih rokov
+    """
+    for objekt in novi_objekti:
+        register.naredi_objekt(type(objekt), objekt.ime, *objekt.argumenti())
+    indeks_obdobij = IndeksObdobij(
+        [
+            register.poisci(Obdobje, objekt.ime)
+            for objekt in novi_objekti
+            if isinstance(objekt, Obdobje)
+        ],
+        register.obdobje_izven,
+    )
+
+    def poisci(objekt):
+        return register.poisci(type(objekt), objekt.ime)
+
+    for izpit in koledar.izpitni_roki:
+        izpit.predmet = poisci(izpit.predmet)
+        izpit.programi = list(map(poisci, izpit.programi))
+        izpit.letniki = list(map(poisci, izpit.letniki))
+        izpit.rok = poisci(izpit.rok)
+        izpit.izvajalci = list(map(poisci, izpit.izvajalci))
+        izpit.obdobje = indeks_obdobij.doloci(izpit.datum)
     return koledar
 
+
+_RAZREDI = {
+    razred.__name__: razred for razred in [Predmet, Program, Letnik, Rok, Izvajalec, Obdobje]
+}
+
+
+def _v_zapis(koledar: Koledar, objekti: List[IDTerIme]) -> tuple:
+    """
+    Koledar pretvori v kompakten zapis iz osnovnih podatkovnih tipov (nizov, datumov ...),
+    primeren za shranjevanje v predpomnilnik.
+
+    :param koledar: koledar
+    :param objekti: objekti, ki smo jih potrebovali pri branju koledarja,
+        glej :func:`izpitni_roki.nalozi_ics._nalozi_z_belezko`
+
+    :return: zapis, iz katerega koledar obnovimo z :func:`izpitni_roki.nalozi_ics._iz_zapisa`
+    """
+    return (
+        koledar.smer,
+        koledar.ics_vrstice,
+        [(type(objekt).__name__, objekt.ime, objekt.argumenti()) for objekt in objekti],
+        [
+            (
+                izpit.datum,
+                izpit.predmet.ime,
+                [program.ime for program in izpit.programi],
+                [letnik.ime for letnik in izpit.letniki],
+                izpit.rok.ime,
+                [izvajalec.ime for izvajalec in izpit.izvajalci],
+                str(izpit._ics_vrstice),
+                izpit.uid,
+                izpit.razlicica,
+            )
+            for izpit in koledar.izpitni_roki
+        ],
+    )
+
+
+def _iz_zapisa(zapis: tuple, register: Register) -> Koledar:
+    """
+    Iz zapisa, ki ga je naredila :func:`izpitni_roki.nalozi_ics._v_zapis`, obnovi koledar.
+    Objekte ustvarimo v enakem vrstnem redu kot pri branju datoteke, zato dobijo (tudi ob
+    morebitnih trkih) enake id-je.
+
+    :param zapis: zapis koledarja
+    :param register: register, v katerem ustvarimo objekte
+
+    :return: koledar
+    """
+    smer, ics_vrstice, objekti, roki = zapis
+    for ime_razreda, ime, argumenti in objekti:
+        register.naredi_objekt(_RAZREDI[ime_razreda], ime, *argumenti)
+    indeks_obdobij = IndeksObdobij(
+        [
+            register.poisci(Obdobje, ime)
+            for ime_razreda, ime, _ in objekti
+            if ime_razreda == Obdobje.__name__
+        ],
+        register.obdobje_izven,
+    )
+    poisci = register.poisci
+    izpiti = [
+        IzpitniRok(
+            datum,
+            poisci(Predmet, predmet),
+            [poisci(Program, program) for program in programi],
+            [poisci(Letnik, letnik) for letnik in letniki],
+            poisci(Rok, rok),
+            [poisci(Izvajalec, izvajalec) for izvajalec in izvajalci],
+            indeks_obdobij.doloci(datum),
+            ics_raw,
+            uid=uid,
+            razlicica=razlicica,
+        )
+        for datum, predmet, programi, letniki, rok, izvajalci, ics_raw, uid, razlicica in roki
+    ]
+    return Koledar(smer, izpiti, ics_vrstice)
+
+
+def nalozi_koledarje(
+    koledarji_ali_poti: List[Union[str, Koledar]],
+    obdobja: Optional[Dict[str, Tuple[datetime, datetime]]] = None,
+    oblika_summary: Optional[str] = None,
+    oblika_datum: Optional[str] = None,
+    vzporedno: bool = False,
+    n_procesov: Optional[int] = None,
+    preslikaj: bool = False,
+    predpomnilnik: Optional[str] = None,
+    register: Register = PRIVZETI_REGISTER,
+) -> List[Koledar]:
+    """
+    Naloži koledarje iz podanih ics datotek. Elementi, ki so že objekti tipa Koledar,
+    ostanejo nespremenjeni, zato lahko vse nadaljnje korake (preverjanje, izdelava html,
+    izpis rokov za IŠRM) poženemo na istem seznamu koledarjev, datoteke pa preberemo le enkrat.
+
+    :param koledarji_ali_poti: seznam poti do ics datotek in/ali že naloženih koledarjev
+    :param obdobja: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param oblika_summary: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param oblika_datum: glej :func:`izpitni_roki.nalozi_ics.nalozi_ics`
+    :param vzporedno: če je ``True``, datoteke beremo vzporedno v več procesih. Objekte
+        (predmete, izvajalce ...) nato ponovno ustvarimo v tem procesu v istem vrstnem redu
+        kot pri zaporednem branju, zato so id-ji (in končni html) enaki.
+    :param n_procesov: največje število procesov pri vzporednem branju
+        (privzeto toliko, kot je procesorjev)
+    :param preslikaj: če je ``True``, datoteke beremo s
+        :func:`izpitni_roki.nalozi_ics.nalozi_ics_mmap` (primerno za zelo velike datoteke)
+    :param predpomnilnik: mapa predpomnilnika (glej :class:`izpitni_roki.predpomnilnik.Predpomnilnik`).
+        Če je podana, datotek, ki jih (z enakimi nastavitvami) že imamo v predpomnilniku,
+        ne beremo ponovno. Ker zapise beremo s :mod:`pickle`, mora biti mapa zaupanja vredna.
+        Opozorila, ki jih ob branju izpiše nalagalnik (npr. o neveljavnih dogodkih), se za
+        koledarje iz predpomnilnika ne ponovijo.
+    :param register: register, v katerem ustvarimo predmete, izvajalce ...
+        (glej :class:`izpitni_roki.osnovno.Register`). Že naloženi koledarji morajo biti
+        naloženi v istem registru.
+
+    :return: seznam koledarjev (v istem vrstnem redu kot vhodni seznam)
+    """
+    nalagalnik = nalozi_ics_mmap if preslikaj else nalozi_ics
+    nastavitve = (obdobja, oblika_summary, oblika_datum)
+    shramba = None if predpomnilnik is None else Predpomnilnik(predpomnilnik)
+    kljuci = {}
+    zapisi = {}
+    manjkajoce = []
+    for i, pot in enumerate(koledarji_ali_poti):
+        if isinstance(pot, Koledar):
+            continue
+        if shramba is not None:
+            kljuci[i] = shramba.kljuc(
+                pot, None if obdobja is None else list(obdobja.items()), *nastavitve[1:]
+            )
+            zapis = shramba.preberi(kljuci[i])
+            if zapis is not None:
+                zapisi[i] = zapis
+                continue
+        manjkajoce.append(pot)
+
+    koledarji = []
+    with ExitStack() as sklad:
+        if vzporedno and manjkajoce:
+            bazen = sklad.enter_context(ProcessPoolExecutor(max_workers=n_procesov))
+            nalozeni = (
+                (_uskladi_koledar(koledar, objekti, register), objekti)
+                for koledar, objekti in bazen.map(
+                    _nalozi_ics_v_procesu,
+                    repeat(nalagalnik),
+                    manjkajoce,
+                    *map(repeat, nastavitve),
+                )
+            )
+        elif shramba is not None:
+            nalozeni = (
+                _nalozi_z_belezko(nalagalnik, pot, *nastavitve, register)
+                for pot in manjkajoce
+            )
+        else:
+            nalozeni = (
+                (nalagalnik(pot, *nastavitve, register), []) for pot in manjkajoce
+            )
+        for i, koledar in enumerate(koledarji_ali_poti):
+            if isinstance(koledar, Koledar):
+                koledarji.append(koledar)
+            elif i in zapisi:
+                ZAPISNIKAR.info(
+                    f"Koledar {koledar} sem naložil iz predpomnilnika, zato opozorila ob "
+                    "njegovem branju (če so bila) niso ponovno izpisana."
+                )
+                koledarji.append(_iz_zapisa(zapisi[i], register))
+            else:
+                nalozen, objekti = next(nalozeni)
+                koledarji.append(nalozen)
+                if shramba is not None:
+                    shramba.zapisi(kljuci[i], _v_zapis(nalozen, objekti))
+    return koledarji
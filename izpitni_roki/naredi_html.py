@@ -1,20 +1,44 @@
 import os
 import re
+import json
+from dataclasses import dataclass
+from functools import lru_cache
 from izpitni_roki.osnovno import (
     naredi_zapisnikarja,
     IzpitniRok,
     Koledar,
+    Predmet,
+    Rok,
     HtmlPredloga,
-    IDTerIme
+    IDTerIme,
+    Register,
+    PRIVZETI_REGISTER,
+    PRIKAZ_DATUMOV,
 )
-from izpitni_roki.nalozi_ics import nalozi_ics
-from typing import List, Callable, Dict, Tuple, Optional
+from izpitni_roki.nalozi_ics import nalozi_koledarje
+from typing import List, Callable, Dict, FrozenSet, Iterator, Tuple, Optional, Union
 from datetime import datetime
 
 
 ZAPISNIKAR = naredi_zapisnikarja(__file__)
 CRKE = "ABCČDEFGHIJKLMNOPRSŠTUVZŽ"
 IZHODNA_MAPA = "out"
+# končnica datoteke s podatki za prenos izbranih izpitov (ob html datoteki z istim imenom)
+KONCNICA_ICS = ".ics.js"
+# spremenljivka, v katero datoteka s podatki za prenos shrani podatke
+# (glej naloziPodatke v posodabljanje.js)
+IME_ICS_PODATKOV = "izpitniRokiIcs"
+# končnica datoteke z vrsticami tabele in indeksom filtrov, ki jo naloži virtualna tabela
+KONCNICA_VRSTIC = ".vrstice.js"
+# spremenljivka, v katero datoteka z vrsticami shrani podatke (glej virtualna_tabela.js)
+IME_PODATKOV_VRSTIC = "izpitniRokiVrstice"
+# pravila za združevanje rokov (glej nalozi_predmete_za_zduzevanje)
+DATOTEKA_ZDRUZEVANJA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zdruzi.txt")
+# polja vrstice tabele (v tem vrstnem redu so tudi v datoteki za virtualno tabelo)
+POLJA_VRSTICE = ("id", "datum", "predmet", "letnik", "rok", "izvajalci")
+# skupine filtrov v indeksu (glej naredi_indeks_filtrov); programe in letnike filtriramo
+# skupaj, saj je npr. Programiranje 1 v 3. letniku Pedagoške matematike in 2. letniku Matematike
+SKUPINE_FILTROV = ("predmet", "program_letnik", "rok", "izvajalec", "obdobje")
 
 
 def nalozi_predmete_za_zduzevanje() -> Dict[str, List[str]]:
@@ -25,11 +49,7 @@ def nalozi_predmete_za_zduzevanje() -> Dict[str, List[str]]:
     :return: slovar, ki ima za ključe imena predmetov, in za vrednosti imena programov
     """
     predmet_smeri = {}
-    datoteka = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "zdruzi.txt"
-    )
-    with open(datoteka, encoding="utf-8") as f:
+    with open(DATOTEKA_ZDRUZEVANJA, encoding="utf-8") as f:
         for vrsta in f:
             i = vrsta.find(",")
             predmet = vrsta[:i].strip()
@@ -39,44 +59,129 @@ def nalozi_predmete_za_zduzevanje() -> Dict[str, List[str]]:
     return predmet_smeri
 
 
+@dataclass
+class Neujemanje:
+    """
+    Roki za isti predmet in rok, ki bi jih morali združiti v enega, a se razlikujejo
+    v datumu ali izpitnem obdobju. Vsaka skupina (z enakim datumom in obdobjem) je združena
+    posebej.
+    """
+
+    predmet: Predmet
+    rok: Rok
+    # združeni roki, po en za vsak par (datum, obdobje)
+    izpitni_roki: List[IzpitniRok]
+
+    def __str__(self):
+        roki = "\n".join(map(str, self.izpitni_roki))
+        return f"Datumi ali obdobja se ne ujemajo pri izpitnih rokih:\n{roki}"
+
+
+class ZdruzevalnikRokov:
+    """
+    Združuje izpitne roke pri predmetih, ki se pojavijo v več programih. Pravila
+    (glej :func:`izpitni_roki.naredi_html.nalozi_predmete_za_zduzevanje`) naložimo
+    le enkrat, roke pa v enem prehodu razporedimo v skupine s ključem
+    (predmet, rok, datum, obdobje) in vsako skupino združimo naenkrat
+    (glej :meth:`izpitni_roki.osnovno.IzpitniRok.zdruzi`).
+    """
+
+    def __init__(self, predmeti_zdruzevanja: Optional[Dict[str, List[str]]] = None):
+        """
+        :param predmeti_zdruzevanja: slovar ``{ime predmeta: [ime programa, ...], ...}``.
+            Privzeto ga naložimo iz datoteke ``zdruzi.txt``.
+        """
+        if predmeti_zdruzevanja is None:
+            predmeti_zdruzevanja = nalozi_predmete_za_zduzevanje()
+        self.predmeti_zdruzevanja: Dict[str, FrozenSet[str]] = {
+            predmet: frozenset(programi) for predmet, programi in predmeti_zdruzevanja.items()
+        }
+
+    def je_za_zdruzitev(self, izpit: IzpitniRok) -> bool:
+        """
+        :return: ali je predmet roka med tistimi, ki jih združujemo, in so vsi programi
+            roka med programi, v katerih ga združujemo
+        """
+        programi = self.predmeti_zdruzevanja.get(izpit.predmet.ime)
+        return programi is not None and all(p.ime in programi for p in izpit.programi)
+
+    def zdruzi(
+        self, izpitni_roki: List[IzpitniRok]
+    ) -> Tuple[List[IzpitniRok], List[Neujemanje]]:
+        """
+        Združi izpitne roke.
+
+        :param izpitni_roki: seznam ločenih rokov
+
+        :return: par (seznam združenih rokov, seznam neujemanj). Roke, ki jih ne
+            združujemo, vrnemo v nespremenjenem vrstnem redu, za njimi pa združene
+            (v vrstnem redu prve pojavitve skupine).
+        """
+        koncni_roki = []
+        skupine: Dict[tuple, List[IzpitniRok]] = {}
+        for izpitni_rok in izpitni_roki:
+            if self.je_za_zdruzitev(izpitni_rok):
+                kljuc = (
+                    izpitni_rok.predmet,
+                    izpitni_rok.rok,
+                    izpitni_rok.datum,
+                    izpitni_rok.obdobje,
+                )
+                skupine.setdefault(kljuc, []).append(izpitni_rok)
+            else:
+                koncni_roki.append(izpitni_rok)
+        # neujemanja: več skupin za isti (predmet, rok)
+        po_predmetih_in_rokih: Dict[tuple, List[IzpitniRok]] = {}
+        for (predmet, rok, _, _), skupina in skupine.items():
+            zdruzen = IzpitniRok.zdruzi(skupina)
+            koncni_roki.append(zdruzen)
+            po_predmetih_in_rokih.setdefault((predmet, rok), []).append(zdruzen)
+        neujemanja = [
+            Neujemanje(predmet, rok, zdruzeni)
+            for (predmet, rok), zdruzeni in po_predmetih_in_rokih.items()
+            if len(zdruzeni) > 1
+        ]
+        return koncni_roki, neujemanja
+
+
+def privzeti_zdruzevalnik() -> ZdruzevalnikRokov:
+    """
+    :return: združevalnik s pravili iz datoteke ``zdruzi.txt``. Datoteko preberemo znova
+        le, če se je od zadnjega branja spremenila.
+    """
+    stanje = os.stat(DATOTEKA_ZDRUZEVANJA)
+    return _zdruzevalnik(stanje.st_mtime_ns, stanje.st_size)
+
+
+@lru_cache(maxsize=1)
+def _zdruzevalnik(cas_spremembe: int, velikost: int) -> ZdruzevalnikRokov:
+    """
+    Združevalnik za dano stanje datoteke ``zdruzi.txt`` (parametra služita le kot ključ
+    predpomnjenja, glej :func:`privzeti_zdruzevalnik`).
+
+    :param cas_spremembe: čas zadnje spremembe datoteke (v nanosekundah)
+    :param velikost: velikost datoteke v bajtih
+
+    :return: združevalnik s pravili iz datoteke ``zdruzi.txt``
+    """
+    return ZdruzevalnikRokov()
+
+
 def zdruzi_roke(izpitni_roki: List[IzpitniRok]) -> List[IzpitniRok]:
     """
-    Združi izpitne roke pri predmetih, ki se pojavijo v več programih.
+    Združi izpitne roke pri predmetih, ki se pojavijo v več programih. Roke istega
+    predmeta in roka z različnimi datumi ali obdobji ne združimo, temveč ostanejo v
+    ločenih vrsticah. Takšna neujemanja le zapišemo; če jih potrebujemo, uporabimo kar
+    :meth:`izpitni_roki.naredi_html.ZdruzevalnikRokov.zdruzi`.
 
     :param izpitni_roki: seznam ločenih rokov
 
     :return: seznam združenih rokov
 
     """
-    def je_za_zdruzitev(izpit: IzpitniRok):
-        ime_predmeta = izpit.predmet.ime
-        if ime_predmeta not in predmeti_zdruzevanja:
-            return False
-        for program in izpit.programi:
-            if program.ime not in predmeti_zdruzevanja[ime_predmeta]:
-                return False
-        return True
-
-    predmeti_zdruzevanja = nalozi_predmete_za_zduzevanje()
-    koncni_roki = []
-    zdruzevani_predmeti: Dict[str, Dict[str, List[IzpitniRok]]] = {
-        predmet: {} for predmet in predmeti_zdruzevanja
-    }
-    for izpitni_rok in izpitni_roki:
-        if je_za_zdruzitev(izpitni_rok):
-            ime = izpitni_rok.predmet.ime
-            rok = izpitni_rok.rok.ime
-            if rok not in zdruzevani_predmeti[ime]:
-                zdruzevani_predmeti[ime][rok] = []
-            zdruzevani_predmeti[ime][rok].append(izpitni_rok)
-        else:
-            koncni_roki.append(izpitni_rok)
-    for rok_skupina in zdruzevani_predmeti.values():
-        for skupina in rok_skupina.values():
-            izpitni_rok = skupina[0]
-            for se_en_rok in skupina[1:]:
-                izpitni_rok = IzpitniRok.zdruzi_roka(izpitni_rok, se_en_rok)
-            koncni_roki.append(izpitni_rok)
+    koncni_roki, neujemanja = privzeti_zdruzevalnik().zdruzi(izpitni_roki)
+    for neujemanje in neujemanja:
+        ZAPISNIKAR.error(str(neujemanje))
     return koncni_roki
 
 
@@ -96,7 +201,7 @@ def najdi_vse(
     """
     izvlecki = map(izvleckar, [rok for koledar in koledarji for rok in koledar.izpitni_roki])
     vrednosti = set(vrednost for izvlecek in izvlecki for vrednost in izvlecek)
-    return sorted(vrednosti)
+    return sorted(vrednosti, key=IDTerIme.kljuc_urejanja)
 
 
 def najdi_vse_programe(koledarji: List[Koledar]) -> List[IDTerIme]:
@@ -247,55 +352,245 @@ def naredi_spustni_meni(ime_menija: str, html_razred: str, moznosti: List[IDTerI
     )
 
 
-def naredi_tabelo(koledarji: List[Koledar]) -> str:
+def uredi_roke(koledarji: List[Koledar]) -> List[IzpitniRok]:
     """
-    Html koda za tabelo vseh izpitnih rokov
+    Združi izpitne roke vseh koledarjev (glej :func:`zdruzi_roke`) in jih uredi, tako kot
+    jih prikažemo v tabeli.
 
     :param koledarji: seznam objektov Koledar
 
-    :return: str(html predloga za tabelo)
+    :return: urejen seznam (združenih) izpitnih rokov
     """
     izpitni_roki = [rok for koledar in koledarji for rok in koledar.izpitni_roki]
     izpitni_roki = zdruzi_roke(izpitni_roki)
-    izpitni_roki.sort()
-    vrstice = []
+    izpitni_roki.sort(key=IzpitniRok.kljuc_urejanja)
+    if izpitni_roki:
+        # roki so urejeni po datumu, zato vnaprej oblikujemo vse datume med prvim in zadnjim
+        PRIKAZ_DATUMOV.napolni(izpitni_roki[0].datum, izpitni_roki[-1].datum)
+    return izpitni_roki
+
+
+def naredi_vrstice_tabele(izpitni_roki: List[IzpitniRok]) -> Iterator[str]:
+    """
+    Html koda za vrstice tabele, ki jo ustvarjamo sproti.
+
+    :param izpitni_roki: urejen seznam (združenih) izpitnih rokov
+
+    :return: generator, ki vrača str(html predloga za vrstico) za vsak izpitni rok
+    """
+    for izpitni_rok, id_vrstice in zip(izpitni_roki, naredi_idje_vrstic(izpitni_roki)):
+        yield str(HtmlPredloga("tabela_vrstica", **naredi_polja_vrstice(izpitni_rok, id_vrstice)))
+
+
+def naredi_idje_vrstic(izpitni_roki: List[IzpitniRok]) -> List[str]:
+    """
+    Id-ji vrstic tabele. Id izpitnega roka (glej :meth:`izpitni_roki.osnovno.IzpitniRok.id`)
+    ne vsebuje datuma, zato ima lahko več vrstic isti id (npr. isti rok ob različnih
+    datumih). Prva taka vrstica obdrži id roka, naslednjim pa dodamo datum in po potrebi
+    še zaporedno številko, npr. ``..._20240610`` in ``..._20240610_2``.
+
+    :param izpitni_roki: urejen seznam (združenih) izpitnih rokov (glej :func:`uredi_roke`)
+
+    :return: seznam različnih id-jev, v istem vrstnem redu kot izpitni roki
+    """
+    idji = []
+    zasedeni = set()
     for izpitni_rok in izpitni_roki:
-        vrstice.append(
-            str(HtmlPredloga(
-                "tabela_vrstica",
-                id=izpitni_rok.id(),
-                datum=izpitni_rok.prikazi_datum(),
-                predmet=str(izpitni_rok.predmet),
-                letnik=izpitni_rok.prikazi_smer_in_letnik(),
-                rok=str(izpitni_rok.rok),
-                izvajalci=izpitni_rok.prikazi_izvajalce(),
-                ics_raw=izpitni_rok.ics_vrstice
-            ))
+        id_vrstice = izpitni_rok.id()
+        if id_vrstice in zasedeni:
+            osnova = id_vrstice = f"{id_vrstice}_{izpitni_rok.datum:%Y%m%d}"
+            zaporedna = 1
+            while id_vrstice in zasedeni:
+                zaporedna += 1
+                id_vrstice = f"{osnova}_{zaporedna}"
+        zasedeni.add(id_vrstice)
+        idji.append(id_vrstice)
+    return idji
+
+
+def naredi_polja_vrstice(
+        izpitni_rok: IzpitniRok,
+        id_vrstice: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Vsebina vrstice tabele za dani izpitni rok.
+
+    :param izpitni_rok: izpitni rok
+    :param id_vrstice: id vrstice (glej :func:`naredi_idje_vrstic`), privzeto kar id roka
+
+    :return: slovar, ki vsakemu od :data:`POLJA_VRSTICE` priredi html kodo
+    """
+    return {
+        "id": izpitni_rok.id() if id_vrstice is None else id_vrstice,
+        "datum": izpitni_rok.prikazi_datum(),
+        "predmet": str(izpitni_rok.predmet),
+        "letnik": izpitni_rok.prikazi_smer_in_letnik(),
+        "rok": str(izpitni_rok.rok),
+        "izvajalci": izpitni_rok.prikazi_izvajalce(),
+    }
+
+
+def naredi_indeks_filtrov(izpitni_roki: List[IzpitniRok]) -> Dict[str, Dict[str, List[int]]]:
+    """
+    Obrnjen indeks, s katerim spletna stran (``posodabljanje.js``) določi prikazane vrstice
+    s presekom množic, namesto da bi ob vsakem kliku preverila vse vrstice.
+
+    :param izpitni_roki: izpitni roki v vrstnem redu vrstic tabele
+
+    :return: slovar, ki vsaki od :data:`SKUPINE_FILTROV` priredi slovar
+        ``{id vrednosti: [indeksi vrstic, ...], ...}`` z naraščajočimi indeksi. Ključi
+        v skupini ``program_letnik`` so oblike ``id_programa:id_letnika``.
+    """
+    indeks: Dict[str, Dict[str, List[int]]] = {skupina: {} for skupina in SKUPINE_FILTROV}
+    for i, izpitni_rok in enumerate(izpitni_roki):
+        vrednosti = (
+            [izpitni_rok.predmet.id],
+            [f"{p.id}:{l.id}" for p, l in zip(izpitni_rok.programi, izpitni_rok.letniki)],
+            [izpitni_rok.rok.id],
+            [izvajalec.id for izvajalec in izpitni_rok.izvajalci],
+            [izpitni_rok.obdobje.id],
         )
+        for skupina, kljuci in zip(SKUPINE_FILTROV, vrednosti):
+            for kljuc in dict.fromkeys(kljuci):
+                indeks[skupina].setdefault(kljuc, []).append(i)
+    return indeks
+
+
+def naredi_predlogo_tabele(izpitni_roki: List[IzpitniRok], ics_datoteka: str) -> HtmlPredloga:
+    """
+    Predloga za tabelo izpitnih rokov, katere vrstice ustvarimo šele ob izpisu
+    (glej :meth:`izpitni_roki.osnovno.HtmlPredloga.zapisi`). Izpišemo jo lahko le enkrat.
+
+    :param izpitni_roki: urejen seznam (združenih) izpitnih rokov (glej :func:`uredi_roke`)
+    :param ics_datoteka: ime datoteke s podatki za prenos izbranih izpitov
+        (glej :func:`naredi_ics_podatke`), kot jo vidi spletna stran
+
+    :return: html predloga za tabelo
+    """
+    indeks_filtrov = json.dumps(naredi_indeks_filtrov(izpitni_roki), separators=(",", ":"))
+    return HtmlPredloga(
+        "tabela",
+        ics_datoteka=ics_datoteka,
+        # json vstavimo v <script>, zato ne sme vsebovati zaključne oznake
+        indeks_filtrov=indeks_filtrov.replace("</", "<\\/"),
+        vrstice=naredi_vrstice_tabele(izpitni_roki)
+    )
+
+
+def naredi_predlogo_virtualne_tabele(ics_datoteka: str, datoteka_vrstic: str) -> HtmlPredloga:
+    """
+    Predloga za prazno tabelo izpitnih rokov, ki jo napolni ``virtualna_tabela.js``: vrstice
+    in indeks filtrov naloži iz datoteke (glej :func:`naredi_podatke_vrstic`), v dokument pa
+    vstavi le vrstice, ki so v vidnem delu tabele. Velikost strani je zato neodvisna od
+    števila izpitnih rokov.
+
+    :param ics_datoteka: glej :func:`naredi_predlogo_tabele`
+    :param datoteka_vrstic: ime datoteke z vrsticami, kot jo vidi spletna stran
+
+    :return: html predloga za tabelo
+    """
+    return HtmlPredloga(
+        "tabela_virtualna",
+        ics_datoteka=ics_datoteka,
+        datoteka_vrstic=datoteka_vrstic
+    )
+
+
+def naredi_podatke_vrstic(
+        izpitni_roki: List[IzpitniRok]
+) -> Dict[str, Union[List[List[str]], Dict[str, Dict[str, List[int]]]]]:
+    """
+    Podatki za virtualno tabelo (glej :func:`naredi_predlogo_virtualne_tabele`).
+
+    :param izpitni_roki: urejen seznam (združenih) izpitnih rokov (glej :func:`uredi_roke`)
+
+    :return: slovar s ključema ``vrstice`` (za vsak izpitni rok seznam vrednosti
+        :data:`POLJA_VRSTICE`, glej :func:`naredi_polja_vrstice`) in ``indeks``
+        (glej :func:`naredi_indeks_filtrov`)
+    """
+    vrstice = [
+        list(naredi_polja_vrstice(izpitni_rok, id_vrstice).values())
+        for izpitni_rok, id_vrstice in zip(izpitni_roki, naredi_idje_vrstic(izpitni_roki))
+    ]
+    return {"vrstice": vrstice, "indeks": naredi_indeks_filtrov(izpitni_roki)}
+
+
+def zapisi_js(podatki, pot: str, ime_spremenljivke: str):
+    """
+    Zapiše podatke za spletno stran kot skripto, ki jih shrani v globalno spremenljivko
+    (``window.ime_spremenljivke = {...};``). Za razliko od ``fetch`` takšno datoteko stran
+    naloži tudi, ko jo odpremo neposredno z diska (``file://``).
+
+    :param podatki: podatki, ki jih zna zapisati ``json``
+    :param pot: pot do izhodne datoteke
+    :param ime_spremenljivke: ime spremenljivke, npr. :data:`IME_ICS_PODATKOV`
+    """
+    besedilo = json.dumps(podatki, ensure_ascii=False, separators=(",", ":"))
+    # znaka U+2028 in U+2029 sta v json nizih dovoljena, v starejših različicah javascripta pa ne
+    besedilo = besedilo.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+    with open(pot, "w", encoding="utf-8") as f:
+        f.write(f"window.{ime_spremenljivke} = {besedilo};\n")
+
+
+def naredi_tabelo(
+        koledarji: List[Koledar],
+        ics_datoteka: str = "izpitni_roki" + KONCNICA_ICS
+) -> str:
+    """
+    Html koda za tabelo vseh izpitnih rokov
+
+    :param koledarji: seznam objektov Koledar
+    :param ics_datoteka: glej :func:`naredi_predlogo_tabele`
+
+    :return: str(html predloga za tabelo)
+    """
+    return str(naredi_predlogo_tabele(uredi_roke(koledarji), ics_datoteka))
+
+
+def naredi_ics_podatke(
+        izpitni_roki: List[IzpitniRok],
+        koledarji: List[Koledar]
+) -> Dict[str, Union[List[str], Dict[str, Dict[str, str]]]]:
+    """
+    Podatki, iz katerih spletna stran (``posodabljanje.js``) ob prenosu sestavi ics koledar
+    izbranih izpitov. Stran jih naloži šele, ko uporabnik klikne na gumb za prenos.
+
+    :param izpitni_roki: izpitni roki, ki so v tabeli
+    :param koledarji: seznam objektov Koledar
+
+    :return: slovar s ključema ``koledar`` (vrstice glave koledarja) in ``dogodki``, ki
+        id-ju vrstice tabele (glej :func:`naredi_idje_vrstic`) priredi polja njenega dogodka
+        (glej :meth:`izpitni_roki.osnovno.IzpitniRok.ics_polja`)
+    """
+    dogodki = {
+        id_vrstice: izpitni_rok.ics_polja()
+        for izpitni_rok, id_vrstice in zip(izpitni_roki, naredi_idje_vrstic(izpitni_roki))
+    }
     # ics opis skupnega koledarja bomo naredili iz enega od ics opisov
     # koledarjev, pri čemer bomo ime koledarja zamenjali z generičnim imenom
-    return str(
-        HtmlPredloga(
-            "tabela",
-            ics_raw=koledarji[0].prilagodi_ics_opis("Izpitni roki"),
-            vrstice="\n".join(vrstice)
-        )
-    )
+    return {"koledar": koledarji[0].ics_glava("Izpitni roki"), "dogodki": dogodki}
 
 
 def naredi_html(
-        poti_do_koledarjev: List[str],
+        poti_do_koledarjev: List[Union[str, Koledar]],
         naslov: str = "Naslov strani",
         opis_strani: str = "Opis strani",
         ime_izhodne: str = "izpitni_roki",
         obdobja: Optional[Dict[str, Tuple[datetime, datetime]]] = None,
         oblika_summary: Optional[str] = None,
-        oblika_datum: Optional[str] = None
+        oblika_datum: Optional[str] = None,
+        vzporedno: bool = False,
+        register: Register = PRIVZETI_REGISTER,
+        pretocno: bool = False,
+        virtualno: bool = False
 ):
     """
     Naredi celotno spletno stran.
 
-    :param poti_do_koledarjev: seznam poti do .ics datotek, ki vsebujejo izpitne roke
+    :param poti_do_koledarjev: seznam poti do .ics datotek, ki vsebujejo izpitne roke, ali pa
+        seznam že naloženih koledarjev (glej :func:`izpitni_roki.nalozi_ics.nalozi_koledarje`).
+        V slednjem primeru se parametri ``obdobja``, ``oblika_summary`` in ``oblika_datum``
+        ne uporabijo.
     :param ime_izhodne: ime izhodne datoteke, npr. ``izpitni_roki`` (in ne ``izpitni_roki.html``)
     :param naslov: naslov spletne strani, npr.
 
@@ -319,13 +614,34 @@ def naredi_html(
     :param oblika_summary: regularni izraz, ki mu zadošča polje ``SUMMARY`` v ics datoteki.
     :param oblika_datum: format datuma (npr. ``%Y%m%D``), ki mu zadošča polje
         ``DTSTART;VALUE=DATE``.
-
-    :return: Ne vrne ničesar, se pa str(predloga za stran) pojavi v izhodni mapi ``out``.
+    :param vzporedno: ali naj ics datoteke beremo vzporedno
+        (glej :func:`izpitni_roki.nalozi_ics.nalozi_koledarje`)
+    :param register: register, v katerem naložimo koledarje
+        (glej :class:`izpitni_roki.osnovno.Register`)
+    :param pretocno: ali naj vrstice tabele zapisujemo v datoteko sproti, ko jih ustvarimo.
+        Stran je enaka, le da nikoli ne hranimo html kode vseh vrstic (ki je največji del
+        strani) v pomnilniku. Poraba pomnilnika je kljub temu sorazmerna s številom rokov,
+        saj naenkrat hranimo urejen seznam vseh izpitnih rokov, indeks filtrov
+        (glej :func:`naredi_indeks_filtrov`) kot json niz, ki ga vstavimo v stran, ter
+        podatke za prenos (glej :func:`naredi_ics_podatke`).
+    :param virtualno: ali naj vrstice tabele namesto v stran zapišemo v ločeno datoteko
+        s končnico ``.vrstice.js`` (glej :func:`zapisi_js`), iz katere spletna stran sproti prikazuje le vidne
+        vrstice (glej :func:`naredi_predlogo_virtualne_tabele`). Primerno za strani z
+        zelo veliko izpitnimi roki.
+
+    :return: Ne vrne ničesar, se pa str(predloga za stran) pojavi v izhodni mapi ``out``,
+        podatki za prenos izbranih izpitov pa ob njej v datoteki s končnico ``.ics.js``
+        (glej :func:`naredi_ics_podatke` in :func:`zapisi_js`).
     """
     # nalozi
-    koledarji = [
-        nalozi_ics(pot, obdobja, oblika_summary, oblika_datum) for pot in poti_do_koledarjev
-    ]
+    koledarji = nalozi_koledarje(
+        poti_do_koledarjev,
+        obdobja,
+        oblika_summary,
+        oblika_datum,
+        vzporedno=vzporedno,
+        register=register,
+    )
     # ustvari
     vsi_programi = najdi_vse_programe(koledarji)
     vsi_letniki = najdi_vse_letnike(koledarji)
@@ -347,7 +663,13 @@ def naredi_html(
             str(HtmlPredloga("prenos"))
          ]
     )
-    izpiti = naredi_tabelo(koledarji)
+    izpitni_roki = uredi_roke(koledarji)
+    ics_datoteka = f"{ime_izhodne}{KONCNICA_ICS}"
+    datoteka_vrstic = f"{ime_izhodne}{KONCNICA_VRSTIC}"
+    if virtualno:
+        izpiti = naredi_predlogo_virtualne_tabele(ics_datoteka, datoteka_vrstic)
+    else:
+        izpiti = naredi_predlogo_tabele(izpitni_roki, ics_datoteka)
 
     html_stran = HtmlPredloga(
         "stran",
@@ -358,4 +680,15 @@ def naredi_html(
     )
     os.makedirs(IZHODNA_MAPA, exist_ok=True)
     with open(os.path.join(IZHODNA_MAPA, f"{ime_izhodne}.html"), "w", encoding="utf-8") as f:
-        print(html_stran, file=f)
+        if pretocno:
+            html_stran.zapisi(f)
+            f.write("\n")
+        else:
+            print(html_stran, file=f)
+    ics_podatki = naredi_ics_podatke(izpitni_roki, koledarji)
+    zapisi_js(ics_podatki, os.path.join(IZHODNA_MAPA, ics_datoteka), IME_ICS_PODATKOV)
+    if virtualno:
+        podatki_vrstic = naredi_podatke_vrstic(izpitni_roki)
+        zapisi_js(
+            podatki_vrstic, os.path.join(IZHODNA_MAPA, datoteka_vrstic), IME_PODATKOV_VRSTIC
+        )
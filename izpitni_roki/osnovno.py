@@ -1,9 +1,13 @@
 import os
 import re
+import mmap
+import hashlib
+from bisect import bisect_left
+from functools import lru_cache
 import logging
-from typing import List, Type, Union
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple, Type, Union
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
 
 
 def naredi_zapisnikarja(name):
@@ -27,21 +31,9 @@ def naredi_zapisnikarja(name):
 
 ZAPISNIKAR = naredi_zapisnikarja(__file__)
 
-
-class IDGenerator:
-    """Razred, s katerim polepšamo kodo in se izognemo dolgim guidom."""
-
-    NASLEDNJI_ID = 0
-
-    @staticmethod
-    def generiraj_id() -> int:
-        """
-        Zgenerira naslednji id. Zaporedni klici vrnejo id-je 1, 2, 3 ...
-
-        :return: naslednji id
-        """
-        IDGenerator.NASLEDNJI_ID += 1
-        return IDGenerator.NASLEDNJI_ID
+# Nadomestila za neangleške črke pri urejanju po abecedi (glej IDTerIme._normalna_oblika):
+# znak ``{`` je tik za znakom ``z``.
+NORMALIZACIJA_CRK = str.maketrans({"č": "c{", "ć": "c{{", "đ": "d{", "š": "s{", "ž": "z{"})
 
 
 class IDTerIme:
@@ -51,19 +43,29 @@ class IDTerIme:
 
     Implementira tudi leksikografsko urejenost nizov, ki upošteva slovensko abecedo,
     razširjeno s črkama `ć` in `đ` (a b c č ć d đ e f ...).
+
+    Objekti (tudi objekti podrazredov) nimajo slovarja ``__dict__``, temveč le
+    polja, naštete v ``__slots__``, zato porabijo manj pomnilnika.
+
+    Normalizirano obliko imena in ključ za urejanje izračunamo le enkrat (v konstruktorju),
+    zato so primerjave in urejanje (glej :meth:`izpitni_roki.osnovno.IDTerIme.kljuc_urejanja`)
+    hitri.
     """
 
-    PRIPADNIKI = {}  # vsi elementi tega razreda, vsebuje pare ime: objekt
+    __slots__ = ("ime", "id", "_normalna", "_kljuc")
 
-    def __init__(self, ime: str):
+    def __init__(self, ime: str, id_: str):
         """
-        Konstruktor IDTerIme, ki mu podamo ime, :meth:`izpitni_roki.osnovno.IDGenerator`
-        pa poskrbi za njegov id.
+        Konstruktor IDTerIme. Objektov običajno ne ustvarjamo neposredno, temveč z
+        :meth:`izpitni_roki.osnovno.Register.naredi_objekt`, ki poskrbi za id.
 
         :param ime: ime
+        :param id_: id (enoličen znotraj registra)
         """
         self.ime = ime
-        self.id = str(IDGenerator.generiraj_id())
+        self.id = id_
+        self._normalna = self._normalna_oblika()
+        self._kljuc = self._izracunaj_kljuc()
 
     @staticmethod
     def vse_vsa() -> str:
@@ -88,17 +90,32 @@ class IDTerIme:
             saj je znak ``{`` tik za znakom ``z``.
 
         """
-        posebni = {"č": "c{", "ć": "c{{", "đ": "d{", "š": "s{", "ž": "z{"}
-        return "".join(
-            [
-                crka if crka not in posebni else posebni[crka]
-                for crka in self.ime.lower()
-            ]
-        )
+        return self.ime.lower().translate(NORMALIZACIJA_CRK)
+
+    def _izracunaj_kljuc(self):
+        """
+        Izračuna ključ za urejanje objektov tega razreda. Podrazredi, ki imajo
+        drugačno urejenost, ga povozijo.
+
+        :return: normalizirana oblika imena
+        """
+        return self._normalna
+
+    @staticmethod
+    def kljuc_urejanja(objekt: "IDTerIme"):
+        """
+        Ključ za urejanje, npr. ``sorted(izvajalci, key=IDTerIme.kljuc_urejanja)``. Za objekte
+        istega razreda da enak vrstni red kot primerjava ``<``, le da je že izračunan.
+
+        :param objekt: objekt razreda IDTerIme (ali podrazreda)
+
+        :return: ključ objekta
+        """
+        return objekt._kljuc
 
     def __lt__(self, other):
         if isinstance(other, IDTerIme):
-            return self._normalna_oblika() < other._normalna_oblika()
+            return self._normalna < other._normalna
         else:
             raise ValueError(f"IDTerIme ni primerljiv z {type(other).__name__}")
 
@@ -117,35 +134,23 @@ class IDTerIme:
     def __getitem__(self, i):
         return self.ime[i]
 
-    @staticmethod
-    def naredi_objekt(
-        podrazred: Type[
-            Union["Predmet", "Program", "Letnik", "Rok", "Izvajalec", "Obdobje"]
-        ],
-        ime: str,
-        *args,
-    ):
+    def argumenti(self) -> tuple:
         """
-        Naredi objekt danega podrazreda razreda IDTerIme
-
-        :param podrazred: izbrani podrazred
-        :param ime: polje ime
-        :param args: morebitni preostali parametri za konstruktor
-            (npr. pri :meth:`izpitni_roki.osnovno.Obdobje`).
-
-        :return: objekt danega podrazreda s podanim imenom
+        Morebitni preostali parametri konstruktorja (poleg imena in id-ja), s katerimi lahko
+        objekt ponovno ustvarimo z :meth:`izpitni_roki.osnovno.Register.naredi_objekt`.
 
+        :return: prazna terica
         """
-        if ime not in IDTerIme.PRIPADNIKI:
-            IDTerIme.PRIPADNIKI[ime] = podrazred(ime, *args)
-        return IDTerIme.PRIPADNIKI[ime]
+        return ()
 
 
 class Predmet(IDTerIme):
-    pass
+    __slots__ = ()
 
 
 class Program(IDTerIme):
+    __slots__ = ()
+
     LEPSE_OBLIKE = {
         "1FiMa": "Finančna matematika",
         "1PrMa": "Praktična matematika",
@@ -165,14 +170,19 @@ class Program(IDTerIme):
 
 
 class Letnik(IDTerIme):
+    __slots__ = ()
+
     DOVOLJENI_LETNIKI = {"prvi": 1, "drugi": 2, "tretji": 3, "četrti": 4, "peti": 5}
 
-    def __init__(self, ime):
-        super().__init__(ime)
-        if self.ime not in Letnik.DOVOLJENI_LETNIKI:
+    def __init__(self, ime: str, id_: str):
+        if ime not in Letnik.DOVOLJENI_LETNIKI:
             raise ValueError(
-                f"Nepravilen letnik: '{self.ime}'. Dovoljeni: {list(Letnik.DOVOLJENI_LETNIKI)}"
+                f"Nepravilen letnik: '{ime}'. Dovoljeni: {list(Letnik.DOVOLJENI_LETNIKI)}"
             )
+        super().__init__(ime, id_)
+
+    def _izracunaj_kljuc(self):
+        return Letnik.DOVOLJENI_LETNIKI[self.ime]
 
     def __lt__(self, other):
         if isinstance(other, IDTerIme):
@@ -187,7 +197,7 @@ class Letnik(IDTerIme):
 
 
 class Rok(IDTerIme):
-    pass
+    __slots__ = ()
 
 
 def nalozi_problematicna_imena():
@@ -204,6 +214,8 @@ def nalozi_problematicna_imena():
 
 
 class Izvajalec(IDTerIme):
+    __slots__ = ()
+
     PROBLEMATICNI = nalozi_problematicna_imena()
     IZDANA_OPOZORILA = set()
 
@@ -226,10 +238,15 @@ class Izvajalec(IDTerIme):
 
 
 class Obdobje(IDTerIme):
-    def __init__(self, ime: str, zacetek: datetime, konec: datetime):
-        super().__init__(ime)
+    __slots__ = ("zacetek", "konec")
+
+    def __init__(self, ime: str, zacetek: datetime, konec: datetime, id_: str):
         self.zacetek = zacetek
         self.konec = konec
+        super().__init__(ime, id_)
+
+    def _izracunaj_kljuc(self):
+        return self.zacetek
 
     def __lt__(self, other):
         if isinstance(other, Obdobje):
@@ -241,34 +258,334 @@ class Obdobje(IDTerIme):
     def vse_vsa() -> str:
         return "vsa"
 
+    def argumenti(self) -> tuple:
+        return self.zacetek, self.konec
+
     @staticmethod
-    def doloci_obdobje(datum: datetime, obdobja: List["Obdobje"]) -> "Obdobje":
+    def doloci_obdobje(
+        datum: datetime,
+        obdobja: Union[List["Obdobje"], "IndeksObdobij"],
+        izven: Optional["Obdobje"] = None,
+    ) -> "Obdobje":
         """
         Najde obdobje, v katero spada dani datum.
 
         :param datum: neki datum
-        :param obdobja: seznam izpitnih obdobij
-        :return: obdobje, v katerega spada datum. Če takega obdobja ni, potem vrnemo OBDOBJE_IZVEN.
+        :param obdobja: seznam izpitnih obdobij (ki ga pregledamo po vrsti) ali pa indeks
+            obdobij (glej :class:`izpitni_roki.osnovno.IndeksObdobij`), ki je hitrejši, če
+            obdobja določamo mnogim datumom
+        :param izven: obdobje za roke izven vseh obdobij (:attr:`Register.obdobje_izven`
+            registra, iz katerega so obdobja). Privzeto je to OBDOBJE_IZVEN.
+            Pri indeksu ga ne upoštevamo, saj ga podamo že ob izdelavi indeksa.
+        :return: obdobje, v katerega spada datum. Če takega obdobja ni, potem vrnemo ``izven``.
         """
+        if isinstance(obdobja, IndeksObdobij):
+            return obdobja.doloci(datum)
         for obdobje in obdobja:
             if obdobje.zacetek <= datum <= obdobje.konec:
                 return obdobje
-        return OBDOBJE_IZVEN
+        return OBDOBJE_IZVEN if izven is None else izven
 
 
-# Obdobje, ki ga uporabimo za roke izven uradnih izpitnih obdobij. Mora biti v prihodnosti,
-# zato bo treba čez slabih 1000 let kodo popraviti.
-OBDOBJE_IZVEN = Obdobje(
-    "izven izpitnih obdobij", datetime(3000, 1, 1), datetime(3000, 1, 1)
-)
+class IndeksObdobij:
+    """
+    Indeks izpitnih obdobij, v katerem obdobje danega datuma poiščemo z bisekcijo, namesto
+    da bi pregledali vsa obdobja. Obdobij je lahko poljubno mnogo (npr. delna obdobja, roki za
+    ponavljanje ali obdobja več let), smejo se tudi prekrivati: v tem primeru (tako kot
+    :meth:`izpitni_roki.osnovno.Obdobje.doloci_obdobje`) datum pripišemo prvemu obdobju v
+    seznamu, ki ga vsebuje, o prekrivanju pa opozorimo.
+
+    Meje obdobij (začetki in konci) razdelijo časovno premico na odseke: vsaka meja je odsek
+    zase (obdobja so zaprti intervali), prav tako vsak interval med zaporednima mejama. Za vse
+    odseke vnaprej izračunamo, kateremu obdobju pripadajo.
+    """
+
+    def __init__(self, obdobja: List[Obdobje], izven: Optional[Obdobje] = None):
+        """
+        :param obdobja: seznam izpitnih obdobij
+        :param izven: obdobje za roke izven vseh obdobij (privzeto OBDOBJE_IZVEN)
+        """
+        self.obdobja: List[Obdobje] = list(obdobja)
+        self.izven: Obdobje = OBDOBJE_IZVEN if izven is None else izven
+        # urejene meje obdobij
+        self.meje: List[datetime] = sorted(
+            {meja for obdobje in self.obdobja for meja in (obdobje.zacetek, obdobje.konec)}
+        )
+        # indeksi obdobij (v seznamu obdobja) na posameznih mejah in v odsekih pred njimi;
+        # zadnji element v med_mejami je odsek za zadnjo mejo, -1 pa pomeni izven obdobij
+        self.na_mejah: List[int] = [self._prvo_obdobje(meja, meja) for meja in self.meje]
+        self.med_mejami: List[int] = (
+            [-1]
+            + [
+                self._prvo_obdobje(prejsnja, naslednja)
+                for prejsnja, naslednja in zip(self.meje, self.meje[1:])
+            ]
+            + [-1]
+        )
+        self._opozori_na_prekrivanja()
+
+    def _prvo_obdobje(self, od: datetime, do: datetime) -> int:
+        """
+        :return: indeks prvega obdobja, ki vsebuje interval ``[od, do]``, ali -1
+        """
+        for i, obdobje in enumerate(self.obdobja):
+            if obdobje.zacetek <= od and do <= obdobje.konec:
+                return i
+        return -1
+
+    def _opozori_na_prekrivanja(self):
+        urejena = sorted(self.obdobja, key=lambda obdobje: obdobje.zacetek)
+        for i, prvo in enumerate(urejena):
+            for drugo in urejena[i + 1:]:
+                if drugo.zacetek > prvo.konec:
+                    break
+                ZAPISNIKAR.warning(
+                    f"Obdobji {prvo.ime} in {drugo.ime} se prekrivata. Skupne datume "
+                    f"pripišem tistemu, ki je v seznamu prej."
+                )
+
+    def indeks(self, datum: datetime) -> int:
+        """
+        :param datum: neki datum
+
+        :return: indeks obdobja (v seznamu ``obdobja``), v katerega spada datum, oz. -1,
+            če ne spada v nobeno
+        """
+        j = bisect_left(self.meje, datum)
+        if j < len(self.meje) and self.meje[j] == datum:
+            return self.na_mejah[j]
+        return self.med_mejami[j]
+
+    def doloci(self, datum: datetime) -> Obdobje:
+        """
+        :param datum: neki datum
+
+        :return: obdobje, v katerega spada datum, oz. ``izven``, če ne spada v nobeno
+        """
+        i = self.indeks(datum)
+        return self.izven if i < 0 else self.obdobja[i]
+
+    def doloci_vse(self, datumi: Iterable[datetime]) -> List[Obdobje]:
+        """
+        Določi obdobja vsem datumom naenkrat. Za stolpčno predstavitev rokov glej
+        :meth:`izpitni_roki.tabela_rokov.TabelaRokov.doloci_obdobja`.
+
+        :param datumi: datumi
+
+        :return: seznam obdobij, v katera spadajo datumi
+        """
+        obdobja = self.obdobja + [self.izven]  # indeks -1 pomeni izven
+        return [obdobja[self.indeks(datum)] for datum in datumi]
+
+
+class Register:
+    """
+    Register vseh objektov razreda IDTerIme (predmetov, izvajalcev ...), ki jih potrebujemo pri
+    izdelavi ene strani. Objekte hranimo ločeno po razredih (predmet in izvajalec z enakim
+    imenom sta torej različna objekta). Za vsako stran (ali leto) lahko tako uporabimo svoj
+    register, ki ga podamo funkcijam za nalaganje (npr.
+    :func:`izpitni_roki.nalozi_ics.nalozi_koledarje`), ko ga ne potrebujemo več, pa ga
+    preprosto zavržemo.
+
+    Id objekta je začetek zgoščene vrednosti imena razreda in imena objekta (glej
+    :meth:`izpitni_roki.osnovno.Register.stabilni_id`), zato je neodvisen od vrstnega reda
+    branja datotek in enak ob vsaki izdelavi strani. Če pride do trka, id novega objekta
+    podaljšamo.
+
+    Objektov iz različnih registrov ne smemo mešati, saj imajo lahko objekti z enakim
+    imenom v njih različne argumente (npr. obdobja), pa vseeno enak id.
+    """
+
+    # ime obdobja za roke izven uradnih izpitnih obdobij
+    IME_IZVEN = "izven izpitnih obdobij"
+    # dolžina id-jev (v šestnajstiških števkah), če ne pride do trkov
+    DOLZINA_ID = 8
+
+    def __init__(self):
+        # id: (razred, ime) za preverjanje trkov
+        self._idji: Dict[str, Tuple[Type[IDTerIme], str]] = {}
+        # razred: {ime: objekt}
+        self.pripadniki: Dict[Type[IDTerIme], Dict[str, IDTerIme]] = {}
+        # če ni None, vanj (v vrstnem redu prve uporabe) beležimo vse objekte,
+        # ki jih zahtevamo z naredi_objekt
+        self.belezka: Optional[Dict[Tuple[Type[IDTerIme], str], IDTerIme]] = None
+        # Obdobje, ki ga uporabimo za roke izven uradnih izpitnih obdobij. Mora biti
+        # v prihodnosti, zato bo treba čez slabih 1000 let kodo popraviti.
+        self.obdobje_izven: Obdobje = self.naredi_objekt(
+            Obdobje, Register.IME_IZVEN, datetime(3000, 1, 1), datetime(3000, 1, 1)
+        )
+
+    def naredi_objekt(
+        self,
+        podrazred: Type[
+            Union["Predmet", "Program", "Letnik", "Rok", "Izvajalec", "Obdobje"]
+        ],
+        ime: str,
+        *args,
+    ):
+        """
+        Vrne objekt danega podrazreda razreda IDTerIme s podanim imenom. Če ga v registru
+        še ni, ga ustvarimo in mu dodelimo naslednji id.
+
+        :param podrazred: izbrani podrazred
+        :param ime: polje ime
+        :param args: morebitni preostali parametri za konstruktor
+            (npr. pri :meth:`izpitni_roki.osnovno.Obdobje`). Če objekt že obstaja,
+            jih ne upoštevamo.
+
+        :return: objekt danega podrazreda s podanim imenom
+        """
+        pripadniki = self.pripadniki.setdefault(podrazred, {})
+        objekt = pripadniki.get(ime)
+        if objekt is None:
+            objekt = podrazred(ime, *args, id_=self._nov_id(podrazred, ime))
+            pripadniki[ime] = objekt
+        if self.belezka is not None:
+            self.belezka.setdefault((podrazred, ime), objekt)
+        return objekt
+
+    @staticmethod
+    def stabilni_id(podrazred: Type[IDTerIme], ime: str) -> str:
+        """
+        Izračuna (najdaljši možni) id objekta iz njegove vsebine. Vsebuje le šestnajstiške
+        števke, torej nikoli znakov ``x`` in ``_``, s katerima sestavljamo id-je izpitnih
+        rokov (glej :meth:`izpitni_roki.osnovno.IzpitniRok.id`).
+
+        :param podrazred: podrazred razreda IDTerIme
+        :param ime: ime objekta
+
+        :return: šestnajstiški niz; id objekta je njegov začetek
+        """
+        vsebina = f"{podrazred.__name__}\0{ime}".encode("utf-8")
+        return hashlib.sha256(vsebina).hexdigest()
+
+    def _nov_id(self, podrazred: Type[IDTerIme], ime: str) -> str:
+        """
+        Vrne najkrajši začetek :meth:`izpitni_roki.osnovno.Register.stabilni_id` (vsaj
+        dolžine ``DOLZINA_ID``), ki ga še noben objekt v registru nima.
+        """
+        zgoscena = Register.stabilni_id(podrazred, ime)
+        for dolzina in range(Register.DOLZINA_ID, len(zgoscena) + 1):
+            id_ = zgoscena[:dolzina]
+            obstojec = self._idji.get(id_)
+            if obstojec is None:
+                self._idji[id_] = (podrazred, ime)
+                return id_
+            ZAPISNIKAR.warning(
+                f"Trk id-jev {id_}: {podrazred.__name__} {ime} in "
+                f"{obstojec[0].__name__} {obstojec[1]}. Podaljšujem id."
+            )
+        raise ValueError(f"Za {podrazred.__name__} {ime} ni mogoče najti prostega id-ja.")
+
+    def poisci(self, podrazred: Type[IDTerIme], ime: str) -> IDTerIme:
+        """
+        Poišče obstoječ objekt.
+
+        :param podrazred: podrazred razreda IDTerIme
+        :param ime: ime objekta
+
+        :return: objekt danega podrazreda s podanim imenom
+
+        :raises: KeyError, če takega objekta ni
+        """
+        return self.pripadniki[podrazred][ime]
+
+    def __len__(self):
+        return sum(map(len, self.pripadniki.values()))
+
+
+# Register, ki ga uporabimo, če pri nalaganju ne podamo svojega.
+PRIVZETI_REGISTER = Register()
+OBDOBJE_IZVEN = PRIVZETI_REGISTER.obdobje_izven
+
+
+class IcsIzsek:
+    """
+    Surov ics opis dogodka, shranjen kot odsek ``vir[zacetek:konec]`` (pri branju datotek je
+    vir kar nedekodiran kos bajtov tega dogodka). Niz dogodka ustvarimo (in dekodiramo) šele,
+    ko ga potrebujemo. Vir naj ne bo vsebina celotne datoteke, saj bi jo vsak izsek ohranjal
+    v pomnilniku (pri v pomnilnik preslikani datoteki pa bi kazal na vsebino, ki se lahko
+    spremeni ali izgine).
+    Pri kopiranju v drug proces (``pickle``) se prenese le pripadajoči odsek.
+    """
+
+    __slots__ = ("vir", "zacetek", "konec")
+
+    def __init__(self, vir: Union[str, bytes, "mmap.mmap"], zacetek: int, konec: int):
+        self.vir = vir
+        self.zacetek = zacetek
+        self.konec = konec
+
+    def __str__(self):
+        odsek = self.vir[self.zacetek : self.konec]
+        if isinstance(odsek, str):
+            return odsek
+        return odsek.decode("utf-8").replace("\r\n", "\n")
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def __lt__(self, other):
+        return str(self) < str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __reduce__(self):
+        odsek = self.vir[self.zacetek : self.konec]
+        if not isinstance(odsek, str):
+            odsek = bytes(odsek)
+        return IcsIzsek, (odsek, 0, len(odsek))
+
+
+def razcleni_ics_vrstice(besedilo: str) -> List[Tuple[str, str]]:
+    """
+    Razčleni surove ics vrstice (ločene z znakom za novo vrsto ali z ``@@@@``) na pare
+    (ime polja s parametri, vrednost), npr. ``("DTSTART;VALUE=DATE", "20220622")``.
+    Prelomljene vrstice (ki se začnejo s presledkom) pred tem spojimo, vrstice brez ``:``
+    pa izpustimo.
+
+    :param besedilo: surove ics vrstice
+
+    :return: seznam parov v vrstnem redu pojavitve
+    """
+    besedilo = besedilo.replace("@@@@", "\n").replace("\r\n", "\n").replace("\n ", "")
+    pari = []
+    for vrstica in besedilo.split("\n"):
+        ime, dvopicje, vrednost = vrstica.partition(":")
+        if dvopicje:
+            pari.append((ime, vrednost))
+    return pari
 
 
 class IzpitniRok:
     """Osnovne informacije o izpitnem roku. Ta je opisan s predmetom, seznamom
     programov, seznamom pripadajočih letnikov (oba sta enako dolga), rokom (prvi, drugi ...),
     seznamom izvajalcev in izpitnim obdobjem.
+
+    Ključ urejanja, id in ics vrstice si zapomnimo in jih pozabimo ob vsakem nastavljanju
+    polja. Sprememb seznamov na mestu (npr. ``rok.programi.append(...)``) ne zaznamo, zato
+    sezname nadomestimo z novimi (``rok.programi = rok.programi + [...]``) ali pa potem
+    pokličemo :meth:`pozabi_izpeljane`.
     """
 
+    # polja, ki opisujejo izpitni rok (v tem vrstnem redu jih tudi primerjamo)
+    POLJA = (
+        "datum",
+        "predmet",
+        "programi",
+        "letniki",
+        "rok",
+        "izvajalci",
+        "obdobje",
+        "_ics_vrstice",
+    )
+    # polja ics dogodka, ki jih potrebujemo za prenos koledarja (glej :meth:`ics_polja`)
+    ICS_POLJA = ("UID", "DTSTART", "DTEND", "SUMMARY", "DESCRIPTION", "LOCATION")
+    # vrednosti, ki jih izračunamo ob prvi uporabi in pozabimo ob vsaki spremembi polj
+    IZPELJANE = ("_kljuc", "_id", "_ics")
+    __slots__ = POLJA + ("uid", "razlicica") + IZPELJANE
+
     def __init__(
         self,
         datum: datetime,
@@ -278,21 +595,44 @@ class IzpitniRok:
         rok: Rok,
         izvajalci: List[Izvajalec],
         obdobje: Obdobje,
-        ics_vrstice: str,
+        ics_vrstice: Union[str, IcsIzsek],
+        uid: Optional[str] = None,
+        razlicica: Optional[Tuple[Optional[str], Optional[str]]] = None,
     ):
-        self.datum: datetime = datum
+        # polja nastavimo mimo __setattr__, saj izpeljanih vrednosti še ni treba pozabljati
+        nastavi = object.__setattr__
+        nastavi(self, "datum", datum)
 
-        self.predmet: Predmet = predmet
-        self.programi: List[Program] = programi
+        nastavi(self, "predmet", predmet)
+        nastavi(self, "programi", programi)
         if isinstance(letnik_i, Letnik):
-            self.letniki = [letnik_i for _ in self.programi]
+            nastavi(self, "letniki", [letnik_i for _ in programi])
         else:
-            self.letniki = letnik_i
-        self.rok: Rok = rok
-        self.izvajalci: List[Izvajalec] = izvajalci
-        self.obdobje: Obdobje = obdobje
-
-        self._ics_vrstice: str = ics_vrstice
+            nastavi(self, "letniki", letnik_i)
+        nastavi(self, "rok", rok)
+        nastavi(self, "izvajalci", izvajalci)
+        nastavi(self, "obdobje", obdobje)
+
+        nastavi(self, "_ics_vrstice", ics_vrstice)
+        # vrednosti polj UID in (SEQUENCE, LAST-MODIFIED) iz ics, s katerimi
+        # prepoznamo nespremenjene dogodke (glej :func:`izpitni_roki.nalozi_ics.posodobi_ics`)
+        nastavi(self, "uid", uid)
+        nastavi(self, "razlicica", razlicica)
+        self.pozabi_izpeljane()
+
+    def __setattr__(self, ime, vrednost):
+        object.__setattr__(self, ime, vrednost)
+        if ime not in IzpitniRok.IZPELJANE:
+            self.pozabi_izpeljane()
+
+    def pozabi_izpeljane(self):
+        """
+        Pozabi izračunane vrednosti (ključ urejanja, id in ics vrstice). Ob nastavljanju polj
+        se to zgodi samodejno, ročno pa jo moramo poklicati, če kateri od seznamov
+        (npr. ``programi``) spremenimo na mestu.
+        """
+        for ime in IzpitniRok.IZPELJANE:
+            object.__setattr__(self, ime, None)
 
     def preveri(self):
         """
@@ -302,7 +642,8 @@ class IzpitniRok:
 
         :raises: ValueError, če je kateri od pogojev kršen
         """
-        for kljuc, vrednost in self.__dict__.items():
+        for kljuc in IzpitniRok.POLJA:
+            vrednost = getattr(self, kljuc)
             if not vrednost:
                 raise ValueError(f"Atribut {kljuc} je prazen v {self}")
         if len(self.programi) != len(self.letniki):
@@ -310,12 +651,34 @@ class IzpitniRok:
                 f"Seznama programov in letnikov za {self} nista enako dolga."
             )
 
-    def _terica(self):
-        return tuple(self.__dict__.values())
+    def kljuc_urejanja(self) -> tuple:
+        """
+        Ključ za urejanje izpitnih rokov, npr. ``roki.sort(key=IzpitniRok.kljuc_urejanja)``.
+        Roke uredimo po datumu, predmetu, programih, letnikih, roku, izvajalcih in obdobju
+        (polja tipa IDTerIme primerjamo z :meth:`izpitni_roki.osnovno.IDTerIme.kljuc_urejanja`),
+        na koncu pa še po ``UID``.
+        Ključ izračunamo le enkrat, ob spremembi kateregakoli polja pa ga izračunamo znova
+        (spremembe seznamov na mestu, npr. ``programi.append``, niso zaznane).
+
+        :return: ključ
+        """
+        if self._kljuc is None:
+            kljuc = IDTerIme.kljuc_urejanja
+            self._kljuc = (
+                self.datum,
+                kljuc(self.predmet),
+                tuple(map(kljuc, self.programi)),
+                tuple(map(kljuc, self.letniki)),
+                kljuc(self.rok),
+                tuple(map(kljuc, self.izvajalci)),
+                kljuc(self.obdobje),
+                self.uid or "",
+            )
+        return self._kljuc
 
     def __lt__(self, other):
         if isinstance(other, IzpitniRok):
-            return self._terica() < other._terica()
+            return self.kljuc_urejanja() < other.kljuc_urejanja()
         else:
             raise ValueError(f"IzpitniRok ni primerljiv z {type(other).__name__}")
 
@@ -343,7 +706,13 @@ class IzpitniRok:
         def menjalec(m):
             return "SUMMARY:" + self._ics_summary() + "@@@@" + m.group(1)
 
-        return re.sub("SUMMARY:.+?@@@@([^ ])", menjalec, self._ics_vrstice)
+        if self._ics is None:
+            besedilo = str(self._ics_vrstice)
+            # če surovih vrstic nismo spreminjali, ni česa zamenjati
+            if "@@@@" in besedilo:
+                besedilo = re.sub("SUMMARY:.+?@@@@([^ ])", menjalec, besedilo)
+            self._ics = besedilo
+        return self._ics
 
     @ics_vrstice.setter
     def ics_vrstice(self, vrednost: str):
@@ -354,6 +723,21 @@ class IzpitniRok:
         ena_vrsta = vrednost.replace("\n", "@@@@")
         self._ics_vrstice = re.sub("(\\\\, ?)?ni smeri", "", ena_vrsta)
 
+    def ics_polja(self) -> Dict[str, str]:
+        """
+        Polja ics opisa, ki jih potrebujemo, da dogodek znova sestavimo ob prenosu koledarja
+        (glej :data:`IzpitniRok.ICS_POLJA`). Prazna polja izpustimo, ostalih (npr. ``DTSTAMP``,
+        ``CREATED``, ``SEQUENCE``) pa ne potrebujemo.
+
+        :return: slovar ``{ime polja s parametri: vrednost, ...}``, npr.
+            ``{"UID": "...", "DTSTART;VALUE=DATE": "20220622", ...}``
+        """
+        return {
+            ime: vrednost
+            for ime, vrednost in razcleni_ics_vrstice(self.ics_vrstice)
+            if vrednost and ime.split(";")[0] in IzpitniRok.ICS_POLJA
+        }
+
     def prikazi_datum(self) -> str:
         """
         Polje datum pretvori v berljiv niz. Tako se npr. 3. 10. 2022 pretvori v niz
@@ -361,35 +745,7 @@ class IzpitniRok:
 
         :return: berljiva predstavitev datuma
         """
-        dnevi = [
-            "ponedeljek",
-            "torek",
-            "sreda",
-            "četrtek",
-            "petek",
-            "sobota",
-            "nedelja",
-        ]
-        meseci = [
-            "januar",
-            "februar",
-            "marec",
-            "april",
-            "maj",
-            "junij",
-            "julij",
-            "avgust",
-            "september",
-            "oktober",
-            "november",
-            "december",
-        ]
-        dan = dnevi[self.datum.weekday()]
-        mesec = meseci[self.datum.month - 1]
-        oblikovan_datum = self.datum.strftime(
-            f"{self.datum.day}. {mesec} {self.datum.year}"
-        )
-        return f"{oblikovan_datum} ({dan})"
+        return PRIKAZ_DATUMOV.berljiv(self.datum)
 
     @staticmethod
     def _id_seznama(seznam: List[IDTerIme]):
@@ -404,15 +760,17 @@ class IzpitniRok:
             in obdobje. Id-ji za polja, ki so seznami (programi, izvajalci),
             so id-ji elementov danega seznama, ločeni z ``x``.
         """
-        id_predmet = self.predmet.id
-        id_programi = IzpitniRok._id_seznama(self.programi)
-        id_letniki = IzpitniRok._id_seznama(self.letniki)
-        id_rok = self.rok.id
-        id_izvajalci = IzpitniRok._id_seznama(self.izvajalci)
-        id_obdobje = self.obdobje.id
-        return "_".join(
-            [id_predmet, id_programi, id_letniki, id_rok, id_izvajalci, id_obdobje]
-        )
+        if self._id is None:
+            id_predmet = self.predmet.id
+            id_programi = IzpitniRok._id_seznama(self.programi)
+            id_letniki = IzpitniRok._id_seznama(self.letniki)
+            id_rok = self.rok.id
+            id_izvajalci = IzpitniRok._id_seznama(self.izvajalci)
+            id_obdobje = self.obdobje.id
+            self._id = "_".join(
+                [id_predmet, id_programi, id_letniki, id_rok, id_izvajalci, id_obdobje]
+            )
+        return self._id
 
     @staticmethod
     def _prikazi_neprazen_seznam(seznam: List[IDTerIme]):
@@ -505,20 +863,42 @@ class IzpitniRok:
                 ZAPISNIKAR.error(
                     f"{ime} se ne ujemata pri izpitnih rokih:\n{izpitni_rok1}\n{izpitni_rok2}"
                 )
-        skupni_programi = izpitni_rok1.programi + izpitni_rok2.programi
-        skupni_letniki = izpitni_rok1.letniki + izpitni_rok2.letniki
-        pari = sorted(set(zip(skupni_programi, skupni_letniki)))
-        skupni_programi, skupni_letniki = list(zip(*pari))
+        return IzpitniRok.zdruzi([izpitni_rok1, izpitni_rok2])
 
+    @staticmethod
+    def zdruzi(izpitni_roki: List["IzpitniRok"]) -> "IzpitniRok":
+        """
+        Spoji izpitne roke za isti predmet na več smereh v enega samega (naenkrat, namesto
+        po dva in dva). Ujemanja datumov, predmetov, rokov in obdobij ne preverjamo: za to
+        mora poskrbeti klicatelj (glej :func:`izpitni_roki.naredi_html.zdruzi_roke`).
+
+        :param izpitni_roki: neprazen seznam izpitnih rokov
+        :return: spoj izpitnih rokov: programi, letniki in izvajalci so unija (urejena)
+            vhodnih, ostala polja in ics_vrstice pa so od prvega roka. Če je rok en sam,
+            ga vrnemo nespremenjenega.
+        """
+        prvi = izpitni_roki[0]
+        if len(izpitni_roki) == 1:
+            return prvi
+        pari = sorted(
+            {par for izpit in izpitni_roki for par in zip(izpit.programi, izpit.letniki)},
+            key=lambda par: (
+                IDTerIme.kljuc_urejanja(par[0]),
+                IDTerIme.kljuc_urejanja(par[1]),
+            ),
+        )
         return IzpitniRok(
-            izpitni_rok1.datum,
-            izpitni_rok1.predmet,
-            list(skupni_programi),
-            list(skupni_letniki),
-            izpitni_rok1.rok,
-            sorted(set(izpitni_rok1.izvajalci + izpitni_rok2.izvajalci)),
-            izpitni_rok1.obdobje,
-            izpitni_rok1.ics_vrstice,
+            prvi.datum,
+            prvi.predmet,
+            [program for program, _ in pari],
+            [letnik for _, letnik in pari],
+            prvi.rok,
+            sorted(
+                {izvajalec for izpit in izpitni_roki for izvajalec in izpit.izvajalci},
+                key=IDTerIme.kljuc_urejanja,
+            ),
+            prvi.obdobje,
+            prvi._ics_vrstice,  # le referenca, niz ustvarimo šele ob izpisu
         )
 
 
@@ -539,6 +919,76 @@ class Koledar:
         )
         return vrstice_drugo_ime.replace("\n", "@@@@")
 
+    def ics_glava(self, nadomestno_ime: str) -> List[str]:
+        """
+        Vrstice glave skupnega koledarja (med ``BEGIN:VCALENDAR`` in prvim dogodkom), pri
+        čemer ime koledarja zamenjamo z danim (glej :meth:`prilagodi_ics_opis`).
+
+        :param nadomestno_ime: ime skupnega koledarja
+
+        :return: seznam vrstic, npr. ``["VERSION:2.0", "X-WR-CALNAME:Izpitni roki", ...]``
+        """
+        return [
+            f"{ime}:{vrednost}"
+            for ime, vrednost in razcleni_ics_vrstice(self.prilagodi_ics_opis(nadomestno_ime))
+        ]
+
+
+class PrevedenaPredloga:
+    """
+    Predloga, ki jo razčlenimo le enkrat: besedilo razbijemo na odseke, pri čemer so odseki na
+    lihih mestih ključne besede (npr. ``{{besedilo}}``), na sodih pa stalno besedilo med njimi.
+    Za vsako pojavitev ključne besede si zapomnimo tudi njen zamik (število presledkov pred
+    njo), s katerim zamaknemo vse razen prve vrstice vstavljene vrednosti.
+    """
+
+    __slots__ = ("besedilo", "odseki", "zamiki", "kljuci")
+
+    def __init__(self, besedilo: str):
+        """
+        :param besedilo: vsebina predloge
+        """
+        self.besedilo: str = besedilo
+        self.odseki: List[str] = []
+        self.zamiki: List[int] = []
+        konec_prejsnjega = 0
+        for zadetek in re.finditer(" *{{[^}]+}}", besedilo):
+            zacetek = besedilo.index("{", zadetek.start())
+            self.odseki.append(besedilo[konec_prejsnjega:zacetek])
+            self.odseki.append(besedilo[zacetek:zadetek.end()])
+            self.zamiki.append(zacetek - zadetek.start())
+            konec_prejsnjega = zadetek.end()
+        self.odseki.append(besedilo[konec_prejsnjega:])
+        self.kljuci: Tuple[str, ...] = tuple(dict.fromkeys(self.odseki[1::2]))
+
+    def izpolni(self, parametri: Dict[str, Optional[str]]) -> str:
+        """
+        Vstavi vrednosti v predlogo.
+
+        :param parametri: slovar ``{ključna beseda: vrednost}``. Ključne besede z vrednostjo
+            ``None`` ostanejo nespremenjene.
+
+        :return: izpolnjena predloga
+        """
+        deli = self.odseki.copy()
+        for i, zamik in enumerate(self.zamiki):
+            vrednost = parametri[deli[2 * i + 1]]
+            if vrednost is not None:
+                deli[2 * i + 1] = _zamakni(vrednost, zamik)
+        return "".join(deli)
+
+
+def _nalozi_predlogo(pot: str) -> PrevedenaPredloga:
+    stanje = os.stat(pot)
+    return _prevedi_predlogo(pot, stanje.st_mtime_ns, stanje.st_size)
+
+
+@lru_cache(maxsize=128)
+def _prevedi_predlogo(pot: str, cas_spremembe: int, velikost: int) -> PrevedenaPredloga:
+    # čas spremembe in velikost sta le del ključa, da spremenjeno predlogo preberemo znova
+    with open(pot, encoding="utf-8") as f:
+        return PrevedenaPredloga(f.read())
+
 
 class HtmlPredloga:
     """
@@ -557,6 +1007,14 @@ class HtmlPredloga:
         >>> str(HtmlPredloga("odstavek", razred="raz", besedilo="Hojla, bralec!"))
         <div class="raz"> <p>Hojla, bralec!</p> </div>
 
+    Vsako datoteko s predlogo preberemo in razčlenimo (glej
+    :class:`izpitni_roki.osnovno.PrevedenaPredloga`) le enkrat, znova pa šele, ko se
+    datoteka spremeni.
+
+    Vrednost parametra je lahko tudi druga predloga ali pa zaporedje (npr. generator) nizov
+    oz. predlog, ki jih ločimo z ``\\n``. Takšne vrednosti lahko z
+    :meth:`izpitni_roki.osnovno.HtmlPredloga.zapisi` zapišemo v datoteko sproti, ne da bi
+    celotno besedilo kdaj hranili v pomnilniku.
     """
 
     def __init__(self, ime_predloge, **kwargs):
@@ -569,28 +1027,20 @@ class HtmlPredloga:
 
         """
         self.pot = f"predloge/{ime_predloge}.html"
-        self.predloga = ""
-        self.parametri = {}
-        self.zamiki = {}
-        self._nalozi()
+        self._prevedena = _nalozi_predlogo(os.path.abspath(self.pot))
+        self.predloga = self._prevedena.besedilo
+        self.parametri: Dict[str, Optional[str]] = dict.fromkeys(self._prevedena.kljuci)
         self.nastavi_parametre(**kwargs)
 
-    def _nalozi(self):
-        with open(self.pot, encoding="utf-8") as f:
-            self.predloga = "".join(f.readlines())
-        for zadetek in re.findall(" *{{[^}]+}}", self.predloga):
-            zamik = zadetek.find("{")
-            zadetek = zadetek.strip()
-            self.parametri[zadetek] = None
-            self.zamiki[zadetek] = zamik
-
     def nastavi_parametre(self, **kwargs):
         """
         Prepiše trenutne vrednosti, ki pripadajo ključnim besedam, s podanimi.
-        Pri nastavljanju parametrov poskrbimo, da se zamiki vrstic ohranjajo, tj.
+        Ob izpisu poskrbimo, da se zamiki vrstic ohranjajo, tj.
 
         ``zamik vstavljene vrtice = zamik ključa + prejšnji zamik vstavljene vrstice``
 
+        (če se ključ pojavi večkrat, upoštevamo zamik vsake pojavitve posebej).
+
         :param kwargs: (nekateri ali pa vsi) ključi, ki se pojavijo v predlogi
 
         :return:
@@ -604,31 +1054,154 @@ class HtmlPredloga:
                 raise ValueError(
                     f"Neznani parameter {parameter}. Dovoljeno: {list(self.parametri)}"
                 )
-            vrstice = vrednost.split("\n")
-            zamik = self.zamiki[parameter]
-            zamaknjene_vrstice = [vrstice[0]]
-            for vrsta in vrstice[1:]:
-                zamaknjene_vrstice.append(zamik * " " + vrsta)
-            self.parametri[parameter] = "\n".join(zamaknjene_vrstice)
+            self.parametri[parameter] = vrednost
+
+    @staticmethod
+    def _v_niz(vrednost) -> Optional[str]:
+        if vrednost is None or isinstance(vrednost, str):
+            return vrednost
+        if isinstance(vrednost, HtmlPredloga):
+            return str(vrednost)
+        return "\n".join(map(str, vrednost))
 
     def __str__(self):
-        niz = self.predloga
-        for parameter, vrednost in self.parametri.items():
+        parametri = {
+            parameter: HtmlPredloga._v_niz(vrednost)
+            for parameter, vrednost in self.parametri.items()
+        }
+        return self._prevedena.izpolni(parametri)
+
+    def zapisi(self, f: TextIO, zamik: int = 0):
+        """
+        Izpolnjeno predlogo zapiše v datoteko, in sicer po kosih: vrednosti, ki so predloge ali
+        zaporedja, zapisujemo sproti. Zapisano besedilo je enako ``str(self)``.
+
+        :param f: datoteka, odprta za pisanje
+        :param zamik: dodaten zamik vseh vrstic razen prve (za gnezdene predloge)
+        """
+        prevedena = self._prevedena
+        for i, odsek in enumerate(prevedena.odseki):
+            if i % 2 == 0:
+                f.write(_zamakni(odsek, zamik))
+                continue
+            vrednost = self.parametri[odsek]
+            skupni_zamik = zamik + prevedena.zamiki[i // 2]
             if vrednost is None:
-                vrednost = parameter
-            niz = niz.replace(parameter, vrednost)
-        return niz
+                f.write(odsek)
+            elif isinstance(vrednost, (str, HtmlPredloga)):
+                HtmlPredloga._zapisi_del(f, vrednost, skupni_zamik)
+            else:
+                for j, del_vrednosti in enumerate(vrednost):
+                    if j:
+                        f.write(_zamakni("\n", skupni_zamik))
+                    HtmlPredloga._zapisi_del(f, del_vrednosti, skupni_zamik)
+
+    @staticmethod
+    def _zapisi_del(f: TextIO, vrednost: Union[str, "HtmlPredloga"], zamik: int):
+        if isinstance(vrednost, HtmlPredloga):
+            vrednost.zapisi(f, zamik)
+        else:
+            f.write(_zamakni(vrednost, zamik))
+
+
+def _zamakni(besedilo: str, zamik: int) -> str:
+    """
+    Zamakne vse vrstice besedila razen prve.
+    """
+    return besedilo.replace("\n", "\n" + zamik * " ") if zamik else besedilo
 
 
 # Pomožne funkcije
 
 
+DNEVI = (
+    "ponedeljek",
+    "torek",
+    "sreda",
+    "četrtek",
+    "petek",
+    "sobota",
+    "nedelja",
+)
+MESECI = (
+    "januar",
+    "februar",
+    "marec",
+    "april",
+    "maj",
+    "junij",
+    "julij",
+    "avgust",
+    "september",
+    "oktober",
+    "november",
+    "december",
+)
+
+
+class PrikazDatumov:
+    """
+    Shramba že oblikovanih datumov, da jih pri izpisu vsake vrstice ne oblikujemo znova.
+    Ključ je zaporedna številka dneva (``date.toordinal()``), vrednost pa par
+    (kratek zapis, berljiv zapis), npr. ``("03. 10. 2022", "3. oktober 2022 (ponedeljek)")``.
+    Manjkajoče datume oblikujemo ob prvi uporabi, cel interval (npr. študijsko leto) pa
+    lahko pripravimo vnaprej z :meth:`izpitni_roki.osnovno.PrikazDatumov.napolni`.
+    """
+
+    def __init__(self):
+        self._zapisi: Dict[int, Tuple[str, str]] = {}
+
+    @staticmethod
+    def _oblikuj(zaporedna_stevilka: int) -> Tuple[str, str]:
+        d = date.fromordinal(zaporedna_stevilka)
+        berljiv = f"{d.day}. {MESECI[d.month - 1]} {d.year} ({DNEVI[d.weekday()]})"
+        return d.strftime("%d. %m. %Y"), berljiv
+
+    def napolni(self, zacetek: date, konec: date):
+        """
+        Vnaprej oblikuje vse datume od vključno ``zacetek`` do vključno ``konec``.
+
+        :param zacetek: prvi datum (ali datum in čas)
+        :param konec: zadnji datum (ali datum in čas)
+        """
+        for zaporedna_stevilka in range(zacetek.toordinal(), konec.toordinal() + 1):
+            if zaporedna_stevilka not in self._zapisi:
+                self._zapisi[zaporedna_stevilka] = PrikazDatumov._oblikuj(zaporedna_stevilka)
+
+    def _zapisa(self, d: date) -> Tuple[str, str]:
+        zaporedna_stevilka = d.toordinal()
+        zapisa = self._zapisi.get(zaporedna_stevilka)
+        if zapisa is None:
+            zapisa = PrikazDatumov._oblikuj(zaporedna_stevilka)
+            self._zapisi[zaporedna_stevilka] = zapisa
+        return zapisa
+
+    def kratek(self, d: date) -> str:
+        """
+        :param d: datum (ali datum in čas)
+
+        :return: datum v obliki ``dd. mm. llll``
+        """
+        return self._zapisa(d)[0]
+
+    def berljiv(self, d: date) -> str:
+        """
+        :param d: datum (ali datum in čas)
+
+        :return: datum v obliki ``3. oktober 2022 (ponedeljek)``
+        """
+        return self._zapisa(d)[1]
+
+
+PRIKAZ_DATUMOV = PrikazDatumov()
+
+
 def niz_v_datum(niz):
     return datetime.strptime(niz, "%d. %m. %Y")
 
 
 def datum_v_niz(d):
-    return d.strftime("%d. %m. %Y")
+    return PRIKAZ_DATUMOV.kratek(d)
 
 
 def najdi_vse_ics(mapa: str) -> list[str]:
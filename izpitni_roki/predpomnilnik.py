@@ -0,0 +1,114 @@
+import os
+import pickle
+import hashlib
+import zlib
+from typing import Any, Optional
+
+from izpitni_roki.osnovno import naredi_zapisnikarja
+
+
+ZAPISNIKAR = naredi_zapisnikarja(__file__)
+
+# Ob vsaki spremembi oblike zapisa povečamo, s čimer razveljavimo vse stare zapise.
+VERZIJA = 2
+# Privzeto mapo vežemo na mapo projekta (tako kot out/), ne na trenutno delovno mapo.
+PRIVZETA_MAPA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "predpomnilnik")
+NAJVECJA_VELIKOST = 64 * 2**20  # v bajtih
+KONCNICA = ".pp"
+
+
+class Predpomnilnik:
+    """
+    Predpomnilnik na disku, v katerem hranimo že prebrane (in obdelane) ics datoteke.
+    Ključ zapisa je zgoščena vrednost vsebine datoteke in nastavitev branja, zato se zapis
+    ob spremembi datoteke ali nastavitev samodejno razveljavi. Ko skupna velikost zapisov
+    preseže dovoljeno, odstranimo najdlje neuporabljene.
+
+    Zapise beremo s :mod:`pickle`, zato mora biti mapa zaupanja vredna: kdor lahko piše vanjo,
+    lahko ob naslednjem branju izvede poljubno kodo.
+    """
+
+    def __init__(self, mapa: str = PRIVZETA_MAPA, najvecja_velikost: int = NAJVECJA_VELIKOST):
+        """
+        :param mapa: mapa, v kateri hranimo zapise (če ne obstaja, jo ustvarimo).
+            Vanjo sme pisati le uporabnik, ki program poganja.
+        :param najvecja_velikost: največja skupna velikost zapisov v bajtih
+        """
+        self.mapa = mapa
+        self.najvecja_velikost = najvecja_velikost
+        os.makedirs(self.mapa, exist_ok=True)
+
+    @staticmethod
+    def kljuc(pot: str, *nastavitve) -> str:
+        """
+        Izračuna ključ zapisa za dano datoteko.
+
+        :param pot: pot do datoteke
+        :param nastavitve: vse nastavitve, ki vplivajo na rezultat branja
+            (npr. obdobja in oblika polj ``SUMMARY`` in ``DTSTART``)
+
+        :return: šestnajstiški niz
+        """
+        zgoscevalnik = hashlib.sha256()
+        with open(pot, "rb") as f:
+            for kos in iter(lambda: f.read(2**20), b""):
+                zgoscevalnik.update(kos)
+        zgoscevalnik.update(repr((VERZIJA, nastavitve)).encode("utf-8"))
+        return zgoscevalnik.hexdigest()
+
+    def _pot(self, kljuc: str) -> str:
+        return os.path.join(self.mapa, kljuc + KONCNICA)
+
+    def preberi(self, kljuc: str) -> Optional[Any]:
+        """
+        Prebere zapis s podanim ključem.
+
+        :param kljuc: glej :meth:`izpitni_roki.predpomnilnik.Predpomnilnik.kljuc`
+
+        :return: shranjena vrednost ali ``None``, če zapisa ni (ali je pokvarjen)
+        """
+        pot = self._pot(kljuc)
+        try:
+            with open(pot, "rb") as f:
+                vrednost = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, zlib.error, pickle.UnpicklingError, AttributeError):
+            ZAPISNIKAR.warning(f"Zapis {pot} v predpomnilniku je pokvarjen, odstranjujem ga.")
+            os.remove(pot)
+            return None
+        os.utime(pot)  # za odstranjevanje najdlje neuporabljenih
+        return vrednost
+
+    def zapisi(self, kljuc: str, vrednost: Any):
+        """
+        Shrani vrednost pod danim ključem in po potrebi odstrani stare zapise.
+
+        :param kljuc: glej :meth:`izpitni_roki.predpomnilnik.Predpomnilnik.kljuc`
+        :param vrednost: vrednost, ki jo lahko shranimo s ``pickle``
+        """
+        pot = self._pot(kljuc)
+        zacasna = pot + ".tmp"
+        with open(zacasna, "wb") as f:
+            f.write(zlib.compress(pickle.dumps(vrednost, pickle.HIGHEST_PROTOCOL), 1))
+        os.replace(zacasna, pot)
+        self.pocisti()
+
+    def pocisti(self):
+        """
+        Odstranjuje najdlje neuporabljene zapise, dokler njihova skupna velikost
+        ne pade pod dovoljeno.
+        """
+        zapisi = []
+        for ime in os.listdir(self.mapa):
+            if ime.endswith(KONCNICA):
+                stanje = os.stat(os.path.join(self.mapa, ime))
+                zapisi.append((stanje.st_mtime, stanje.st_size, ime))
+        skupaj = sum(velikost for _, velikost, _ in zapisi)
+        for _, velikost, ime in sorted(zapisi):
+            if skupaj <= self.najvecja_velikost:
+                break
+            ZAPISNIKAR.info(f"Iz predpomnilnika odstranjujem {ime}")
+            os.remove(os.path.join(self.mapa, ime))
+            skupaj -= velikost
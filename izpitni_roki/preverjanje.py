@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 
-import pandas as pd
+import numpy as np
 
 import os
 import re
 import json
+from typing import Iterable, Union
 
 from izpitni_roki.osnovno import (
     IzpitniRok,
@@ -14,6 +15,7 @@ from izpitni_roki.osnovno import (
     Letnik,
     niz_v_datum,
 )
+from izpitni_roki.tabela_rokov import TabelaRokov
 
 
 ZAPISNIKAR = naredi_zapisnikarja(__file__)
@@ -31,12 +33,13 @@ OBVEZNI_PREDMETI = nalozi_obvezne_predmete()
 
 
 def razbij_po_program_letnikih(
-    izpitni_roki: list[IzpitniRok],
+    izpitni_roki: Iterable[IzpitniRok],
 ) -> dict[tuple[str, int], list[IzpitniRok]]:
     """
     Razbije dane roke glede na program-letnik.
 
-    :param izpitni_roki: izpitni roki vseh letnikov in programov
+    :param izpitni_roki: izpitni roki vseh letnikov in programov (lahko tudi generator,
+                         npr. :func:`izpitni_roki.nalozi_ics.nalozi_ics_iter`)
     :return: slovar koledarjev ``{ime1: roki1, ...}``, katerega ključi so imena
              program-letnikov (npr. ``1FiMa - 1. letnik``), vrednosti pa seznami
              izpitnih rokov, ki vsebujejo le izpite za dani program-letnik.
@@ -54,7 +57,7 @@ def razbij_po_program_letnikih(
 def preveri_predmet_letnik(
     program: str,
     letnik: int,
-    izpitni_roki: list[IzpitniRok],
+    izpitni_roki: Union[list[IzpitniRok], TabelaRokov],
     obdobja: tuple[tuple[str, str], tuple[str, str], tuple[str, str]],
     prazniki: list[str],
 ):
@@ -64,7 +67,8 @@ def preveri_predmet_letnik(
 
     :param program: npr. ``"1FiMa"``
     :param letnik: 1, 2, 3, 4 ali 5
-    :param izpitni_roki: razpisani roki danega program-letnika
+    :param izpitni_roki: razpisani roki danega program-letnika (seznam ali
+                         :class:`izpitni_roki.tabela_rokov.TabelaRokov`)
     :param obdobja: trojica intervalov, ki podaja zimsko, spomladansko in jesensko
                     izpitno obdobje. Vsak interval je podan s paroma datumov, npr.
                     ``("24. 1. 2024", "16. 2. 2024")``
@@ -73,95 +77,90 @@ def preveri_predmet_letnik(
     :return: ne vrne ničesar, le izpiše opozorila, če so ta potrebna, sicer pa obvesti,
              da je vse v redu.
     """
-    zimsko, spomladansko, jesensko = obdobja
-    zimsko_zacetek, zimsko_konec = map(niz_v_datum, zimsko)
-    spomladansko_zacetek, spomladansko_konec = map(niz_v_datum, spomladansko)
-    jesensko_zacetek, jesensko_konec = map(niz_v_datum, jesensko)
+    if not isinstance(izpitni_roki, TabelaRokov):
+        izpitni_roki = TabelaRokov(izpitni_roki)
+    meje_obdobij = np.array(
+        [[niz_v_datum(zacetek), niz_v_datum(konec)] for zacetek, konec in obdobja],
+        dtype="datetime64[s]",
+    )
+    izkljuceni_datumi = np.array([niz_v_datum(d) for d in prazniki], dtype="datetime64[s]")
 
     ZAPISNIKAR.info(f"Preverjam {program} ({letnik}. letnik)")
     opozorila = []
-    # Shrani podatke v pandas dataframe
-    datumi_imena = [[rok.datum, rok.predmet.ime] for rok in izpitni_roki]
-    for i, (_, ime_predmeta) in enumerate(datumi_imena):
-        if ime_predmeta.upper() in OBVEZNI_PREDMETI[program][letnik - 1]:
-            datumi_imena[i][1] = ime_predmeta.upper()
-    df = pd.DataFrame(datumi_imena, columns=["Datum", "Ime"])
-    df = df.sort_values(by=["Datum", "Ime"])
-
-    # Pomožne funkcije za pravilnost izpitov
-    def je_v_izpitnem_obdobju(datum):
-        return (
-            zimsko_zacetek <= datum <= zimsko_konec
-            or spomladansko_zacetek <= datum <= spomladansko_konec
-            or jesensko_zacetek <= datum <= jesensko_konec
-        )
-
-    def je_na_delovni_dan(datum):
-        return datum.weekday() <= 4
+    # Imena predmetov: obvezne zapišemo z velikimi tiskanimi črkami. Predmete z enakim
+    # imenom obravnavamo skupaj, zato vrstice označimo s kodami imen (urejenih po abecedi).
+    obvezni_predmeti = OBVEZNI_PREDMETI[program][letnik - 1]
+    imena_predmetov = [
+        ime.upper() if ime.upper() in obvezni_predmeti else ime
+        for ime in izpitni_roki.imena("predmet")
+    ]
+    imena, kode_imen = np.unique(np.array(imena_predmetov, dtype=object), return_inverse=True)
+    imena_vrstic = kode_imen[izpitni_roki.predmeti]
+    # Uredimo po datumu in imenu
+    vrstni_red = np.lexsort((imena_vrstic, izpitni_roki.datumi))
+    datumi = izpitni_roki.datumi[vrstni_red]
+    imena_vrstic = imena_vrstic[vrstni_red]
 
     # Pomembno je, da:
+    # - so datumi v izpitnih obdobjih, na delovne dni in ne na izključene datume
+
+    izven_obdobij = ~np.any(
+        (meje_obdobij[:, 0] <= datumi[:, None]) & (datumi[:, None] <= meje_obdobij[:, 1]),
+        axis=1,
+    )
+    ob_vikendih = izpitni_roki.dnevi_v_tednu()[vrstni_red] > 4
+    na_izkljucene_datume = np.isin(datumi, izkljuceni_datumi)
+
     # - je med izpitoma pri istem predmetu vsaj 10 dni
 
-    def med_izpitoma_vsaj_10_dni(predmet):
-        izpiti_pri_predmetu = df[df["Ime"] == predmet]
-        datumi_izpitov = izpiti_pri_predmetu["Datum"]
-        razlike_datumov = datumi_izpitov.diff().dropna()
-        has_less_than_10_days_between = any(razlike_datumov.dt.days < 10)
-        return not (has_less_than_10_days_between)
+    po_predmetih = np.argsort(imena_vrstic, kind="stable")  # datumi ostanejo urejeni
+    predmeti_po_predmetih = imena_vrstic[po_predmetih]
+    razmiki = np.diff(datumi[po_predmetih])
+    prekratki = (razmiki < np.timedelta64(10, "D")) & (
+        predmeti_po_predmetih[1:] == predmeti_po_predmetih[:-1]
+    )
+    premalo_dni = np.bincount(predmeti_po_predmetih[1:][prekratki], minlength=len(imena)) > 0
 
     # - da so pri vsakem predmetu (kjer so pisni izpiti) vsaj trije roki
 
-    def vsaj_trije_roki_pri_predmetu(predmet):
-        izpiti_pri_predmetu = df[df["Ime"] == predmet]
-        return len(izpiti_pri_predmetu) >= 3
+    premalo_rokov = np.bincount(imena_vrstic, minlength=len(imena)) < 3
 
     # - da poleg obveznega predmeta ni drugih izpitov (obveznih ali izbirnih
     # predmetov) na isti dan, razen v jesenskem izpitnem obdobju, ko se tega
     # ne moremo držati; v jesenskem izpitnem obdobju naj ne bi bila na isti
     # dan izpita pri dveh obveznih predmetih
 
-    def datumi_izpitov_na_isti_dan():
-        stevec_izpitov = df.groupby("Datum").size()
-        slabi_datumi = stevec_izpitov[stevec_izpitov >= 2].index.tolist()
-        return sorted(set(slabi_datumi))
-
-    izkljuceni_datumi = [niz_v_datum(d) for d in prazniki]
+    razlicni_datumi, stevilo_izpitov = np.unique(datumi, return_counts=True)
+    datumi_z_vec_izpiti = razlicni_datumi[stevilo_izpitov >= 2]
 
-    # Končno preverimo veljavnost rokov
+    # Končno izpišemo opozorila
 
-    datumi_izpitov = df["Datum"]  # .unique().tolist()
-    predmeti = df["Ime"].unique().tolist()
-
-    # datumi so v izpitnih obdobjih in ne na izključeni datum
-    for datum in datumi_izpitov:
-        d_str = datum_v_niz(datum)
-        if not je_v_izpitnem_obdobju(datum):
+    for i in np.flatnonzero(izven_obdobij | ob_vikendih | na_izkljucene_datume):
+        d_str = datum_v_niz(datumi[i].item())
+        if izven_obdobij[i]:
             opozorila.append(f"{d_str} ni v izpitnem obdobju.")
-        if not je_na_delovni_dan(datum):
+        if ob_vikendih[i]:
             opozorila.append(f"{d_str} ni na delovni dan.")
-        if datum in izkljuceni_datumi:
+        if na_izkljucene_datume[i]:
             opozorila.append(f"Na dan {d_str} je vsaj en izpit.")
 
-    for predmet in predmeti:
-        # je med izpitoma pri istem predmetu vsaj 10 dni
-        if not med_izpitoma_vsaj_10_dni(predmet):
+    kode, prve_vrstice = np.unique(imena_vrstic, return_index=True)
+    for koda in kode[np.argsort(prve_vrstice)]:
+        predmet = imena[koda]
+        if premalo_dni[koda]:
             opozorila.append(f"Med izpitoma pri predmetu {predmet} ni vsaj 10 dni.")
-
-        # da so pri vsakem predmetu (kjer so pisni izpiti) vsaj trije roki
-        if not vsaj_trije_roki_pri_predmetu(predmet):
+        if premalo_rokov[koda]:
             opozorila.append(f"Pri predmetu {predmet} ni vsaj treh izpitnih rokov.")
 
     # izpiti na isti dan, kjer je vsaj eden obvezen (obvezne izpiše z veliki tiskanimi črkami)
-    datumi_z_vec_izpiti = datumi_izpitov_na_isti_dan()
     if len(datumi_z_vec_izpiti) > 0:
         vrstice = ["Obstajajo potencialni slabi datumi z več izpiti na ta datum:"]
         for d in datumi_z_vec_izpiti:
-            if set(df[df["Datum"] == d]["Ime"].unique().tolist()) & set(
-                OBVEZNI_PREDMETI[program][letnik - 1]
-            ):
-                d_str = datum_v_niz(d)
-                imena = ", ".join(df[df["Datum"] == d]["Ime"].unique().tolist())
-                vrstice.append(f"  - {d_str}: {imena}")
+            od, do = np.searchsorted(datumi, d, "left"), np.searchsorted(datumi, d, "right")
+            imena_na_dan = imena[np.unique(imena_vrstic[od:do])].tolist()
+            if set(imena_na_dan) & set(obvezni_predmeti):
+                d_str = datum_v_niz(d.item())
+                vrstice.append(f"  - {d_str}: {', '.join(imena_na_dan)}")
         opozorila.append("\n".join(vrstice))
     if opozorila:
         zdruzene_napake = "\n".join(opozorila)
@@ -181,7 +180,8 @@ def preveri_vse(
     na vseh.
     """
     for koledar in koledarji:
-        razbito = razbij_po_program_letnikih(koledar.izpitni_roki)
-        for (program, letnik), roki in sorted(razbito.items()):
-            preveri_predmet_letnik(program, letnik, roki, obdobja, prazniki)
+        tabela = TabelaRokov(koledar.izpitni_roki)
+        razbito = tabela.skupine_program_letnik()
+        for (program, letnik), vrstice in sorted(razbito.items(), key=lambda par: par[0]):
+            preveri_predmet_letnik(program, letnik, tabela.izberi(vrstice), obdobja, prazniki)
             print()
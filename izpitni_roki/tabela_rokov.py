@@ -0,0 +1,276 @@
+import copy
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from izpitni_roki.osnovno import IDTerIme, IndeksObdobij, IzpitniRok, Koledar, Letnik
+
+
+class Kategorije:
+    """
+    Preslikava med objekti razreda IDTerIme (npr. vsemi predmeti) in zaporednimi
+    celoštevilskimi kodami 0, 1, 2 ... Kode dodeljujemo v vrstnem redu prve pojavitve.
+    """
+
+    def __init__(self):
+        self.objekti: List[IDTerIme] = []
+        self._kode: Dict[IDTerIme, int] = {}
+
+    def koda(self, objekt: IDTerIme) -> int:
+        """
+        Vrne kodo objekta. Če objekta še ne poznamo, mu dodelimo naslednjo kodo.
+
+        :param objekt: objekt razreda IDTerIme
+
+        :return: koda objekta
+        """
+        koda = self._kode.get(objekt)
+        if koda is None:
+            koda = len(self.objekti)
+            self._kode[objekt] = koda
+            self.objekti.append(objekt)
+        return koda
+
+    def imena(self) -> np.ndarray:
+        """
+        :return: tabela imen objektov (tipa ``object``), tako da je ``imena()[koda]``
+            ime objekta s to kodo
+        """
+        return np.array([objekt.ime for objekt in self.objekti], dtype=object)
+
+    def __len__(self):
+        return len(self.objekti)
+
+    def __getitem__(self, koda: int) -> IDTerIme:
+        return self.objekti[koda]
+
+
+def _izberi_csr(
+    kazalci: np.ndarray, vrednosti: np.ndarray, vrstice: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Iz stolpca v obliki CSR (vrednosti vrstice ``i`` so
+    ``vrednosti[kazalci[i]:kazalci[i + 1]]``) izbere dane vrstice.
+
+    :return: par (novi kazalci, nove vrednosti)
+    """
+    dolzine = np.diff(kazalci)[vrstice]
+    novi_kazalci = np.zeros(len(vrstice) + 1, dtype=np.int64)
+    np.cumsum(dolzine, out=novi_kazalci[1:])
+    zamiki = np.repeat(kazalci[:-1][vrstice] - novi_kazalci[:-1], dolzine)
+    return novi_kazalci, vrednosti[zamiki + np.arange(novi_kazalci[-1])]
+
+
+class TabelaRokov:
+    """
+    Stolpčna predstavitev izpitnih rokov, primerna za vektorizirane operacije (preverjanje,
+    filtriranje, povzetke). Vrstica ``i`` pripada izpitnemu roku ``izpitni_roki[i]``.
+
+    Stolpci:
+
+    - ``datumi``: datumi (in ure) rokov (``numpy.datetime64[s]``),
+    - ``predmeti``, ``roki``, ``obdobja``: kode (``int32``) predmetov, rokov in obdobij
+      (obdobje, ki še ni določeno, ima kodo -1),
+    - ``programi`` in ``letniki``: kode programov in pripadajočih letnikov v obliki CSR:
+      programi roka ``i`` so ``programi[programi_kazalci[i]:programi_kazalci[i + 1]]``,
+      letniki pa na istih mestih v ``letniki``,
+    - ``izvajalci``: kode izvajalcev v obliki CSR s kazalci ``izvajalci_kazalci``.
+
+    Kode pretvorimo nazaj v objekte s ``kategorije[polje][koda]``, kjer je polje eno izmed
+    :data:`TabelaRokov.POLJA`.
+    """
+
+    POLJA = ("predmet", "program", "letnik", "rok", "izvajalec", "obdobje")
+
+    def __init__(
+        self,
+        izpitni_roki: Iterable[IzpitniRok],
+        kategorije: Optional[Dict[str, Kategorije]] = None,
+    ):
+        """
+        :param izpitni_roki: izpitni roki
+        :param kategorije: kategorije, ki jih želimo deliti z drugo tabelo
+            (privzeto ustvarimo nove)
+        """
+        self.izpitni_roki: List[IzpitniRok] = list(izpitni_roki)
+        if kategorije is None:
+            kategorije = {polje: Kategorije() for polje in TabelaRokov.POLJA}
+        self.kategorije: Dict[str, Kategorije] = kategorije
+        predmet, program, letnik, rok, izvajalec, obdobje = (
+            kategorije[polje].koda for polje in TabelaRokov.POLJA
+        )
+        n = len(self.izpitni_roki)
+        self.datumi = np.array(
+            [izpit.datum for izpit in self.izpitni_roki], dtype="datetime64[s]"
+        )
+        self.predmeti = np.fromiter(
+            (predmet(izpit.predmet) for izpit in self.izpitni_roki), np.int32, n
+        )
+        self.roki = np.fromiter((rok(izpit.rok) for izpit in self.izpitni_roki), np.int32, n)
+        self.obdobja = np.fromiter(
+            (
+                -1 if izpit.obdobje is None else obdobje(izpit.obdobje)
+                for izpit in self.izpitni_roki
+            ),
+            np.int32,
+            n,
+        )
+        self.programi_kazalci = TabelaRokov._kazalci(
+            len(izpit.programi) for izpit in self.izpitni_roki
+        )
+        self.programi = np.array(
+            [program(p) for izpit in self.izpitni_roki for p in izpit.programi], np.int32
+        )
+        self.letniki = np.array(
+            [letnik(l) for izpit in self.izpitni_roki for l in izpit.letniki], np.int32
+        )
+        self.izvajalci_kazalci = TabelaRokov._kazalci(
+            len(izpit.izvajalci) for izpit in self.izpitni_roki
+        )
+        self.izvajalci = np.array(
+            [izvajalec(i) for izpit in self.izpitni_roki for i in izpit.izvajalci], np.int32
+        )
+
+    @staticmethod
+    def _kazalci(dolzine: Iterable[int]) -> np.ndarray:
+        dolzine = np.fromiter(dolzine, np.int64)
+        kazalci = np.zeros(len(dolzine) + 1, dtype=np.int64)
+        np.cumsum(dolzine, out=kazalci[1:])
+        return kazalci
+
+    @staticmethod
+    def iz_koledarjev(koledarji: List[Koledar]) -> "TabelaRokov":
+        """
+        Naredi tabelo iz vseh izpitnih rokov v danih koledarjih.
+
+        :param koledarji: seznam koledarjev
+
+        :return: tabela rokov
+        """
+        return TabelaRokov(izpit for koledar in koledarji for izpit in koledar.izpitni_roki)
+
+    def __len__(self):
+        return len(self.izpitni_roki)
+
+    def izberi(self, vrstice: np.ndarray) -> "TabelaRokov":
+        """
+        Naredi tabelo z izbranimi vrsticami (kategorije si tabeli delita).
+
+        :param vrstice: indeksi vrstic (ali logična maska)
+
+        :return: nova tabela
+        """
+        vrstice = np.arange(len(self))[vrstice]
+        izbrana = copy.copy(self)
+        izbrana.izpitni_roki = [self.izpitni_roki[i] for i in vrstice]
+        izbrana.datumi = self.datumi[vrstice]
+        izbrana.predmeti = self.predmeti[vrstice]
+        izbrana.roki = self.roki[vrstice]
+        izbrana.obdobja = self.obdobja[vrstice]
+        izbrana.programi_kazalci, izbrana.programi = _izberi_csr(
+            self.programi_kazalci, self.programi, vrstice
+        )
+        _, izbrana.letniki = _izberi_csr(self.programi_kazalci, self.letniki, vrstice)
+        izbrana.izvajalci_kazalci, izbrana.izvajalci = _izberi_csr(
+            self.izvajalci_kazalci, self.izvajalci, vrstice
+        )
+        return izbrana
+
+    def _stolpec(self, polje: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        :return: par (kode, vrstice), kjer je ``vrstice[j]`` vrstica, ki ji pripada
+            ``kode[j]`` (pri poljih, ki imajo v vsaki vrstici natanko eno vrednost,
+            je ``vrstice`` ``None``)
+        """
+        if polje in ("program", "letnik"):
+            kazalci = self.programi_kazalci
+        elif polje == "izvajalec":
+            kazalci = self.izvajalci_kazalci
+        else:
+            return {"predmet": self.predmeti, "rok": self.roki, "obdobje": self.obdobja}[
+                polje
+            ], None
+        kode = {"program": self.programi, "letnik": self.letniki, "izvajalec": self.izvajalci}
+        return kode[polje], np.repeat(np.arange(len(self)), np.diff(kazalci))
+
+    def maska(self, polje: str, objekti: Iterable[IDTerIme]) -> np.ndarray:
+        """
+        Poišče vrstice, v katerih ima dano polje vsaj eno od danih vrednosti.
+
+        :param polje: eno izmed :data:`TabelaRokov.POLJA`
+        :param objekti: iskane vrednosti
+
+        :return: logična maska vrstic
+        """
+        kategorije = self.kategorije[polje]
+        iskane = [kategorije._kode[o] for o in objekti if o in kategorije._kode]
+        kode, vrstice = self._stolpec(polje)
+        zadetki = np.isin(kode, iskane)
+        if vrstice is None:
+            return zadetki
+        return np.bincount(vrstice[zadetki], minlength=len(self)) > 0
+
+    def imena(self, polje: str) -> np.ndarray:
+        """
+        :param polje: eno izmed :data:`TabelaRokov.POLJA`
+
+        :return: imena vrednosti polja, tako da je ``imena(polje)[koda]`` ime vrednosti
+        """
+        return self.kategorije[polje].imena()
+
+    def dnevi_v_tednu(self) -> np.ndarray:
+        """
+        :return: dnevi v tednu za vse datume (0 je ponedeljek, 6 nedelja,
+            tako kot pri ``datetime.weekday``)
+        """
+        # 1. 1. 1970 je bil četrtek
+        return (self.datumi.astype("datetime64[D]").astype(np.int64) + 3) % 7
+
+    def doloci_obdobja(self, indeks: IndeksObdobij) -> np.ndarray:
+        """
+        Vsem vrsticam naenkrat določi obdobja (z ``numpy.searchsorted`` po mejah obdobij,
+        glej :class:`izpitni_roki.osnovno.IndeksObdobij`) in nastavi stolpec ``obdobja``.
+        Izpitnih rokov (objektov) ne spreminjamo.
+
+        :param indeks: indeks obdobij
+
+        :return: nove kode obdobij
+        """
+        meje = np.array(indeks.meje + [None], dtype="datetime64[s]")  # None postane NaT
+        na_mejah = np.array(indeks.na_mejah + [-1], dtype=np.int64)
+        med_mejami = np.array(indeks.med_mejami, dtype=np.int64)
+        j = np.searchsorted(meje[:-1], self.datumi, "left")
+        # za datume po zadnji meji je j enak številu mej in kaže na NaT, ki ni enak
+        # nobenemu datumu, zato zanje vzamemo (zadnji) odsek med mejami
+        indeksi = np.where(meje[j] == self.datumi, na_mejah[j], med_mejami[j])
+        obdobje = self.kategorije["obdobje"].koda
+        # indeks -1 (izven obdobij) kaže na zadnjo kodo
+        kode = np.array(
+            [obdobje(o) for o in indeks.obdobja] + [obdobje(indeks.izven)], dtype=np.int32
+        )
+        self.obdobja = kode[indeksi]
+        return self.obdobja
+
+    def skupine_program_letnik(self) -> Dict[Tuple[str, int], np.ndarray]:
+        """
+        Razbije vrstice po program-letnikih, tako kot
+        :func:`izpitni_roki.preverjanje.razbij_po_program_letnikih`.
+
+        :return: slovar ``{(ime programa, letnik): vrstice, ...}`` (v vrstnem redu prve
+            pojavitve)
+        """
+        vrstice = np.repeat(np.arange(len(self)), np.diff(self.programi_kazalci))
+        n_letnikov = max(1, len(self.kategorije["letnik"]))
+        pari = self.programi.astype(np.int64) * n_letnikov + self.letniki
+        kode, prve, skupina = np.unique(pari, return_index=True, return_inverse=True)
+        # vrstice, urejene po skupinah (znotraj skupine ohranimo vrstni red)
+        urejene = vrstice[np.argsort(skupina, kind="stable")]
+        konci = np.cumsum(np.bincount(skupina, minlength=len(kode)))
+        zacetki = np.concatenate(([0], konci[:-1]))
+        skupine = {}
+        for i in np.argsort(prve):
+            program = self.kategorije["program"][int(kode[i]) // n_letnikov]
+            letnik = self.kategorije["letnik"][int(kode[i]) % n_letnikov]
+            kljuc = (program.ime, Letnik.DOVOLJENI_LETNIKI[letnik.ime])
+            skupine[kljuc] = urejene[zacetki[i] : konci[i]]
+        return skupine
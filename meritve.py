@@ -0,0 +1,538 @@
+# Meritve hitrosti (in porabe pomnilnika) posameznih korakov. Poženemo jih z
+#
+#     python meritve.py [ime_meritve ...]
+#
+# Brez argumentov se izvedejo vse meritve. Vhodne podatke zgeneriramo sami
+# (glej naredi_sinteticni_ics), zato ne potrebujemo pravih ics datotek.
+
+import os
+import re
+import sys
+import random
+import tempfile
+import timeit
+import tracemalloc
+from functools import cmp_to_key
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from izpitni_roki.nalozi_ics import (
+    preberi_vrednosti,
+    nalozi_ics,
+    nalozi_ics_mmap,
+    nalozi_koledarje,
+)
+from izpitni_roki.osnovno import (
+    Program,
+    Letnik,
+    IDTerIme,
+    Izvajalec,
+    Register,
+    Obdobje,
+    IndeksObdobij,
+    IzpitniRok,
+    Predmet,
+    Rok,
+    HtmlPredloga,
+)
+from izpitni_roki.naredi_html import (
+    naredi_tabelo,
+    naredi_predlogo_tabele,
+    uredi_roke,
+    nalozi_predmete_za_zduzevanje,
+    privzeti_zdruzevalnik,
+)
+from izpitni_roki.tabela_rokov import TabelaRokov
+
+
+PREDMETI = [
+    "Analiza", "Algebra", "Diskretna matematika", "Topologija", "Verjetnost",
+    "Statistika", "Numerične metode", "Računalniški praktikum", "Šahovske strategije",
+    "Žepna geometrija", "Čista matematika", "Kombinatorika ćevapov", "Grafi in đuveč",
+    "Teorija iger", "Optimizacijske metode", "Mikroekonomija", "Finančna matematika",
+]
+PRIIMKI = [
+    "Novak", "Horvat", "Kovačič", "Krajnc", "Zupančič", "Potočnik", "Kovač", "Mlakar",
+    "Šinkovec", "Žagar", "Čuk", "Mađarić", "Babić", "Vidmar", "Golob", "Turk", "Božič",
+]
+IMENA = ["Ana", "Boris", "Cene", "Čarli", "Dušan", "Eva", "Špela", "Žiga", "Maja", "Luka"]
+
+
+def naredi_sinteticni_ics(pot: str, n_rokov: int, leto: int = 2024, seme: int = 0) -> str:
+    """
+    Zapiše ics datoteko z ``n_rokov`` naključnimi (a pravilno oblikovanimi) izpitnimi roki,
+    kakršne izvozi Google koledar.
+
+    :param pot: pot do izhodne datoteke
+    :param n_rokov: število dogodkov v datoteki
+    :param leto: koledarsko leto, v katerega padejo izpitni roki
+    :param seme: seme generatorja naključnih števil
+
+    :return: pot do zapisane datoteke
+    """
+    nakljucno = random.Random(seme)
+    programi = list(Program.LEPSE_OBLIKE)
+    letniki = list(Letnik.DOVOLJENI_LETNIKI)
+    zacetek = datetime(leto, 1, 1)
+    vrstice = [
+        "BEGIN:VCALENDAR",
+        "PRODID:-//Google Inc//Google Calendar 70.9054//EN",
+        "VERSION:2.0",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:Sintetični koledar {leto - 1}/{leto % 100}",
+        "X-WR-TIMEZONE:Europe/Belgrade",
+    ]
+    for i in range(n_rokov):
+        datum = zacetek + timedelta(days=nakljucno.randrange(270))
+        predmet = f"{nakljucno.choice(PREDMETI)} {nakljucno.randrange(1, 40)}"
+        smeri = "\\, ".join(sorted(nakljucno.sample(programi, nakljucno.randint(1, 2))))
+        izvajalci = "\\, ".join(
+            f"{nakljucno.choice(PRIIMKI)} {nakljucno.choice(IMENA)}"
+            for _ in range(nakljucno.randint(1, 3))
+        )
+        povzetek = (
+            f"SUMMARY:{predmet} ({smeri}\\, ni smeri)\\, {nakljucno.choice(letniki)} letnik\\, "
+            f"{izvajalci}\\, {nakljucno.randint(1, 4)}. rok"
+        )
+        vrstice += [
+            "BEGIN:VEVENT",
+            f"DTSTART;VALUE=DATE:{datum:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{datum + timedelta(days=1):%Y%m%d}",
+            "DTSTAMP:20231220T143526Z",
+            f"UID:{seme}x{i:08}@google.com",
+            "CREATED:20230429T095224Z",
+            "DESCRIPTION:",
+            "LAST-MODIFIED:20230913T124937Z",
+            "LOCATION:",
+            "SEQUENCE:0",
+            "STATUS:CONFIRMED",
+        ]
+        # Google prelomi vrstice, daljše od 75 znakov
+        vrstice.append(povzetek[:75])
+        for j in range(75, len(povzetek), 74):
+            vrstice.append(" " + povzetek[j : j + 74])
+        vrstice += ["TRANSP:TRANSPARENT", "END:VEVENT"]
+    vrstice.append("END:VCALENDAR")
+    with open(pot, "w", encoding="utf-8") as f:
+        f.write("\n".join(vrstice) + "\n")
+    return pot
+
+
+def _vrstice_dogodkov(pot: str) -> List[List[str]]:
+    dogodki = []
+    v_dogodku = False
+    with open(pot, encoding="utf-8") as f:
+        for vrsta in f:
+            vrsta = vrsta.replace("\n", "")
+            if vrsta == "BEGIN:VEVENT":
+                dogodki.append([])
+                v_dogodku = True
+            elif vrsta == "END:VEVENT":
+                v_dogodku = False
+            elif v_dogodku:
+                dogodki[-1].append(vrsta)
+    return dogodki
+
+
+def _izpisi(ime: str, casi: Dict[str, float]):
+    print(ime)
+    najhitrejsi = min(casi.values())
+    for opis, cas in casi.items():
+        print(f"  {opis:<40} {cas * 1000:10.2f} ms  ({cas / najhitrejsi:.2f}x)")
+
+
+def _preberi_vrednosti_prej(
+    vrstice: List[str], nujni_kljuci: List[str]
+) -> Tuple[Dict[str, str], str]:
+    # prejšnja različica preberi_vrednosti (zaporedno preverjanje vseh ključnih besed)
+    kljucne_besede = [
+        "DTSTART;VALUE=DATE", "DTEND;VALUE=DATE", "DTSTAMP", "UID", "CREATED",
+        "DESCRIPTION", "LAST-MODIFIED", "LOCATION", "SEQUENCE", "STATUS", "SUMMARY",
+        "TRANSP", "PRODID", "VERSION", "CALSCALE", "METHOD", "X-WR-CALNAME", "X-WR-TIMEZONE",
+    ]
+    pari = {}
+    zadnja = ""
+    for vrsta in vrstice:
+        if any(vrsta.startswith((zacetek := kljucna)) for kljucna in kljucne_besede):
+            zadnja = zacetek
+            pari[zadnja] = vrsta[len(zacetek) + 1 :]
+        elif re.match("^[A-Z]+:.+$", vrsta) is not None:
+            zadnja = ""
+        elif zadnja:
+            assert vrsta[0] == " ", vrsta
+            pari[zadnja] += vrsta[1:]
+    for nujen in nujni_kljuci:
+        if nujen not in pari:
+            raise ValueError(f"Ključ {nujen} manjka v {vrstice}")
+    return {n: pari[n] for n in nujni_kljuci}, "\n".join(vrstice)
+
+
+def meri_preberi_vrednosti(mapa: str, n_rokov: int = 5000, ponovitve: int = 5):
+    """Primerja slovarsko razčlenjevanje vrstic s prejšnjim zaporednim preverjanjem."""
+    dogodki = _vrstice_dogodkov(naredi_sinteticni_ics(os.path.join(mapa, "m.ics"), n_rokov))
+    kljuci = ["DTSTART;VALUE=DATE", "SUMMARY"]
+    for vrstice in dogodki:
+        assert preberi_vrednosti(vrstice, kljuci) == _preberi_vrednosti_prej(vrstice, kljuci)
+    casi = {}
+    for opis, funkcija in [
+        ("prej (any + startswith)", _preberi_vrednosti_prej),
+        ("zdaj (slovar)", preberi_vrednosti),
+    ]:
+        casi[opis] = min(
+            timeit.repeat(
+                lambda: [funkcija(vrstice, kljuci) for vrstice in dogodki],
+                number=1,
+                repeat=ponovitve,
+            )
+        )
+    _izpisi(f"preberi_vrednosti ({n_rokov} dogodkov)", casi)
+
+
+def meri_nalaganje(mapa: str, n_rokov: int = 20000, ponovitve: int = 3):
+    """Primerja branje po vrsticah z branjem preslikane datoteke (mmap)."""
+    pot = naredi_sinteticni_ics(os.path.join(mapa, "velika.ics"), n_rokov)
+    obdobja = {"celo leto": (datetime(2024, 1, 1), datetime(2024, 12, 31))}
+    casi = {}
+    for opis, funkcija in [("nalozi_ics", nalozi_ics), ("nalozi_ics_mmap", nalozi_ics_mmap)]:
+        casi[opis] = min(
+            timeit.repeat(lambda: funkcija(pot, obdobja), number=1, repeat=ponovitve)
+        )
+    velikost = os.path.getsize(pot) / 2**20
+    _izpisi(f"nalaganje ({n_rokov} dogodkov, {velikost:.1f} MB)", casi)
+
+
+def meri_predpomnilnik(mapa: str, n_rokov: int = 20000, ponovitve: int = 3):
+    """Primerja branje datoteke z nalaganjem iz (toplega) predpomnilnika."""
+    pot = naredi_sinteticni_ics(os.path.join(mapa, "velika.ics"), n_rokov)
+    obdobja = {"celo leto": (datetime(2024, 1, 1), datetime(2024, 12, 31))}
+    shramba = os.path.join(mapa, "predpomnilnik")
+    nalozi_koledarje([pot], obdobja, predpomnilnik=shramba)  # ogrejemo predpomnilnik
+    casi = {}
+    for opis, nastavitve in [
+        ("brez predpomnilnika", {}),
+        ("topel predpomnilnik", {"predpomnilnik": shramba}),
+    ]:
+        casi[opis] = min(
+            timeit.repeat(
+                lambda: nalozi_koledarje([pot], obdobja, **nastavitve),
+                number=1,
+                repeat=ponovitve,
+            )
+        )
+    _izpisi(f"predpomnilnik ({n_rokov} dogodkov)", casi)
+
+
+def meri_pomnilnik(mapa: str, n_rokov: int = 20000):
+    """Izmeri, koliko pomnilnika (v bajtih na dogodek) zasedejo naloženi izpitni roki."""
+    pot = naredi_sinteticni_ics(os.path.join(mapa, "velika.ics"), n_rokov)
+    obdobja = {"celo leto": (datetime(2024, 1, 1), datetime(2024, 12, 31))}
+    print(f"pomnilnik ({n_rokov} dogodkov)")
+    for opis, funkcija in [("nalozi_ics", nalozi_ics), ("nalozi_ics_mmap", nalozi_ics_mmap)]:
+        tracemalloc.start()
+        koledar = funkcija(pot, obdobja, register=Register())
+        trenutno, najvec = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        n = len(koledar.izpitni_roki)
+        print(
+            f"  {opis:<40} {trenutno / n:10.0f} B/dogodek "
+            f"(največ {najvec / n:.0f} B/dogodek med branjem)"
+        )
+
+
+def _normalna_oblika_prej(objekt: IDTerIme) -> str:
+    # prejšnja različica IDTerIme._normalna_oblika (izračunana ob vsaki primerjavi)
+    posebni = {"č": "c{", "ć": "c{{", "đ": "d{", "š": "s{", "ž": "z{"}
+    return "".join(
+        [crka if crka not in posebni else posebni[crka] for crka in objekt.ime.lower()]
+    )
+
+
+def _primerjaj_prej(prvi: IDTerIme, drugi: IDTerIme) -> int:
+    a, b = _normalna_oblika_prej(prvi), _normalna_oblika_prej(drugi)
+    return (a > b) - (a < b)
+
+
+def meri_urejanje(mapa: str, n_imen: int = 10000, ponovitve: int = 5):
+    """Primerja urejanje izvajalcev po slovenski abecedi prej in zdaj."""
+    nakljucno = random.Random(0)
+    crke = "abcčćdđefghijklmnoprsštuvzž"
+    register = Register()
+    izvajalci = [
+        register.naredi_objekt(
+            Izvajalec,
+            f"{nakljucno.choice(PRIIMKI)}"
+            f"{''.join(nakljucno.choices(crke, k=3))} {nakljucno.choice(IMENA)}"
+        )
+        for _ in range(n_imen)
+    ]
+    nacini = {
+        "prej (normalizacija ob primerjavi)": {"key": cmp_to_key(_primerjaj_prej)},
+        "zdaj (__lt__)": {},
+        "zdaj (key=kljuc_urejanja)": {"key": IDTerIme.kljuc_urejanja},
+    }
+    urejeni = [[i.ime for i in sorted(izvajalci, **n)] for n in nacini.values()]
+    assert all(imena == urejeni[0] for imena in urejeni), "Vrstni red se razlikuje"
+    casi = {}
+    for opis, nastavitve in nacini.items():
+        casi[opis] = min(
+            timeit.repeat(
+                lambda: sorted(izvajalci, **nastavitve), number=1, repeat=ponovitve
+            )
+        )
+    _izpisi(f"urejanje ({n_imen} izvajalcev)", casi)
+
+
+def meri_tabelo(mapa: str, n_rokov: int = 5000, ponovitve: int = 5):
+    """
+    Primerja izdelavo html tabele, ko morajo izpitni roki id in ics vrstice izračunati
+    na novo (kot prej), in ko jih imajo že shranjene.
+    """
+    pot = naredi_sinteticni_ics(os.path.join(mapa, "leto.ics"), n_rokov)
+    obdobja = {"celo leto": (datetime(2024, 1, 1), datetime(2024, 12, 31))}
+    koledarji = nalozi_koledarje([pot], obdobja, register=Register())
+
+    def pozabi():
+        for koledar in koledarji:
+            for izpit in koledar.izpitni_roki:
+                izpit.pozabi_izpeljane()
+
+    def izpeljane():
+        return [
+            (izpit.id(), izpit.ics_vrstice)
+            for koledar in koledarji
+            for izpit in koledar.izpitni_roki
+        ]
+
+    pozabi()
+    prvic = naredi_tabelo(koledarji)
+    assert naredi_tabelo(koledarji) == prvic, "Tabela se razlikuje"
+    for ime, funkcija in [
+        (f"naredi_tabelo ({n_rokov} dogodkov)", lambda: naredi_tabelo(koledarji)),
+        (f"id in ics_vrstice ({n_rokov} dogodkov)", izpeljane),
+    ]:
+        casi = {}
+        for opis, priprava in [
+            ("prej (vse izračunamo na novo)", pozabi),
+            ("zdaj (shranjene vrednosti)", lambda: None),
+        ]:
+            casi[opis] = min(
+                timeit.repeat(funkcija, setup=priprava, number=1, repeat=ponovitve)
+            )
+        _izpisi(ime, casi)
+
+
+def meri_obdobja(mapa: str, n_obdobij: int = 60, n_rokov: int = 20000, ponovitve: int = 5):
+    """
+    Primerja določanje obdobij s pregledovanjem seznama, z indeksom obdobij in vektorsko
+    (na stolpčni predstavitvi rokov).
+    """
+    pot = naredi_sinteticni_ics(os.path.join(mapa, "leto.ics"), n_rokov)
+    register = Register()
+    celo_leto = {"celo leto": (datetime(2024, 1, 1), datetime(2024, 12, 31))}
+    koledar = nalozi_ics(pot, celo_leto, register=register)
+    # kratka (delna) obdobja čez več let
+    obdobja = [
+        register.naredi_objekt(
+            Obdobje,
+            f"obdobje {i}",
+            datetime(2022, 1, 1) + timedelta(days=30 * i),
+            datetime(2022, 1, 1) + timedelta(days=30 * i + 20),
+        )
+        for i in range(n_obdobij)
+    ]
+    izven = register.obdobje_izven
+    indeks = IndeksObdobij(obdobja, izven)
+    datumi = [izpit.datum for izpit in koledar.izpitni_roki]
+    tabela = TabelaRokov(koledar.izpitni_roki)
+    prej = [Obdobje.doloci_obdobje(datum, obdobja, izven) for datum in datumi]
+    assert indeks.doloci_vse(datumi) == prej, "Obdobja se razlikujejo"
+    nacini = {
+        "prej (pregled seznama)": lambda: [
+            Obdobje.doloci_obdobje(datum, obdobja, izven) for datum in datumi
+        ],
+        "zdaj (IndeksObdobij.doloci_vse)": lambda: indeks.doloci_vse(datumi),
+        "zdaj (TabelaRokov.doloci_obdobja)": lambda: tabela.doloci_obdobja(indeks),
+    }
+    casi = {}
+    for opis, funkcija in nacini.items():
+        casi[opis] = min(timeit.repeat(funkcija, number=1, repeat=ponovitve))
+    _izpisi(f"obdobja ({n_obdobij} obdobij, {len(datumi)} rokov)", casi)
+
+
+def _zdruzi_roke_prej(izpitni_roki: List[IzpitniRok]) -> List[IzpitniRok]:
+    predmeti_zdruzevanja = nalozi_predmete_za_zduzevanje()
+    koncni_roki = []
+    skupine: Dict[Tuple[str, str], List[IzpitniRok]] = {}
+    for izpit in izpitni_roki:
+        programi = predmeti_zdruzevanja.get(izpit.predmet.ime)
+        if programi is not None and all(p.ime in programi for p in izpit.programi):
+            skupine.setdefault((izpit.predmet.ime, izpit.rok.ime), []).append(izpit)
+        else:
+            koncni_roki.append(izpit)
+    for skupina in skupine.values():
+        izpit = skupina[0]
+        for se_en in skupina[1:]:
+            izpit = IzpitniRok.zdruzi_roka(izpit, se_en)
+        koncni_roki.append(izpit)
+    return koncni_roki
+
+
+def meri_zdruzevanje(mapa: str, n_rokov: int = 5, n_kopij: int = 10, ponovitve: int = 5):
+    """
+    Primerja združevanje rokov skupnih predmetov po dva in dva (z branjem pravil ob
+    vsakem klicu) z združevanjem celih skupin naenkrat. Vsak rok se pojavi ``n_kopij``-krat
+    (kot bi bil v več izvozih).
+    """
+    register = Register()
+    obdobje = register.naredi_objekt(
+        Obdobje, "zimsko", datetime(2024, 1, 1), datetime(2024, 3, 1)
+    )
+    nakljucno = random.Random(0)
+    izpitni_roki = []
+    for predmet, programi in nalozi_predmete_za_zduzevanje().items():
+        for i in range(n_rokov):
+            datum = datetime(2024, 1, 8) + timedelta(days=10 * i)
+            for program in programi:
+                for letnik in nakljucno.sample(list(Letnik.DOVOLJENI_LETNIKI), 3):
+                    izpitni_roki.append(
+                        IzpitniRok(
+                            datum,
+                            register.naredi_objekt(Predmet, predmet),
+                            [register.naredi_objekt(Program, program)],
+                            register.naredi_objekt(Letnik, letnik),
+                            register.naredi_objekt(Rok, f"{i + 1}."),
+                            [
+                                register.naredi_objekt(Izvajalec, ime)
+                                for ime in nakljucno.sample(PRIIMKI, 2)
+                            ],
+                            obdobje,
+                            "",
+                        )
+                    )
+    izpitni_roki *= n_kopij
+    zdruzevalnik = privzeti_zdruzevalnik()
+    prej = sorted(map(IzpitniRok.kljuc_urejanja, _zdruzi_roke_prej(izpitni_roki)))
+    zdaj = sorted(map(IzpitniRok.kljuc_urejanja, zdruzevalnik.zdruzi(izpitni_roki)[0]))
+    assert prej == zdaj, "Združeni roki se razlikujejo"
+    casi = {
+        "prej (po dva in dva)": min(
+            timeit.repeat(
+                lambda: _zdruzi_roke_prej(izpitni_roki), number=1, repeat=ponovitve
+            )
+        ),
+        "zdaj (ZdruzevalnikRokov)": min(
+            timeit.repeat(
+                lambda: zdruzevalnik.zdruzi(izpitni_roki), number=1, repeat=ponovitve
+            )
+        ),
+    }
+    _izpisi(f"združevanje ({len(izpitni_roki)} rokov)", casi)
+
+
+def _izpolni_predlogo_prej(ime_predloge: str, **kwargs) -> str:
+    with open(f"predloge/{ime_predloge}.html", encoding="utf-8") as f:
+        predloga = "".join(f.readlines())
+    parametri, zamiki = {}, {}
+    for zadetek in re.findall(" *{{[^}]+}}", predloga):
+        parametri[zadetek.strip()] = None
+        zamiki[zadetek.strip()] = zadetek.find("{")
+    for kljuc, vrednost in kwargs.items():
+        parameter = "{{" + kljuc + "}}"
+        vrstice = vrednost.split("\n")
+        parametri[parameter] = "\n".join(
+            [vrstice[0]] + [zamiki[parameter] * " " + vrsta for vrsta in vrstice[1:]]
+        )
+    for parameter, vrednost in parametri.items():
+        predloga = predloga.replace(parameter, parameter if vrednost is None else vrednost)
+    return predloga
+
+
+def meri_predloge(mapa: str, n_vrstic: int = 5000, ponovitve: int = 5):
+    """Primerja izpolnjevanje predloge vrstice tabele z branjem datoteke in z razčlenjeno."""
+    parametri = [
+        {
+            "id": f"{i:08x}_1_2_3_4_5",
+            "datum": f"{i % 28 + 1}. januar 2024 (ponedeljek)",
+            "predmet": f"Predmet {i}",
+            "letnik": "1Mate, 1. letnik",
+            "rok": "1.",
+            "izvajalci": "Novak Ana in Horvat Beno",
+        }
+        for i in range(n_vrstic)
+    ]
+    prej = [_izpolni_predlogo_prej("tabela_vrstica", **p) for p in parametri]
+    assert prej == [str(HtmlPredloga("tabela_vrstica", **p)) for p in parametri]
+    casi = {}
+    for opis, funkcija in [
+        ("prej (branje in zamenjave)", _izpolni_predlogo_prej),
+        ("zdaj (razčlenjena predloga)", lambda ime, **p: str(HtmlPredloga(ime, **p))),
+    ]:
+        casi[opis] = min(
+            timeit.repeat(
+                lambda: [funkcija("tabela_vrstica", **p) for p in parametri],
+                number=1,
+                repeat=ponovitve,
+            )
+        )
+    _izpisi(f"predloge ({n_vrstic} vrstic)", casi)
+
+
+def meri_izpis(mapa: str, n_rokov: int = 20000):
+    """
+    Primerja čas in največjo porabo pomnilnika pri izpisu strani, ko jo najprej sestavimo
+    v en niz (prej) in ko vrstice tabele zapisujemo sproti (``pretocno=True``). Tudi pri
+    pretočnem izpisu poraba raste s številom rokov (indeks filtrov je v strani).
+    """
+    pot = naredi_sinteticni_ics(os.path.join(mapa, "izpis.ics"), n_rokov)
+    obdobja = {"celo leto": (datetime(2024, 1, 1), datetime(2024, 12, 31))}
+    koledarji = [nalozi_ics(pot, obdobja, register=Register())]
+    naredi_tabelo(koledarji)  # id-ji in ics vrstice se shranijo, zato jih ne merimo
+    pot_html = os.path.join(mapa, "izpis.html")
+
+    def izpisi(pretocno: bool):
+        stran = HtmlPredloga(
+            "stran",
+            naslov="Naslov",
+            opis_strani="Opis",
+            spustni_meniji="",
+            izpiti=naredi_predlogo_tabele(uredi_roke(koledarji), "izpis.ics.js"),
+        )
+        with open(pot_html, "w", encoding="utf-8") as f:
+            if pretocno:
+                stran.zapisi(f)
+                f.write("\n")
+            else:
+                print(stran, file=f)
+
+    print(f"izpis strani ({n_rokov} dogodkov)")
+    for opis, pretocno in [("prej (en niz)", False), ("zdaj (pretočno)", True)]:
+        zacetek = timeit.default_timer()
+        izpisi(pretocno)
+        cas = timeit.default_timer() - zacetek
+        tracemalloc.start()
+        izpisi(pretocno)
+        _, najvec = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {opis:<40} {cas * 1000:10.1f} ms (največ {najvec / 2 ** 20:.1f} MiB)")
+
+
+MERITVE = {
+    "preberi_vrednosti": meri_preberi_vrednosti,
+    "nalaganje": meri_nalaganje,
+    "predpomnilnik": meri_predpomnilnik,
+    "pomnilnik": meri_pomnilnik,
+    "urejanje": meri_urejanje,
+    "tabela": meri_tabelo,
+    "obdobja": meri_obdobja,
+    "zdruzevanje": meri_zdruzevanje,
+    "predloge": meri_predloge,
+    "izpis": meri_izpis,
+}
+
+
+if __name__ == "__main__":
+    izbrane = sys.argv[1:] or list(MERITVE)
+    with tempfile.TemporaryDirectory() as zacasna_mapa:
+        for ime_meritve in izbrane:
+            MERITVE[ime_meritve](zacasna_mapa)
@@ -7,19 +7,6 @@ $(document).on('click', '.allow-focus', function (e) {
   e.stopPropagation();
 });
 
-function getClasses(node){
-    return node.attr("class").split(/\s+/);
-}
-
-function contains(list, element){
-    for (let i = 0; i < list.length; i++) {
-        if (list[i] === element) {
-            return true;
-        }
-    }
-    return false;
-}
-
 
 $(".opcija").on("click", function() {
     $(this).closest("li").toggleClass("active");
@@ -63,52 +50,76 @@ $(".group-choice").on("click", function() {
 });
 
 
-function najPrikazem(seznamSkupinID) {
-    // Skupin je šest [id_predmet, id_programi, id_letniki, id_rok, id_izvajalci, id_obdobje]
-    // npr. [38, 6x122x123, 7x45x7, 20, 39x40x24, 2]
-    // Pri preverjanju je treba programe in letnike preverjati hkrati, saj je
-    // npr. Programiranje 1 v 3. letniku Pedagoške matematike in 2. letniku Matematike.
-    let razbiteSkupine = [];
-    for (let i = 0; i < seznamSkupinID.length; i++){
-        razbiteSkupine.push(seznamSkupinID[i].split("x"));
-    }
-    for (let i = 0; i < seznamSkupinID.length; i++){
-        if (i == 2){
-            // letnike preverjamo s programi
-            continue;
-        }
-        let vsajEn = false;
-        let skupina = razbiteSkupine[i];
-        for (let j = 0; j < skupina.length; j++){
-            let kandidat = skupina[j];
-            let kandidatOK = contains(getClasses($("#" + kandidat)), "active");
-            let dopolniloOK = true;
-            if (i == 1){
-                // preveri tudi letnik
-                dopolniloOK = contains(getClasses($("#" + razbiteSkupine[2][j])), "active");
-            }
-            if(kandidatOK && dopolniloOK){
-                vsajEn = true;
-                break;
+// Tabela izpitov, ki jo filtriramo in iz katere prenašamo izbrane izpite:
+// - indeks: obrnjen indeks, ki ga zgradimo ob izdelavi strani: za vsako skupino filtrov
+//   (predmet, program_letnik, rok, izvajalec, obdobje) slovar, ki id-ju vrednosti (pri
+//   program_letnik paru id-jev "program:letnik") priredi urejen seznam indeksov vrstic,
+// - steviloVrstic,
+// - prikazi(prikazane): prikaže vrstice i, za katere je prikazane[i] resničen,
+// - idjiPrikazanih(): id-ji prikazanih vrstic.
+// Če so vse vrstice že v dokumentu, jo naredimo tu, sicer jo (ko naloži podatke) nastavi
+// virtualna_tabela.js.
+let tabelaIzpitov = null;
+
+if (document.getElementById("indeks-filtrov") !== null){
+    const vrstice = document.querySelectorAll(".izpitna-vrstica");
+    tabelaIzpitov = {
+        indeks: JSON.parse(document.getElementById("indeks-filtrov").textContent),
+        steviloVrstic: vrstice.length,
+        prikazi: function(prikazane){
+            for (let i = 0; i < vrstice.length; i++){
+                // spreminjamo le vrstice, ki jim vidnost res spremenimo
+                if (vrstice[i].hidden === prikazane[i]){
+                    vrstice[i].hidden = !prikazane[i];
+                }
             }
+        },
+        idjiPrikazanih: function(){
+            return $.map($(".izpitna-vrstica:visible"), function(vrsta){return $(vrsta).attr("id")});
         }
-        if (! vsajEn){
-            return false;
+    };
+}
+
+function aktivniIdji(razred){
+    return $.map($("li." + razred + ".active[id]"), function(moznost){return moznost.id});
+}
+
+function izbraniKljuci(skupina){
+    if (skupina !== "program_letnik"){
+        return aktivniIdji(skupina);
+    }
+    // programe in letnike je treba preverjati hkrati, saj je
+    // npr. Programiranje 1 v 3. letniku Pedagoške matematike in 2. letniku Matematike.
+    const letniki = aktivniIdji("letnik");
+    let kljuci = [];
+    for (const program of aktivniIdji("program")){
+        for (const letnik of letniki){
+            kljuci.push(program + ":" + letnik);
         }
     }
-    return true;
+    return kljuci;
 }
 
 function posodobiTabeloIzbranih(){
-    let idIzpitnihVrstic = $.map($(".izpitna-vrstica"), function(vrsta){return $(vrsta).attr("id")});
-    for (let i = 0; i < idIzpitnihVrstic.length; i++){
-        let zdaj = "#" + idIzpitnihVrstic[i];
-        if (najPrikazem(idIzpitnihVrstic[i].split("_"))){
-            $(zdaj).removeAttr("hidden");
-        } else {
-            $(zdaj).attr("hidden", "");
-        }
+    if (tabelaIzpitov === null){
+        // podatki se še nalagajo, filtre bomo upoštevali, ko se naložijo
+        return;
     }
+    // Vrstica je prikazana, če ima v vsaki skupini vsaj eno izbrano vrednost: za vsako skupino
+    // naredimo unijo seznamov izbranih vrednosti (bit skupine), nato pa presek vseh skupin.
+    const skupine = Object.keys(tabelaIzpitov.indeks);
+    const vseSkupine = (1 << skupine.length) - 1;
+    let zadetki = new Uint8Array(tabelaIzpitov.steviloVrstic);
+    skupine.forEach(function(skupina, i){
+        const bit = 1 << i;
+        const vrednosti = tabelaIzpitov.indeks[skupina];
+        for (const kljuc of izbraniKljuci(skupina)){
+            for (const vrstica of vrednosti[kljuc] || []){
+                zadetki[vrstica] |= bit;
+            }
+        }
+    });
+    tabelaIzpitov.prikazi(Array.from(zadetki, function(z){return z === vseSkupine}));
 }
 
 function posodobiGrupnoIzbiro(razred) {
@@ -147,16 +158,89 @@ function posodobiGrupnoIzbiro(razred) {
     }
 }
 
-$(".izvoz-koledarja").on("click", function() {
-    let opisDogodkov = $.map(
-        $(".izpitna-vrstica:visible"),
-        function(vrsta){
-            return $(vrsta).attr("data-ics").split("@@@@");
+// Podatke, ki niso v strani, naložimo iz skripte, ki jih shrani v window[ime] (glej zapisi_js
+// v naredi_html.py). Za razliko od fetch to deluje tudi, ko stran odpremo z diska (file://).
+function naloziPodatke(pot, ime){
+    return new Promise(function(razresi, zavrni){
+        if (window[ime] !== undefined){
+            razresi(window[ime]);
+            return;
+        }
+        const skripta = document.createElement("script");
+        skripta.src = pot;
+        skripta.onload = function(){
+            if (window[ime] === undefined){
+                zavrni(new Error("Datoteka " + pot + " ne vsebuje pričakovanih podatkov."));
+            } else {
+                razresi(window[ime]);
+            }
+        };
+        skripta.onerror = function(){
+            skripta.remove();
+            zavrni(new Error("Datoteke " + pot + " ni bilo mogoče naložiti."));
+        };
+        document.head.appendChild(skripta);
+    });
+}
+
+// Podatke za prenos (glavo koledarja in polja dogodka za vsak id vrstice) naložimo šele ob
+// prvem prenosu, saj jih večina obiskovalcev ne potrebuje.
+let icsPodatki = null;
+
+function naloziIcsPodatke(){
+    if (icsPodatki === null){
+        // ime spremenljivke je IME_ICS_PODATKOV iz naredi_html.py
+        icsPodatki = naloziPodatke($(".table.izpiti").attr("data-ics-datoteka"), "izpitniRokiIcs");
+        // če nalaganje ne uspe, poskusimo znova ob naslednjem kliku
+        icsPodatki.catch(function(){
+            icsPodatki = null;
+        });
+    }
+    return icsPodatki;
+}
+
+function zloziVrstico(vrstica){
+    // ics vrstice naj ne bodo daljše od 75 znakov, nadaljevanja se začnejo s presledkom
+    let deli = [vrstica.slice(0, 75)];
+    for (let i = 75; i < vrstica.length; i += 74){
+        deli.push(" " + vrstica.slice(i, i + 74));
+    }
+    return deli.join("\n");
+}
+
+function sestaviIcs(podatki, idjiVrstic){
+    // npr. 20231018T083658Z
+    const zdaj = new Date().toISOString().replace(/[-:]/g, "").replace(/\.\d+/, "");
+    let vrstice = ["BEGIN:VCALENDAR"].concat(podatki.koledar);
+    // id vrstice pripada natanko enemu dogodku
+    for (const id of new Set(idjiVrstic)){
+        const polja = podatki.dogodki[id];
+        if (polja === undefined){
+            continue;
+        }
+        vrstice.push("BEGIN:VEVENT", "DTSTAMP:" + zdaj);
+        for (const [ime, vrednost] of Object.entries(polja)){
+            vrstice.push(ime + ":" + vrednost);
         }
-        ).join("\n");
-    let opisKoledarja = $(".table.izpiti").attr("data-ics").replaceAll("@@@@", "\n") + "\n";
-    let icsVsebina = "BEGIN:VCALENDAR\n" + opisKoledarja + opisDogodkov + "\nEND:VCALENDAR\n";
+        vrstice.push("END:VEVENT");
+    }
+    vrstice.push("END:VCALENDAR");
+    return vrstice.map(zloziVrstico).join("\n") + "\n";
+}
 
+$(".izvoz-koledarja").on("click", function() {
+    if (tabelaIzpitov === null){
+        return;
+    }
+    const idjiVrstic = tabelaIzpitov.idjiPrikazanih();
+    naloziIcsPodatke().then(function(podatki){
+        prenesi(sestaviIcs(podatki, idjiVrstic));
+    }).catch(function(napaka){
+        alert(napaka.message);
+    });
+});
+
+function prenesi(icsVsebina){
     var element = document.createElement('a');
     element.setAttribute('href', "data:text/calendar;charset=utf8," + encodeURIComponent(icsVsebina));
     element.setAttribute('download', "izbrani_izpiti.ics");
@@ -164,5 +248,5 @@ $(".izvoz-koledarja").on("click", function() {
     document.body.appendChild(element);
     element.click();
     document.body.removeChild(element);
-});
+}
 
@@ -0,0 +1,129 @@
+// Virtualna tabela izpitov (glej naredi_predlogo_virtualne_tabele v naredi_html.py): vrstice
+// naložimo iz datoteke (z naloziPodatke iz posodabljanje.js), v dokument pa vstavimo le tiste, ki so v vidnem delu tabele, in dve
+// prazni vrstici, ki nadomestita višino ostalih. Filtriranje in prenos (posodabljanje.js)
+// delata z nastavljeno tabeloIzpitov.
+(function(){
+    // toliko vrstic izrišemo še nad in pod vidnim delom tabele
+    const DODATNE_VRSTICE = 10;
+    const ovoj = document.querySelector(".virtualna-tabela");
+    const glava = ovoj.querySelector("thead");
+    const telo = ovoj.querySelector("tbody");
+    // vrstica je seznam [id, datum, predmet, letnik, rok, izvajalci]
+    let vrstice = [];
+    // indeksi vrstic, ki ustrezajo izbranim filtrom
+    let prikazane = [];
+    // ocena višine vrstice, ki jo ob prvem izrisu nadomestimo z izmerjeno
+    let visinaVrstice = 50;
+    let izmerjena = false;
+    let izrisCaka = false;
+
+    function htmlVrstice(vrstica){
+        return '<tr class="izpitna-vrstica" id="' + vrstica[0] + '">' +
+            '<td scope="row">' + vrstica[1] + '</td>' +
+            '<th>' + vrstica[2] + '</th>' +
+            '<td>' + vrstica[3] + '</td>' +
+            '<td>' + vrstica[4] + '</td>' +
+            '<td>' + vrstica[5] + '</td>' +
+            '</tr>';
+    }
+
+    function praznaVrstica(stVrstic){
+        if (stVrstic <= 0){
+            return "";
+        }
+        return '<tr style="height: ' + stVrstic * visinaVrstice + 'px"></tr>';
+    }
+
+    function izrisi(){
+        izrisCaka = false;
+        const odmik = Math.max(0, ovoj.scrollTop - glava.offsetHeight);
+        const zadnja = Math.min(
+            prikazane.length,
+            Math.ceil((odmik + ovoj.clientHeight) / visinaVrstice) + DODATNE_VRSTICE
+        );
+        const prva = Math.min(
+            Math.max(0, Math.floor(odmik / visinaVrstice) - DODATNE_VRSTICE),
+            zadnja
+        );
+        let html = [praznaVrstica(prva)];
+        for (let i = prva; i < zadnja; i++){
+            html.push(htmlVrstice(vrstice[prikazane[i]]));
+        }
+        html.push(praznaVrstica(prikazane.length - zadnja));
+        telo.innerHTML = html.join("");
+        if (!izmerjena && zadnja > prva){
+            // višina vrstic je odvisna od širine zaslona, zato jo izmerimo le enkrat
+            izmerjena = true;
+            let visina = 0;
+            for (const vrstica of telo.querySelectorAll(".izpitna-vrstica")){
+                visina += vrstica.offsetHeight;
+            }
+            visinaVrstice = Math.max(1, visina / (zadnja - prva));
+            izrisi();
+        }
+    }
+
+    // položaj vrstice (indeksa v vrstice) med prikazanimi ali -1, če ni prikazana
+    function polozajVrstice(indeks){
+        let levo = 0, desno = prikazane.length;
+        while (levo < desno){
+            const sredina = (levo + desno) >> 1;
+            if (prikazane[sredina] < indeks){
+                levo = sredina + 1;
+            } else {
+                desno = sredina;
+            }
+        }
+        return prikazane[levo] === indeks ? levo : -1;
+    }
+
+    function narociIzris(){
+        if (!izrisCaka){
+            izrisCaka = true;
+            window.requestAnimationFrame(izrisi);
+        }
+    }
+
+    // ime spremenljivke je IME_PODATKOV_VRSTIC iz naredi_html.py
+    naloziPodatke(ovoj.getAttribute("data-datoteka-vrstic"), "izpitniRokiVrstice").then(function(podatki){
+        vrstice = podatki.vrstice;
+        tabelaIzpitov = {
+            indeks: podatki.indeks,
+            steviloVrstic: vrstice.length,
+            prikazi: function(maska){
+                const odmik = Math.max(0, ovoj.scrollTop - glava.offsetHeight);
+                const polozaj = Math.floor(odmik / visinaVrstice);
+                const vrh = polozaj < prikazane.length ? prikazane[polozaj] : -1;
+                prikazane = [];
+                for (let i = 0; i < maska.length; i++){
+                    if (maska[i]){
+                        prikazane.push(i);
+                    }
+                }
+                // če je vrstica na vrhu še vedno prikazana, ostane na vrhu, sicer začnemo na
+                // vrhu tabele
+                const novPolozaj = vrh === -1 ? -1 : polozajVrstice(vrh);
+                // višino tabele nastavimo, preden premaknemo drsnik, sicer ga brskalnik omeji
+                telo.innerHTML = praznaVrstica(prikazane.length);
+                if (novPolozaj === -1){
+                    ovoj.scrollTop = 0;
+                } else {
+                    ovoj.scrollTop += (novPolozaj - polozaj) * visinaVrstice;
+                }
+                izrisi();
+            },
+            idjiPrikazanih: function(){
+                return prikazane.map(function(i){return vrstice[i][0]});
+            }
+        };
+        // upoštevamo filtre, ki so jih morda spremenili med nalaganjem
+        posodobiTabeloIzbranih();
+        ovoj.addEventListener("scroll", narociIzris);
+        window.addEventListener("resize", function(){
+            izmerjena = false;
+            narociIzris();
+        });
+    }).catch(function(napaka){
+        telo.innerHTML = '<tr><td colspan="5">' + napaka.message + '</td></tr>';
+    });
+})();
@@ -6,11 +6,17 @@
 
 import os
 
-from izpitni_roki.nalozi_ics import nalozi_ics
+from izpitni_roki.nalozi_ics import nalozi_koledarje
 from izpitni_roki.naredi_html import naredi_html, IZHODNA_MAPA
 from izpitni_roki.glasbene_zelje import prikazi_isrm_roke
 from izpitni_roki.preverjanje import preveri_vse
-from izpitni_roki.osnovno import niz_v_datum, naredi_zapisnikarja, preveri_ics_datoteke
+from izpitni_roki.predpomnilnik import PRIVZETA_MAPA
+from izpitni_roki.osnovno import (
+    niz_v_datum,
+    naredi_zapisnikarja,
+    preveri_ics_datoteke,
+    Register,
+)
 
 
 ZAPISNIKAR = naredi_zapisnikarja(__file__)
@@ -54,9 +60,15 @@ def glavna(
     prazniki: list[str],
     oblika_ics_summary: str | None = None,
     oblika_ics_datum: str | None = None,
+    vzporedno: bool = False,
+    predpomnilnik: str | None = None,
+    pretocno: bool = False,
+    virtualno: bool = False,
 ):
     """
-    Preveri ustreznost razpisanih rokov in zgenerira html.
+    Preveri ustreznost razpisanih rokov, zgenerira html in izpiše roke za IŠRM.
+    Vse ics datoteke preberemo le enkrat (v svojem registru, glej
+    :class:`izpitni_roki.osnovno.Register`), nato pa iste koledarje podamo vsem trem korakom.
 
     :param ics_datoteke: če je to niz, pričakujemo, da je to ime mape, v kateri
                          se nahajajo ics datoteke, npr. ``data``. Če je to seznam
@@ -73,6 +85,19 @@ def glavna(
                      ``["11. 6. 2024", "25. 6. 2024", "15. 8. 2024"]``
     :param oblika_ics_summary: glej :func:`izpitni_roki.naredi_html`
     :param oblika_ics_datum: glej :func:`izpitni_roki.naredi_html`
+    :param vzporedno: ali naj ics datoteke beremo vzporedno, vsako v svojem procesu
+                      (glej :func:`izpitni_roki.nalozi_ics.nalozi_koledarje`)
+    :param predpomnilnik: mapa, v kateri hranimo že prebrane ics datoteke, zato jih ob
+                          ponovnem zagonu (če se niso spremenile) ne beremo znova.
+                          Če je ``None`` (privzeto), predpomnilnika ne uporabljamo.
+                          Priporočena mapa je
+                          :data:`izpitni_roki.predpomnilnik.PRIVZETA_MAPA` (poleg mape ``out``).
+                          Mapa mora biti zaupanja vredna, saj zapise beremo s
+                          :mod:`pickle`. Opozorila, ki nastanejo ob branju datoteke,
+                          se izpišejo le ob prvem branju, ne pa ob nalaganju iz predpomnilnika.
+    :param pretocno: ali naj html zapisujemo sproti (glej :func:`izpitni_roki.naredi_html`)
+    :param virtualno: ali naj stran prikazuje le vidne vrstice tabele
+                      (glej :func:`izpitni_roki.naredi_html`)
     """
     # pretvori obdobja
     imena_obdobij = ["zimsko", "spomladansko", "jesensko"]
@@ -80,16 +105,17 @@ def glavna(
     slo_obdobja = {ime: datuma for ime, datuma in zip(imena_obdobij, obdobja_datumi)}
     # preveri obstoj ipd. ics datotek
     ics_datoteke = preveri_ics_datoteke(ics_datoteke)
+    # naloži (le enkrat)
+    vsi_koledarji = nalozi_koledarje(
+        ics_datoteke,
+        obdobja=slo_obdobja,
+        oblika_summary=oblika_ics_summary,
+        oblika_datum=oblika_ics_datum,
+        vzporedno=vzporedno,
+        predpomnilnik=predpomnilnik,
+        register=Register(),
+    )
     # preveri skladnost
-    vsi_koledarji = [
-        nalozi_ics(
-            dato,
-            obdobja=slo_obdobja,
-            oblika_summary=oblika_ics_summary,
-            oblika_datum=oblika_ics_datum,
-        )
-        for dato in ics_datoteke
-    ]
     preveri_vse(vsi_koledarji, obdobja, prazniki)
     ali_naj_nadaljujem = input("Nadaljujem s pretvorbo? [j/n] ").lower().strip()
     if ali_naj_nadaljujem.strip().lower() != "j":
@@ -97,14 +123,15 @@ def glavna(
         exit(0)
     # Ustvari spletno stran iz testnih podatkov
     naredi_html(
-        ics_datoteke,
+        vsi_koledarji,
         naslov=naslov_strani,
         opis_strani=opis_strani,
         ime_izhodne=ime_html,
-        obdobja=slo_obdobja,
-        oblika_summary=None,
-        oblika_datum=None,
+        pretocno=pretocno,
+        virtualno=virtualno,
     )
+    # Glasbene želje
+    prikazi_isrm_roke(vsi_koledarji)
     ZAPISNIKAR.info("Konec.")
 
 
@@ -147,7 +174,5 @@ if __name__ == "__main__":
         ime_koncne_datoteke,
         (zimsko, spomladansko, jesensko),
         prazniki,
+        predpomnilnik=PRIVZETA_MAPA,
     )
-
-    # Glasbene želje
-    prikazi_isrm_roke(vhodne_datoteke)
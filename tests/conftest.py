@@ -0,0 +1,128 @@
+import os
+import sys
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+
+KOREN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PODATKI = os.path.join(KOREN, "tests", "podatki")
+
+# testi uvažajo paket izpitni_roki iz korena repozitorija
+sys.path.insert(0, KOREN)
+
+from izpitni_roki.naredi_html import naredi_ics_podatke, naredi_tabelo, uredi_roke  # noqa: E402
+from izpitni_roki.osnovno import Letnik, Program  # noqa: E402
+
+PREDMETI = ["Analiza", "Algebra", "Programiranje", "Verjetnost", "Geometrija", "Topologija"]
+PRIIMKI = ["Novak", "Horvat", "Kovačič", "Krajnc", "Zupančič", "Potočnik", "Kos"]
+IMENA = ["Ana", "Boris", "Cene", "Čarli", "Dušan", "Eva", "Špela", "Žiga"]
+
+
+@pytest.fixture(autouse=True)
+def koren(monkeypatch):
+    """Predloge (mapa ``predloge``) so podane relativno, zato teste poganjamo v korenu."""
+    monkeypatch.chdir(KOREN)
+
+
+@pytest.fixture
+def podatki():
+    """Pot do mape s testnimi ics datotekami."""
+    return PODATKI
+
+
+def zapisi_dogodke(pot, dogodki):
+    """
+    Zapiše ics datoteko, kakršno izvozi Google koledar.
+
+    :param pot: pot do izhodne datoteke
+    :param dogodki: seznam trojic ``(datum, povzetek, uid)`` oz. četveric, katerih zadnji
+        element je vrednost polja ``SEQUENCE``; datum je oblike ``YYYYMMDD``
+    """
+    vrstice = [
+        "BEGIN:VCALENDAR",
+        "PRODID:-//Google Inc//Google Calendar 70.9054//EN",
+        "VERSION:2.0",
+        "X-WR-CALNAME:Testni koledar",
+        "X-WR-TIMEZONE:Europe/Belgrade",
+    ]
+    for datum, povzetek, uid, *zaporedje in dogodki:
+        konec = datetime.strptime(datum, "%Y%m%d") + timedelta(days=1)
+        vrstice += [
+            "BEGIN:VEVENT",
+            f"DTSTART;VALUE=DATE:{datum}",
+            f"DTEND;VALUE=DATE:{konec:%Y%m%d}",
+            "DTSTAMP:20231220T143526Z",
+            f"UID:{uid}",
+            "DESCRIPTION:",
+            "LAST-MODIFIED:20230913T124937Z",
+            "LOCATION:",
+            f"SEQUENCE:{zaporedje[0] if zaporedje else 0}",
+        ]
+        # Google prelomi vrstice, daljše od 75 znakov
+        povzetek = f"SUMMARY:{povzetek}"
+        vrstice.append(povzetek[:75])
+        vrstice += [" " + povzetek[j : j + 74] for j in range(75, len(povzetek), 74)]
+        vrstice.append("END:VEVENT")
+    vrstice.append("END:VCALENDAR")
+    with open(pot, "w", encoding="utf-8", newline="") as f:
+        f.write("\r\n".join(vrstice) + "\r\n")
+    return str(pot)
+
+
+@pytest.fixture
+def ics_datoteka(tmp_path):
+    """Funkcija, ki zapiše ics datoteko z danimi dogodki (glej zapisi_dogodke) v tmp_path."""
+
+    def zapisi(ime, dogodki):
+        return zapisi_dogodke(tmp_path / ime, dogodki)
+
+    return zapisi
+
+
+def nakljucni_dogodki(n_rokov, leto=2024, seme=0):
+    """
+    Naključni (a pravilno oblikovani) izpitni roki za :func:`zapisi_dogodke`.
+
+    :param n_rokov: število dogodkov
+    :param leto: koledarsko leto, v katerega padejo izpitni roki
+    :param seme: seme generatorja naključnih števil; od njega so odvisni tudi UID-ji
+    """
+    nakljucno = random.Random(seme)
+    programi = list(Program.LEPSE_OBLIKE)
+    letniki = list(Letnik.DOVOLJENI_LETNIKI)
+    dogodki = []
+    for i in range(n_rokov):
+        datum = datetime(leto, 1, 1) + timedelta(days=nakljucno.randrange(270))
+        predmet = f"{nakljucno.choice(PREDMETI)} {nakljucno.randrange(1, 40)}"
+        smeri = "\\, ".join(sorted(nakljucno.sample(programi, nakljucno.randint(1, 2))))
+        izvajalci = "\\, ".join(
+            f"{nakljucno.choice(PRIIMKI)} {nakljucno.choice(IMENA)}"
+            for _ in range(nakljucno.randint(1, 3))
+        )
+        povzetek = (
+            f"{predmet} ({smeri}\\, ni smeri)\\, {nakljucno.choice(letniki)} letnik\\, "
+            f"{izvajalci}\\, {nakljucno.randint(1, 4)}. rok"
+        )
+        dogodki.append((f"{datum:%Y%m%d}", povzetek, f"{seme}x{i:08}@google.com"))
+    return dogodki
+
+
+@pytest.fixture
+def sinteticne_datoteke(ics_datoteka):
+    """Tri ics datoteke s po 150 naključnimi izpitnimi roki v letu 2024."""
+    return [
+        ics_datoteka(f"s{seme}.ics", nakljucni_dogodki(150, leto=2024, seme=seme))
+        for seme in range(3)
+    ]
+
+
+@pytest.fixture
+def izdelek():
+    """Funkcija, ki iz koledarjev naredi tabelo in podatke za prenos (kar primerjamo v testih)."""
+
+    def naredi(koledarji):
+        return naredi_tabelo(koledarji), naredi_ics_podatke(uredi_roke(koledarji), koledarji)
+
+    return naredi
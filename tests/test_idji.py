@@ -0,0 +1,69 @@
+import logging
+from datetime import datetime
+from itertools import combinations
+
+from izpitni_roki.nalozi_ics import nalozi_koledarje, naredi_izpitna_obdobja
+from izpitni_roki.naredi_html import naredi_idje_vrstic
+from izpitni_roki.osnovno import Predmet, Register
+
+
+OBDOBJA = naredi_izpitna_obdobja(2024)
+
+
+def test_idji_neodvisni_od_vrstnega_reda_datotek(sinteticne_datoteke, ics_datoteka, izdelek):
+    # dva enaka dogodka na isti dan in eden ob drugem datumu: id-ji vrstic se razlikujejo
+    povzetek = "Analiza 1 (1Mate\\, ni smeri)\\, prvi letnik\\, Novak Janez\\, 1. rok"
+    dvojniki = ics_datoteka(
+        "dvojniki.ics",
+        [("20240129", povzetek, "a"), ("20240129", povzetek, "b"), ("20240205", povzetek, "c")],
+    )
+    poti = sinteticne_datoteke + [dvojniki]
+    izdelki = []
+    for vrstni_red in (poti, poti[::-1], poti[1:] + poti[:1]):
+        tabela, podatki = izdelek(nalozi_koledarje(vrstni_red, OBDOBJA, register=Register()))
+        # glavo koledarja za prenos vzamemo iz prve datoteke, zato je od vrstnega reda odvisna
+        izdelki.append((tabela, podatki["dogodki"]))
+    assert izdelki[1] == izdelki[0]
+    assert izdelki[2] == izdelki[0]
+    tabela, dogodki = izdelki[0]
+    assert len(dogodki) == tabela.count('class="izpitna-vrstica"') == 3 * 150 + 3
+
+
+def test_id_iz_vsebine():
+    prvi, drugi = Register(), Register()
+    drugi.naredi_objekt(Predmet, "Algebra 1")
+    # drugi register je pred tem ustvaril drug predmet, a id je odvisen le od imena
+    analiza = prvi.naredi_objekt(Predmet, "Analiza 1")
+    assert drugi.naredi_objekt(Predmet, "Analiza 1").id == analiza.id
+
+
+def test_trk_idjev(monkeypatch, caplog):
+    monkeypatch.setattr(Register, "DOLZINA_ID", 1)
+    # imeni, katerih zgoščeni vrednosti se začneta z isto števko (a se potem razlikujeta)
+    ime, drugo = next(
+        par
+        for par in combinations((f"Predmet {i}" for i in range(20)), 2)
+        if Register.stabilni_id(Predmet, par[0])[:2] != Register.stabilni_id(Predmet, par[1])[:2]
+        and Register.stabilni_id(Predmet, par[0])[0] == Register.stabilni_id(Predmet, par[1])[0]
+    )
+    register = Register()
+    with caplog.at_level(logging.WARNING):
+        prvi = register.naredi_objekt(Predmet, ime)
+        drugi = register.naredi_objekt(Predmet, drugo)
+    assert prvi.id == Register.stabilni_id(Predmet, ime)[:1]
+    assert drugi.id == Register.stabilni_id(Predmet, drugo)[:2]
+    assert [zapis.getMessage() for zapis in caplog.records] == [
+        f"Trk id-jev {prvi.id}: Predmet {drugo} in Predmet {ime}. Podaljšujem id."
+    ]
+
+
+def test_idji_vrstic():
+    class Rok:
+        def __init__(self, id_, dan):
+            self._id, self.datum = id_, datetime(2024, 6, dan)
+
+        def id(self):
+            return self._id
+
+    roki = [Rok("a", 10), Rok("a", 10), Rok("b", 10), Rok("a", 11), Rok("a", 10)]
+    assert naredi_idje_vrstic(roki) == ["a", "a_20240610", "b", "a_20240611", "a_20240610_2"]
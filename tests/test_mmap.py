@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from izpitni_roki.nalozi_ics import (
+    nalozi_ics,
+    nalozi_ics_mmap,
+    nalozi_koledarje,
+    naredi_izpitna_obdobja,
+)
+from izpitni_roki.osnovno import Register
+
+
+OBDOBJA = naredi_izpitna_obdobja(2024)
+
+
+def _opis(koledar):
+    return [
+        (rok.id(), rok.obdobje.ime, rok.uid, rok.razlicica, rok.ics_vrstice)
+        for rok in koledar.izpitni_roki
+    ]
+
+
+@pytest.mark.parametrize("obdobja", [OBDOBJA, None])
+def test_enako_kot_nalozi_ics(sinteticne_datoteke, podatki, obdobja):
+    for pot in sinteticne_datoteke + [os.path.join(podatki, "preverjanje.ics")]:
+        koledar = nalozi_ics(pot, obdobja, register=Register())
+        preslikan = nalozi_ics_mmap(pot, obdobja, register=Register())
+        assert _opis(preslikan) == _opis(koledar)
+        assert preslikan.ics_vrstice == koledar.ics_vrstice
+
+
+def test_preslikaj_da_enako_tabelo(sinteticne_datoteke, izdelek):
+    def nalozi(**nastavitve):
+        return nalozi_koledarje(sinteticne_datoteke, OBDOBJA, register=Register(), **nastavitve)
+
+    assert izdelek(nalozi(preslikaj=True)) == izdelek(nalozi())
+
+
+def test_dogodek_brez_konca(ics_datoteka):
+    povzetek = "Analiza 1 (1Mate\\, ni smeri)\\, prvi letnik\\, Novak Janez\\, 1. rok"
+    pot = ics_datoteka("koledar.ics", [("20240129", povzetek, "a"), ("20240130", povzetek, "b")])
+    with open(pot, encoding="utf-8", newline="") as f:
+        vsebina = f.read()
+    with open(pot, "w", encoding="utf-8", newline="") as f:
+        f.write(vsebina.replace("END:VEVENT\r\n", "", 1))
+    with pytest.raises(ValueError, match="nima konca"):
+        nalozi_ics_mmap(pot, OBDOBJA, register=Register())
@@ -0,0 +1,89 @@
+import logging
+from datetime import datetime, timedelta
+
+from izpitni_roki.nalozi_ics import nalozi_ics, naredi_seznam_obdobij
+from izpitni_roki.osnovno import IndeksObdobij, Obdobje, Register
+from izpitni_roki.tabela_rokov import TabelaRokov
+
+
+def _obdobja(register):
+    # zimsko in dodatno obdobje se dotikata na meji 31. 1.
+    return naredi_seznam_obdobij(
+        {
+            "zimsko": (datetime(2024, 1, 22), datetime(2024, 1, 31)),
+            "dodatno": (datetime(2024, 1, 31), datetime(2024, 2, 16)),
+            "spomladansko": (datetime(2024, 6, 3), datetime(2024, 7, 5)),
+        },
+        register,
+    )
+
+
+def test_meje_obdobij():
+    register = Register()
+    zimsko, dodatno, spomladansko = obdobja = _obdobja(register)
+    indeks = IndeksObdobij(obdobja, register.obdobje_izven)
+    pricakovano = [
+        (datetime(2024, 1, 21), register.obdobje_izven),
+        (datetime(2024, 1, 22), zimsko),  # začetek
+        (datetime(2024, 1, 31), zimsko),  # na obeh mejah: prvo obdobje v seznamu
+        (datetime(2024, 1, 31, 12), dodatno),  # za koncem zimskega
+        (datetime(2024, 2, 16), dodatno),  # konec
+        (datetime(2024, 2, 16, 0, 0, 1), register.obdobje_izven),
+        (datetime(2024, 6, 3), spomladansko),
+        (datetime(2024, 7, 5), spomladansko),
+        (datetime(2024, 7, 6), register.obdobje_izven),
+    ]
+    for datum, obdobje in pricakovano:
+        assert indeks.doloci(datum) is obdobje, datum
+    datumi = [datum for datum, _ in pricakovano]
+    assert indeks.doloci_vse(datumi) == [obdobje for _, obdobje in pricakovano]
+
+
+def test_indeks_enak_kot_pregled_seznama():
+    register = Register()
+    obdobja = _obdobja(register)
+    for vrstni_red in (obdobja, obdobja[::-1]):
+        indeks = IndeksObdobij(vrstni_red, register.obdobje_izven)
+        datum = datetime(2024, 1, 1)
+        while datum < datetime(2024, 8, 1):
+            assert indeks.doloci(datum) is Obdobje.doloci_obdobje(
+                datum, vrstni_red, register.obdobje_izven
+            ), datum
+            datum += timedelta(hours=6)
+
+
+def test_opozorilo_o_prekrivanju(caplog):
+    register = Register()
+    with caplog.at_level(logging.WARNING):
+        IndeksObdobij(_obdobja(register), register.obdobje_izven)
+    assert [zapis.getMessage() for zapis in caplog.records] == [
+        "Obdobji zimsko in dodatno se prekrivata. Skupne datume pripišem tistemu, "
+        "ki je v seznamu prej."
+    ]
+
+
+def test_mnogo_obdobij_v_vec_letih(sinteticne_datoteke):
+    register = Register()
+    # kratka obdobja s presledki med njimi, od decembra 2023 do začetka 2025
+    obdobja = naredi_seznam_obdobij(
+        {
+            f"obdobje {i}": (
+                datetime(2023, 12, 1) + timedelta(days=5 * i),
+                datetime(2023, 12, 1) + timedelta(days=5 * i + 3),
+            )
+            for i in range(80)
+        },
+        register,
+    )
+    indeks = IndeksObdobij(obdobja, register.obdobje_izven)
+    roki = nalozi_ics(sinteticne_datoteke[0], register=register).izpitni_roki
+    datumi = [rok.datum for rok in roki]
+    pricakovano = [
+        Obdobje.doloci_obdobje(datum, obdobja, register.obdobje_izven) for datum in datumi
+    ]
+    assert len(set(pricakovano)) > 10
+    assert indeks.doloci_vse(datumi) == pricakovano
+    # stolpčna različica
+    tabela = TabelaRokov(roki)
+    kode = tabela.doloci_obdobja(indeks)
+    assert [tabela.kategorije["obdobje"].objekti[koda] for koda in kode] == pricakovano
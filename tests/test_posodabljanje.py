@@ -0,0 +1,68 @@
+import pytest
+
+from izpitni_roki.nalozi_ics import (
+    nalozi_ics,
+    nalozi_ics_mmap,
+    naredi_izpitna_obdobja,
+    posodobi_ics,
+)
+from izpitni_roki.osnovno import Register
+
+
+OBDOBJA = naredi_izpitna_obdobja(2024)
+
+
+@pytest.mark.parametrize("nalagalnik", [nalozi_ics, nalozi_ics_mmap])
+def test_posodobi_ics_po_prepisu_datoteke(nalagalnik, ics_datoteka):
+    def dogodek(i, rok=1, zaporedje=0):
+        povzetek = f"Predmet {i} (1Mate\\, ni smeri)\\, prvi letnik\\, Novak Janez\\, {rok}. rok"
+        return f"202402{i + 1:02}", povzetek, f"uid{i}", zaporedje
+
+    pot = ics_datoteka("koledar.ics", [dogodek(i) for i in range(6)])
+    prejsnji = nalagalnik(pot, OBDOBJA, register=Register())
+    stari_roki = list(prejsnji.izpitni_roki)
+    stare_vrstice = [rok.ics_vrstice for rok in stari_roki]
+    # dogodek 1 spremenimo (in povečamo SEQUENCE), 2 odstranimo, 9 dodamo; datoteka je
+    # krajša, zato bi stari izseki kazali mimo nje
+    ics_datoteka(
+        "koledar.ics",
+        [dogodek(0), dogodek(1, rok=2, zaporedje=1)] + [dogodek(i) for i in (3, 4, 5, 9)],
+    )
+    # polje DTSTAMP se spremeni tudi pri nespremenjenih dogodkih (različica ostane enaka)
+    with open(pot, encoding="utf-8", newline="") as f:
+        vsebina = f.read()
+    with open(pot, "w", encoding="utf-8", newline="") as f:
+        f.write(vsebina.replace("DTSTAMP:20231220T143526Z", "DTSTAMP:20240301T120000Z"))
+    koledar, spremembe = posodobi_ics(pot, prejsnji, OBDOBJA, register=Register())
+
+    assert [rok.uid for rok in spremembe.dodani] == ["uid9"]
+    assert [(star.uid, nov.uid) for star, nov in spremembe.spremenjeni] == [("uid1", "uid1")]
+    assert [rok.uid for rok in spremembe.odstranjeni] == ["uid2"]
+    # koledar ``prejsnji`` ostane nespremenjen, tudi njegovi ponovno uporabljeni roki
+    assert prejsnji.izpitni_roki == stari_roki
+    assert [rok.ics_vrstice for rok in stari_roki] == stare_vrstice
+    assert "DTSTAMP:20231220T143526Z" in stari_roki[0].ics_vrstice
+    assert koledar.izpitni_roki[0] is not stari_roki[0]
+    assert koledar.izpitni_roki[0].id() == stari_roki[0].id()
+    # ponovno uporabljeni roki morajo biti enaki kot ob ponovnem nalaganju
+    na_novo = nalozi_ics(pot, OBDOBJA, register=Register())
+    assert [(rok.id(), rok.ics_vrstice) for rok in koledar.izpitni_roki] == [
+        (rok.id(), rok.ics_vrstice) for rok in na_novo.izpitni_roki
+    ]
+    assert not posodobi_ics(pot, koledar, OBDOBJA)[1]
+
+
+def test_dogodki_brez_uid(ics_datoteka):
+    povzetek = "Analiza 1 (1Mate\\, ni smeri)\\, prvi letnik\\, Novak Janez\\, 1. rok"
+    pot = ics_datoteka("koledar.ics", [("20240129", povzetek, "a"), ("20240205", povzetek, "b")])
+    with open(pot, encoding="utf-8", newline="") as f:
+        vsebina = f.read()
+    with open(pot, "w", encoding="utf-8", newline="") as f:
+        f.write(vsebina.replace("UID:b\r\n", ""))
+    prejsnji = nalozi_ics(pot, OBDOBJA, register=Register())
+    koledar, spremembe = posodobi_ics(pot, prejsnji, OBDOBJA, register=Register())
+    # dogodek brez UID-ja je vedno med odstranjenimi in dodanimi
+    assert [rok.uid for rok in spremembe.odstranjeni] == [None]
+    assert [rok.uid for rok in spremembe.dodani] == [None]
+    assert spremembe.spremenjeni == []
+    assert [rok.id() for rok in koledar.izpitni_roki] == [rok.id() for rok in prejsnji.izpitni_roki]
@@ -0,0 +1,63 @@
+import logging
+
+import pytest
+
+from izpitni_roki.nalozi_ics import preberi_vrednosti
+
+
+def test_prelomljene_vrstice():
+    vrstice = [
+        "DTSTART;VALUE=DATE:20240129",
+        "SUMMARY:Analiza 1 (1Mate\\, ni smeri)\\, prvi letnik\\, Nov",
+        " ak Janez\\, Horvat A",
+        "\tna\\, 1. rok",
+        "UID:a@google.com",
+        "DESCRIPTION:",
+        " opis v dveh",
+        "  vrsticah",
+    ]
+    vrednosti, zdruzene = preberi_vrednosti(vrstice, ["SUMMARY", "UID"], ["DESCRIPTION"])
+    assert vrednosti == {
+        "SUMMARY": (
+            "Analiza 1 (1Mate\\, ni smeri)\\, prvi letnik\\, Novak Janez\\, Horvat Ana\\, 1. rok"
+        ),
+        "UID": "a@google.com",
+        "DESCRIPTION": "opis v dveh vrsticah",
+    }
+    assert zdruzene == "\n".join(vrstice)
+
+
+def test_kljuci_s_parametri():
+    vrstice = [
+        "DTSTART;VALUE=DATE:20240129",
+        "DTEND;VALUE=DATE:20240130",
+        # vrednost lahko vsebuje tudi znaka ``:`` in ``;``
+        "LOCATION:P.01; ura: 9:00",
+    ]
+    vrednosti, _ = preberi_vrednosti(vrstice, ["DTSTART;VALUE=DATE", "LOCATION"])
+    assert vrednosti == {"DTSTART;VALUE=DATE": "20240129", "LOCATION": "P.01; ura: 9:00"}
+
+
+def test_neznane_kljucne_besede(caplog):
+    vrstice = [
+        "UID:a@google.com",
+        "X-NEZNANO:vrednost",
+        " ki se nadaljuje",
+        # znana lastnost, a z drugačnimi parametri
+        "DTSTART;TZID=Europe/Ljubljana:20240129T090000",
+        "UIDX:b",
+        "SEQUENCE:2",
+    ]
+    with caplog.at_level(logging.WARNING):
+        vrednosti, _ = preberi_vrednosti(vrstice, ["UID", "SEQUENCE"])
+    # nadaljevanja neznanih vrstic ne pripišemo prejšnjemu ključu
+    assert vrednosti == {"UID": "a@google.com", "SEQUENCE": "2"}
+    assert [zapis.getMessage() for zapis in caplog.records] == [
+        f"Neznana ključna beseda v vrstici {vrsta}, ignoriram"
+        for vrsta in [vrstice[1], vrstice[3], vrstice[4]]
+    ]
+
+
+def test_manjkajoc_kljuc():
+    with pytest.raises(ValueError, match="Ključ SUMMARY manjka"):
+        preberi_vrednosti(["UID:a@google.com"], ["UID", "SUMMARY"])
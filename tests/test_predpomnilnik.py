@@ -0,0 +1,42 @@
+import logging
+
+from izpitni_roki.nalozi_ics import nalozi_koledarje, naredi_izpitna_obdobja
+from izpitni_roki.osnovno import Register
+
+
+OBDOBJA = naredi_izpitna_obdobja(2024)
+
+
+def _iz_predpomnilnika(caplog):
+    """Poti koledarjev, ki smo jih naložili iz predpomnilnika."""
+    return [
+        zapis.getMessage().split()[1]
+        for zapis in caplog.records
+        if "iz predpomnilnika" in zapis.getMessage()
+    ]
+
+
+def test_predpomnilnik(sinteticne_datoteke, tmp_path, izdelek, caplog):
+    mapa = str(tmp_path / "predpomnilnik")
+
+    def nalozi(obdobja=OBDOBJA):
+        caplog.clear()
+        with caplog.at_level(logging.INFO):
+            return nalozi_koledarje(
+                sinteticne_datoteke, obdobja, register=Register(), predpomnilnik=mapa
+            )
+
+    zaporedno = izdelek(nalozi_koledarje(sinteticne_datoteke, OBDOBJA, register=Register()))
+    assert izdelek(nalozi()) == zaporedno  # zapišemo
+    assert _iz_predpomnilnika(caplog) == []
+    assert izdelek(nalozi()) == zaporedno  # preberemo
+    assert _iz_predpomnilnika(caplog) == sinteticne_datoteke
+
+    # spremenjeno datoteko preberemo znova
+    with open(sinteticne_datoteke[1], "a", encoding="utf-8") as f:
+        f.write("\r\n")
+    nalozi()
+    assert _iz_predpomnilnika(caplog) == sinteticne_datoteke[::2]
+    # drugačne nastavitve so drug ključ
+    nalozi(naredi_izpitna_obdobja(2023))
+    assert _iz_predpomnilnika(caplog) == []
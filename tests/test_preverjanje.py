@@ -0,0 +1,52 @@
+import logging
+import os
+
+from izpitni_roki import preverjanje
+from izpitni_roki.nalozi_ics import nalozi_ics
+from izpitni_roki.osnovno import Register
+
+
+OBDOBJA = (("22. 1. 2024", "16. 2. 2024"), ("3. 6. 2024", "5. 7. 2024"), ("19. 8. 2024", "13. 9. 2024"))
+PRAZNIKI = ["25. 6. 2024"]
+
+# Izpis preverjanja datoteke tests/podatki/preverjanje.ics (enak kot pred prepisom
+# preverjanja na numpy).
+PRICAKOVANO = [
+    ("INFO", "Preverjam 1FiMa (1. letnik)"),
+    (
+        "WARNING",
+        "Pojavile so se naslednje napake:\n"
+        "10. 02. 2024 ni na delovni dan.\n"
+        "15. 03. 2024 ni v izpitnem obdobju.\n"
+        "Na dan 25. 06. 2024 je vsaj en izpit.\n"
+        "Med izpitoma pri predmetu ALGEBRA 1 ni vsaj 10 dni.\n"
+        "Pri predmetu Verjetnost ni vsaj treh izpitnih rokov.\n"
+        "Obstajajo potencialni slabi datumi z več izpiti na ta datum:\n"
+        "  - 29. 01. 2024: ALGEBRA 1, ANALIZA 1",
+    ),
+    ("INFO", "Preverjam 1Mate (2. letnik)"),
+    ("INFO", "Brez napak."),
+]
+
+
+def _izpis(caplog):
+    return [
+        (zapis.levelname, zapis.getMessage())
+        for zapis in caplog.records
+        if zapis.name == preverjanje.ZAPISNIKAR.name
+    ]
+
+
+def test_preveri_vse(podatki, caplog):
+    koledar = nalozi_ics(os.path.join(podatki, "preverjanje.ics"), register=Register())
+    with caplog.at_level(logging.INFO):
+        preverjanje.preveri_vse([koledar], OBDOBJA, PRAZNIKI)
+    assert _izpis(caplog) == PRICAKOVANO
+
+
+def test_preveri_predmet_letnik_seznam(podatki, caplog):
+    koledar = nalozi_ics(os.path.join(podatki, "preverjanje.ics"), register=Register())
+    roki = preverjanje.razbij_po_program_letnikih(koledar.izpitni_roki)[("1FiMa", 1)]
+    with caplog.at_level(logging.INFO):
+        preverjanje.preveri_predmet_letnik("1FiMa", 1, roki, OBDOBJA, PRAZNIKI)
+    assert _izpis(caplog) == PRICAKOVANO[:2]
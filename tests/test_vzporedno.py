@@ -0,0 +1,39 @@
+from izpitni_roki.nalozi_ics import nalozi_ics, nalozi_koledarje, naredi_izpitna_obdobja
+from izpitni_roki.osnovno import Register
+
+
+OBDOBJA = naredi_izpitna_obdobja(2024)
+
+
+def _objekti(register):
+    """Imena in id-ji vseh objektov v registru (po razredih)."""
+    return {
+        razred.__name__: sorted((ime, objekt.id) for ime, objekt in objekti.items())
+        for razred, objekti in register.pripadniki.items()
+    }
+
+
+def test_vzporedno_enako_kot_zaporedno(sinteticne_datoteke, izdelek):
+    zaporedni_register = Register()
+    zaporedno = nalozi_koledarje(sinteticne_datoteke, OBDOBJA, register=zaporedni_register)
+    vzporedni_register = Register()
+    vzporedno = nalozi_koledarje(
+        sinteticne_datoteke, OBDOBJA, register=vzporedni_register, vzporedno=True, n_procesov=2
+    )
+    assert izdelek(vzporedno) == izdelek(zaporedno)
+    # objekte iz procesov prenesemo v register starša
+    assert _objekti(vzporedni_register) == _objekti(zaporedni_register)
+    for koledar in vzporedno:
+        for rok in koledar.izpitni_roki:
+            assert vzporedni_register.pripadniki[type(rok.predmet)][rok.predmet.ime] is rok.predmet
+
+
+def test_vzporedno_z_ze_nalozenim_koledarjem(sinteticne_datoteke, izdelek):
+    register = Register()
+    prvi = nalozi_ics(sinteticne_datoteke[0], OBDOBJA, register=register)
+    koledarji = nalozi_koledarje(
+        [prvi] + sinteticne_datoteke[1:], OBDOBJA, register=register, vzporedno=True
+    )
+    assert koledarji[0] is prvi
+    zaporedno = nalozi_koledarje(sinteticne_datoteke, OBDOBJA, register=Register())
+    assert izdelek(koledarji) == izdelek(zaporedno)
@@ -0,0 +1,72 @@
+from izpitni_roki import naredi_html
+from izpitni_roki.nalozi_ics import nalozi_ics, naredi_izpitna_obdobja
+from izpitni_roki.naredi_html import ZdruzevalnikRokov, privzeti_zdruzevalnik
+from izpitni_roki.osnovno import Register
+
+
+def _povzetek(program, letnik, rok, predmet="Programiranje 1"):
+    return f"{predmet} ({program}\\, ni smeri)\\, {letnik} letnik\\, Novak Janez\\, {rok}. rok"
+
+
+def _zdruzi(ics_datoteka, dogodki):
+    pot = ics_datoteka("zdruzevanje.ics", dogodki)
+    koledar = nalozi_ics(pot, naredi_izpitna_obdobja(2024), register=Register())
+    zdruzevalnik = ZdruzevalnikRokov({"Programiranje 1": ["1FiMa", "1Mate", "2PeMa"]})
+    return zdruzevalnik.zdruzi(koledar.izpitni_roki)
+
+
+def test_zdruzi_enake_roke(ics_datoteka):
+    roki, neujemanja = _zdruzi(
+        ics_datoteka,
+        [
+            ("20240129", _povzetek("1FiMa", "prvi", 1), "a"),
+            ("20240129", _povzetek("1Mate", "prvi", 1), "b"),
+            ("20240129", _povzetek("2PeMa", "tretji", 1), "c"),
+            # predmeta ni med združevanimi
+            ("20240129", _povzetek("1Mate", "prvi", 1, "Analiza 1"), "d"),
+        ],
+    )
+    assert neujemanja == []
+    assert [rok.predmet.ime for rok in roki] == ["Analiza 1", "Programiranje 1"]
+    zdruzen = roki[1]
+    assert [program.ime for program in zdruzen.programi] == ["1FiMa", "1Mate", "2PeMa"]
+    assert [letnik.ime for letnik in zdruzen.letniki] == ["prvi", "prvi", "tretji"]
+
+
+def test_neujemanje_datumov(ics_datoteka):
+    roki, neujemanja = _zdruzi(
+        ics_datoteka,
+        [
+            ("20240129", _povzetek("1FiMa", "prvi", 1), "a"),
+            ("20240130", _povzetek("1Mate", "prvi", 1), "b"),
+            ("20240129", _povzetek("2PeMa", "tretji", 1), "c"),
+            ("20240612", _povzetek("1FiMa", "prvi", 2), "d"),
+            ("20240612", _povzetek("1Mate", "prvi", 2), "e"),
+        ],
+    )
+    # vsaka skupina z enakim datumom ostane svoja vrstica
+    assert sorted((rok.datum.day, rok.rok.ime, len(rok.programi)) for rok in roki) == [
+        (12, "2.", 2),
+        (29, "1.", 2),
+        (30, "1.", 1),
+    ]
+    assert len(neujemanja) == 1
+    neujemanje = neujemanja[0]
+    assert (neujemanje.predmet.ime, neujemanje.rok.ime) == ("Programiranje 1", "1.")
+    assert [rok.datum.day for rok in neujemanje.izpitni_roki] == [29, 30]
+
+
+def test_pravila_preberemo_enkrat(tmp_path, monkeypatch):
+    pravila = tmp_path / "zdruzi.txt"
+    pravila.write_text("Programiranje 1,1FiMa,1Mate\n", encoding="utf-8")
+    monkeypatch.setattr(naredi_html, "DATOTEKA_ZDRUZEVANJA", str(pravila))
+    prvi = privzeti_zdruzevalnik()
+    assert prvi is privzeti_zdruzevalnik()
+    assert prvi.predmeti_zdruzevanja == {"Programiranje 1": frozenset({"1FiMa", "1Mate"})}
+    # spremenjeno datoteko preberemo znova
+    pravila.write_text("Programiranje 1,1FiMa,1Mate in 2PeMa\n", encoding="utf-8")
+    drugi = privzeti_zdruzevalnik()
+    assert drugi is not prvi
+    assert drugi.predmeti_zdruzevanja == {
+        "Programiranje 1": frozenset({"1FiMa", "1Mate", "2PeMa"})
+    }